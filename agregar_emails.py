@@ -2,7 +2,7 @@
 Script auxiliar para agregar emails a los estudiantes
 """
 
-import openpyxl
+from cache_datos import cargar_tabla
 
 def agregar_emails_estudiantes():
     """Agrega emails a los estudiantes del Excel"""
@@ -12,14 +12,7 @@ def agregar_emails_estudiantes():
     
     try:
         archivo = 'grupo001.xlsx'
-        wb = openpyxl.load_workbook(archivo)
-        ws = wb.active
-        
-        # Verificar/agregar columna EMAIL
-        headers = [cell.value for cell in ws[1]]
-        if 'EMAIL' not in headers:
-            ws.cell(1, 5).value = 'EMAIL'
-            print("✅ Columna EMAIL creada")
+        tabla = cargar_tabla(archivo)
         
         idx_email = 5  # Columna E
         
@@ -28,10 +21,7 @@ def agregar_emails_estudiantes():
         
         estudiantes_sin_email = []
         
-        for row in range(2, ws.max_row + 1):
-            nombre = ws.cell(row, 1).value
-            email_actual = ws.cell(row, idx_email).value
-            
+        for row, nombre, email_actual in tabla.registros(0, idx_email - 1):
             if nombre:
                 if not email_actual or str(email_actual).strip() == '':
                     estudiantes_sin_email.append((row, nombre))
@@ -54,6 +44,17 @@ def agregar_emails_estudiantes():
         
         opcion = input("\nSelecciona una opción (1-3): ").strip()
         
+        if opcion in ('1', '2'):
+            # El libro editable sólo se abre si se van a guardar emails
+            import openpyxl
+            wb = openpyxl.load_workbook(archivo)
+            ws = wb.active
+            
+            # Verificar/agregar columna EMAIL
+            if 'EMAIL' not in tabla.encabezados:
+                ws.cell(1, idx_email).value = 'EMAIL'
+                print("✅ Columna EMAIL creada")
+        
         if opcion == '1':
             print("\n💡 Ingresa el email de cada estudiante (o ENTER para saltar)")
             print("-"*60)
@@ -101,17 +102,14 @@ def ver_emails():
     """Muestra todos los estudiantes con sus emails"""
     try:
         archivo = 'grupo001.xlsx'
-        wb = openpyxl.load_workbook(archivo)
-        ws = wb.active
-        
-        headers = [cell.value for cell in ws[1]]
+        tabla = cargar_tabla(archivo)
         
-        if 'EMAIL' not in headers:
+        if 'EMAIL' not in tabla.encabezados:
             print("\n⚠️  No hay columna EMAIL en el archivo")
             print("   Ejecuta la opción 1 del menú principal primero")
             return
         
-        idx_email = headers.index('EMAIL')
+        idx_email = tabla.indice('EMAIL')
         
         print("\n📧 EMAILS REGISTRADOS")
         print("="*60)
@@ -121,10 +119,7 @@ def ver_emails():
         total = 0
         con_email = 0
         
-        for row in range(2, ws.max_row + 1):
-            nombre = ws.cell(row, 1).value
-            email = ws.cell(row, idx_email + 1).value
-            
+        for _, nombre, email in tabla.registros(0, idx_email):
             if nombre:
                 total += 1
                 if email and str(email).strip() != '' and '@' in str(email):
@@ -0,0 +1,493 @@
+"""
+Backends de Almacenamiento - Sistema de Calificaciones
+Separa la lógica del sistema del formato en que se guardan los datos:
+- AlmacenamientoExcel: el archivo grupo001.xlsx de siempre
+- AlmacenamientoSQLite: base de datos SQLite indexada, con escritura por fila
+"""
+
+import os
+import logging
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+# openpyxl se importa dentro de las funciones que lo usan: cargarlo toma ~0.3 s
+# y con la caché al día el sistema arranca sin abrir el Excel
+
+from cache_datos import DIRECTORIO_CACHE, cargar_tabla
+
+# Encabezados del formato de Excel del sistema (columnas A-D)
+ENCABEZADOS_EXCEL = ['NOMBRE DE ALUMNO', 'CALIFICACION', 'PASÓ?', 'NUMERO DE CUENTA']
+
+# Registro que entregan los backends al cargar: (nombre, calificación, número de cuenta)
+Registro = Tuple[str, float, Optional[str]]
+
+
+def normalizar_nombre(nombre) -> str:
+    """Normaliza un nombre tal como se usa como clave en el sistema"""
+    return str(nombre).strip().upper()
+
+
+def formula_estado(fila: int, min_aprobatoria: float) -> str:
+    """Fórmula de la columna C (PASÓ?) para una fila del Excel"""
+    return f'=IF(B{fila}>={min_aprobatoria}, "Aprobado", "Reprobado")'
+
+
+def escribir_excel(archivo_excel: str, registros: Iterable[Registro], min_aprobatoria: float = 6.0) -> int:
+    """Escribe registros en un Excel nuevo con el formato de grupo001.xlsx (en streaming)"""
+    import openpyxl
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(ENCABEZADOS_EXCEL)
+
+    cantidad = 0
+    for fila, (nombre, calificacion, numero_cuenta) in enumerate(registros, start=2):
+        ws.append([nombre, calificacion, formula_estado(fila, min_aprobatoria), numero_cuenta])
+        cantidad += 1
+
+    wb.save(archivo_excel)
+    return cantidad
+
+
+class AlmacenamientoBase:
+    """Interfaz común de los backends de almacenamiento"""
+
+    descripcion = "almacenamiento"
+
+    def cargar(self) -> Iterable[Registro]:
+        """Retorna los registros de todos los estudiantes"""
+        raise NotImplementedError
+
+    def agregar(self, nombre: str, calificacion: float) -> bool:
+        """Agrega un estudiante"""
+        raise NotImplementedError
+
+    def actualizar(self, nombre: str, calificacion: float) -> bool:
+        """Actualiza la calificación de un estudiante"""
+        raise NotImplementedError
+
+    def eliminar(self, nombre: str) -> bool:
+        """Elimina un estudiante"""
+        raise NotImplementedError
+
+    def aplicar_lote(self, calificaciones: Dict[str, float], bajas: Iterable[str]) -> bool:
+        """
+        Aplica muchos cambios en una sola pasada (importación masiva)
+
+        Args:
+            calificaciones (dict): nombre -> calificación; agrega a los que no existen
+            bajas (iterable): Nombres de los estudiantes a eliminar
+        """
+        existentes = {nombre for nombre, _, _ in self.cargar()}
+        for nombre, calificacion in calificaciones.items():
+            operacion = self.actualizar if nombre in existentes else self.agregar
+            if not operacion(nombre, calificacion):
+                return False
+        return all(self.eliminar(nombre) for nombre in bajas)
+
+    def guardar(self) -> bool:
+        """Hace permanentes los cambios pendientes"""
+        raise NotImplementedError
+
+    def cerrar(self):
+        """Libera los recursos del backend"""
+
+
+class AlmacenamientoExcel(AlmacenamientoBase):
+    """
+    Backend sobre el archivo Excel del grupo
+
+    Mantiene un índice nombre -> fila para actualizar celdas en O(1). En
+    modo solo lectura los datos se cargan desde la caché columnar y el libro
+    editable se abre la primera vez que se modifica algo.
+    """
+
+    def __init__(self, archivo_excel: str, min_aprobatoria: float = 6.0,
+                 solo_lectura: bool = True, directorio_cache: str = DIRECTORIO_CACHE,
+                 crear_backup: Optional[Callable[[str], bool]] = None):
+        self.archivo_excel = archivo_excel
+        self.min_aprobatoria = min_aprobatoria
+        self.solo_lectura = solo_lectura
+        self.directorio_cache = directorio_cache
+        self.crear_backup = crear_backup
+        self.descripcion = archivo_excel
+        self.filas = {}  # Índice nombre -> fila del Excel
+        self.wb = None
+        self.ws = None
+
+    def cargar(self) -> Iterable[Registro]:
+        if self.solo_lectura:
+            tabla = cargar_tabla(self.archivo_excel, self.directorio_cache)
+            registros = tabla.registros(0, 1, 3)
+            self.wb = None
+            self.ws = None
+        else:
+            import openpyxl
+            self.wb = openpyxl.load_workbook(self.archivo_excel)
+            self.ws = self.wb.active
+            registros = (
+                (fila, row[0], row[1], row[3])
+                for fila, row in enumerate(self.ws.iter_rows(min_row=2, max_col=4, values_only=True), start=2)
+            )
+
+        self.filas = {}
+        resultado = []
+        for fila, nombre, calificacion, numero_cuenta in registros:
+            if nombre:  # Si hay nombre
+                nombre = normalizar_nombre(nombre)
+                self.filas.setdefault(nombre, fila)
+                resultado.append((
+                    nombre,
+                    calificacion if calificacion is not None else 0,
+                    str(numero_cuenta).strip() if numero_cuenta else None
+                ))
+        return resultado
+
+    def asegurar_escritura(self) -> bool:
+        """Abre el libro en modo editable la primera vez que se modifica algún dato"""
+        if self.wb is not None:
+            return True
+
+        try:
+            import openpyxl
+            self.wb = openpyxl.load_workbook(self.archivo_excel)
+            self.ws = self.wb.active
+
+            # Reconstruir el índice de filas contra el libro recién abierto
+            self.filas = {}
+            for fila, (valor,) in enumerate(self.ws.iter_rows(min_row=2, max_col=1, values_only=True), start=2):
+                if valor:
+                    self.filas.setdefault(normalizar_nombre(valor), fila)
+
+            logging.info("Libro abierto en modo edición")
+            return True
+        except Exception as e:
+            logging.error(f"Error al abrir Excel en modo edición: {e}")
+            return False
+
+    def agregar(self, nombre: str, calificacion: float) -> bool:
+        if not self.asegurar_escritura():
+            return False
+
+        nueva_fila = self.ws.max_row + 1
+        self.ws[f'A{nueva_fila}'] = nombre
+        self.ws[f'B{nueva_fila}'] = calificacion
+        self.ws[f'C{nueva_fila}'] = formula_estado(nueva_fila, self.min_aprobatoria)
+        self.filas[nombre] = nueva_fila
+        return True
+
+    def actualizar(self, nombre: str, calificacion: float) -> bool:
+        if not self.asegurar_escritura():
+            return False
+
+        fila = self.filas.get(nombre)
+        if fila is None:
+            return False
+        self.ws[f'B{fila}'] = calificacion
+        return True
+
+    def eliminar(self, nombre: str) -> bool:
+        if not self.asegurar_escritura():
+            return False
+
+        fila_eliminar = self.filas.pop(nombre, None)
+        if fila_eliminar is None:
+            return False
+
+        # Igual que en los lotes: las filas posteriores suben y su fórmula de
+        # la columna C se reescribe para que apunte a su nueva fila
+        self.compactar({fila_eliminar})
+        return True
+
+    def aplicar_lote(self, calificaciones: Dict[str, float], bajas: Iterable[str]) -> bool:
+        """
+        Aplica altas, cambios y bajas sobre la hoja en una sola pasada
+
+        Las altas se escriben a partir de la última fila calculada una sola
+        vez, y las bajas se resuelven compactando la hoja en lugar de
+        recorrerla con delete_rows por cada estudiante.
+        """
+        if not self.asegurar_escritura():
+            return False
+
+        siguiente = self.ws.max_row + 1
+        for nombre, calificacion in calificaciones.items():
+            fila = self.filas.get(nombre)
+            if fila is None:
+                self.ws.cell(siguiente, 1).value = nombre
+                self.ws.cell(siguiente, 2).value = calificacion
+                self.ws.cell(siguiente, 3).value = formula_estado(siguiente, self.min_aprobatoria)
+                self.filas[nombre] = siguiente
+                siguiente += 1
+            else:
+                self.ws.cell(fila, 2).value = calificacion
+
+        filas_borrar = {self.filas.pop(nombre) for nombre in bajas if nombre in self.filas}
+        if filas_borrar:
+            self.compactar(filas_borrar)
+        return True
+
+    def compactar(self, filas_borrar: set):
+        """Elimina varias filas a la vez recorriendo hacia arriba las que quedan"""
+        primera = min(filas_borrar)
+        ultima = self.ws.max_row
+        columnas = self.ws.max_column
+
+        destino = primera
+        nuevas = {}  # fila anterior -> fila nueva
+        filas = self.ws.iter_rows(min_row=primera, max_row=ultima, max_col=columnas, values_only=True)
+        for origen, valores in enumerate(list(filas), start=primera):
+            if origen in filas_borrar:
+                continue
+            if origen != destino:
+                for columna, valor in enumerate(valores, start=1):
+                    if columna == 3 and isinstance(valor, str) and valor.startswith('=IF(B'):
+                        valor = formula_estado(destino, self.min_aprobatoria)
+                    self.ws.cell(destino, columna).value = valor
+            nuevas[origen] = destino
+            destino += 1
+
+        self.ws.delete_rows(destino, ultima - destino + 1)
+        for nombre, fila in self.filas.items():
+            if fila >= primera:
+                self.filas[nombre] = nuevas[fila]
+
+    def guardar(self) -> bool:
+        """Guarda el libro con backup previo (no hace nada si no se abrió para edición)"""
+        if self.wb is None:
+            return True
+
+        # Crear backup antes de guardar
+        if self.crear_backup is not None:
+            self.crear_backup(self.archivo_excel)
+
+        self.wb.save(self.archivo_excel)
+        return True
+
+
+class AlmacenamientoSQLite(AlmacenamientoBase):
+    """
+    Backend sobre una base de datos SQLite
+
+    La tabla está indexada por nombre y número de cuenta y trabaja en modo WAL,
+    así que cada cambio cuesta la escritura de una fila. Los cambios se
+    acumulan en una transacción que se confirma en guardar(), que antes
+    respalda la base tal como estaba (igual que el backend de Excel).
+
+    La conexión se puede usar desde otro hilo (el guardado diferido por
+    tiempo corre en el hilo del temporizador); cada operación toma el candado
+    del backend para que nunca la usen dos hilos a la vez.
+    """
+
+    def __init__(self, archivo_db: str, archivo_excel: Optional[str] = None,
+                 directorio_cache: str = DIRECTORIO_CACHE,
+                 crear_backup: Optional[Callable[[str], bool]] = None):
+        self.archivo_db = archivo_db
+        self.archivo_excel = archivo_excel
+        self.directorio_cache = directorio_cache
+        self.crear_backup = crear_backup
+        self.descripcion = archivo_db
+
+        self.candado = threading.RLock()
+        self.conexion = sqlite3.connect(archivo_db, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        with self.conexion:
+            self.conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS estudiantes (
+                    nombre TEXT PRIMARY KEY,
+                    calificacion NUMERIC NOT NULL,
+                    numero_cuenta TEXT,
+                    orden INTEGER NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_estudiantes_cuenta ON estudiantes (numero_cuenta);
+                CREATE INDEX IF NOT EXISTS idx_estudiantes_orden ON estudiantes (orden);
+            """)
+
+    def cargar(self) -> Iterable[Registro]:
+        with self.candado:
+            # La primera vez se importa el Excel del grupo si la base está vacía
+            vacia = self.conexion.execute("SELECT COUNT(*) FROM estudiantes").fetchone()[0] == 0
+            if vacia and self.archivo_excel and os.path.exists(self.archivo_excel):
+                cantidad = self.importar_desde_excel(self.archivo_excel)
+                logging.info(f"Base SQLite inicializada desde {self.archivo_excel}: {cantidad} estudiantes")
+
+            return self.conexion.execute(
+                "SELECT nombre, calificacion, numero_cuenta FROM estudiantes ORDER BY orden"
+            ).fetchall()
+
+    def agregar(self, nombre: str, calificacion: float) -> bool:
+        with self.candado:
+            try:
+                self.conexion.execute(
+                    "INSERT INTO estudiantes (nombre, calificacion, orden) "
+                    "VALUES (?, ?, (SELECT COALESCE(MAX(orden), 0) + 1 FROM estudiantes))",
+                    (nombre, calificacion)
+                )
+                return True
+            except sqlite3.Error as e:
+                logging.error(f"Error al agregar en SQLite: {e}")
+                return False
+
+    def actualizar(self, nombre: str, calificacion: float) -> bool:
+        with self.candado:
+            try:
+                cursor = self.conexion.execute(
+                    "UPDATE estudiantes SET calificacion = ? WHERE nombre = ?", (calificacion, nombre)
+                )
+                return cursor.rowcount > 0
+            except sqlite3.Error as e:
+                logging.error(f"Error al actualizar en SQLite: {e}")
+                return False
+
+    def eliminar(self, nombre: str) -> bool:
+        with self.candado:
+            try:
+                cursor = self.conexion.execute("DELETE FROM estudiantes WHERE nombre = ?", (nombre,))
+                return cursor.rowcount > 0
+            except sqlite3.Error as e:
+                logging.error(f"Error al eliminar en SQLite: {e}")
+                return False
+
+    def aplicar_lote(self, calificaciones: Dict[str, float], bajas: Iterable[str]) -> bool:
+        with self.candado:
+            # El lote queda dentro de la transacción que confirma guardar(). Sin un
+            # BEGIN explícito, un SAVEPOINT fuera de transacción abre una propia y
+            # RELEASE la confirma en ese momento. El savepoint permite deshacer
+            # sólo el lote si algo falla, sin perder cambios anteriores sin guardar.
+            if not self.conexion.in_transaction:
+                self.conexion.execute("BEGIN")
+            self.conexion.execute("SAVEPOINT lote")
+            try:
+                orden = self.conexion.execute("SELECT COALESCE(MAX(orden), 0) FROM estudiantes").fetchone()[0]
+                existentes = {nombre for (nombre,) in self.conexion.execute("SELECT nombre FROM estudiantes")}
+
+                nuevos = []
+                cambios = []
+                for nombre, calificacion in calificaciones.items():
+                    if nombre in existentes:
+                        cambios.append((calificacion, nombre))
+                    else:
+                        orden += 1
+                        nuevos.append((nombre, calificacion, orden))
+
+                self.conexion.executemany("UPDATE estudiantes SET calificacion = ? WHERE nombre = ?", cambios)
+                self.conexion.executemany(
+                    "INSERT INTO estudiantes (nombre, calificacion, orden) VALUES (?, ?, ?)", nuevos
+                )
+                self.conexion.executemany("DELETE FROM estudiantes WHERE nombre = ?", [(n,) for n in bajas])
+                self.conexion.execute("RELEASE lote")
+                return True
+            except sqlite3.Error as e:
+                logging.error(f"Error al aplicar lote en SQLite: {e}")
+                self.conexion.execute("ROLLBACK TO lote")
+                self.conexion.execute("RELEASE lote")
+                return False
+
+    def guardar(self) -> bool:
+        with self.candado:
+            if self.conexion.in_transaction and self.crear_backup is not None:
+                self.respaldar()
+            self.conexion.commit()
+            return True
+
+    def respaldar(self):
+        """
+        Copia consistente de la base antes de confirmar los cambios pendientes
+
+        Se usa la API de backup de SQLite desde una conexión aparte, que ve el
+        último estado confirmado (copiar el archivo omitiría lo que está en el
+        -wal). La copia se entrega a crear_backup como un archivo .db normal.
+        """
+        ruta = os.path.splitext(self.archivo_db)
+        temporal = f"{ruta[0]}_respaldo{ruta[1] or '.db'}"
+        origen = sqlite3.connect(self.archivo_db)
+        destino = sqlite3.connect(temporal)
+        try:
+            origen.backup(destino)
+        finally:
+            destino.close()
+            origen.close()
+        try:
+            self.crear_backup(temporal)
+        finally:
+            os.remove(temporal)
+
+    def cerrar(self):
+        with self.candado:
+            self.conexion.commit()
+            self.conexion.close()
+
+    def importar_desde_excel(self, archivo_excel: str) -> int:
+        """Reemplaza el contenido de la base con los datos de un Excel del sistema"""
+        with self.candado:
+            tabla = cargar_tabla(archivo_excel, self.directorio_cache)
+            registros = {}
+            for orden, (_, nombre, calificacion, numero_cuenta) in enumerate(tabla.registros(0, 1, 3), start=1):
+                if nombre:
+                    registros[normalizar_nombre(nombre)] = (
+                        calificacion if calificacion is not None else 0,
+                        str(numero_cuenta).strip() if numero_cuenta else None,
+                        orden
+                    )
+
+            with self.conexion:
+                self.conexion.execute("DELETE FROM estudiantes")
+                self.conexion.executemany(
+                    "INSERT INTO estudiantes (nombre, calificacion, numero_cuenta, orden) VALUES (?, ?, ?, ?)",
+                    [(nombre, *datos) for nombre, datos in registros.items()]
+                )
+            return len(registros)
+
+    def exportar_a_excel(self, archivo_excel: str, min_aprobatoria: float = 6.0) -> int:
+        """Escribe la base en un Excel con el formato de grupo001.xlsx"""
+        with self.candado:
+            consulta = "SELECT nombre, calificacion, numero_cuenta FROM estudiantes ORDER BY orden"
+            return escribir_excel(archivo_excel, self.conexion.execute(consulta), min_aprobatoria)
+
+
+def crear_almacenamiento(config, crear_backup: Optional[Callable[[str], bool]] = None) -> AlmacenamientoBase:
+    """Crea el backend indicado en almacenamiento.tipo ('excel' o 'sqlite')"""
+    archivo_excel = config.get('archivos', 'excel_principal', default='grupo001.xlsx')
+    directorio_cache = config.get('archivos', 'directorio_cache', default=DIRECTORIO_CACHE)
+    tipo = config.get('almacenamiento', 'tipo', default='excel')
+
+    if tipo == 'sqlite':
+        return AlmacenamientoSQLite(
+            config.get('almacenamiento', 'archivo_sqlite', default='calificaciones.db'),
+            archivo_excel=archivo_excel,
+            directorio_cache=directorio_cache,
+            crear_backup=crear_backup
+        )
+
+    return AlmacenamientoExcel(
+        archivo_excel,
+        min_aprobatoria=config.get('calificaciones', 'minima_aprobatoria', default=6.0),
+        solo_lectura=config.get('archivos', 'carga_solo_lectura', default=True),
+        directorio_cache=directorio_cache,
+        crear_backup=crear_backup
+    )
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 4 or sys.argv[1] not in ('importar', 'exportar'):
+        print("Uso:")
+        print("  python3 almacenamiento.py importar grupo001.xlsx calificaciones.db")
+        print("  python3 almacenamiento.py exportar calificaciones.db grupo001_exportado.xlsx")
+        sys.exit(1)
+
+    try:
+        if sys.argv[1] == 'importar':
+            base = AlmacenamientoSQLite(sys.argv[3])
+            cantidad = base.importar_desde_excel(sys.argv[2])
+            print(f"✅ {cantidad} estudiantes importados de {sys.argv[2]} a {sys.argv[3]}")
+        else:
+            base = AlmacenamientoSQLite(sys.argv[2])
+            cantidad = base.exportar_a_excel(sys.argv[3])
+            print(f"✅ {cantidad} estudiantes exportados de {sys.argv[2]} a {sys.argv[3]}")
+        base.cerrar()
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
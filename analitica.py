@@ -0,0 +1,227 @@
+"""
+Analítica de Calificaciones - Sistema de Calificaciones
+Estadísticas descriptivas del grupo (promedio, mediana, desviación estándar,
+percentiles, histograma por intervalos y puntuaciones z) calculadas en forma
+vectorizada con NumPy. Si NumPy no está instalado se usa una implementación
+en Python puro con los mismos resultados.
+
+Uso:
+    python3 analitica.py --benchmark [cantidad]
+"""
+
+import sys
+import math
+import time
+import random
+import importlib.util
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# NumPy es opcional: sin él se usa la implementación en Python puro. Se importa
+# al calcular la primera estadística (cargarlo toma ~0.1 s) y no al arrancar
+NUMPY_DISPONIBLE = importlib.util.find_spec('numpy') is not None
+np = None
+
+
+def cargar_numpy():
+    """Importa NumPy la primera vez que se necesita"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+PERCENTILES_POR_DEFECTO = (10, 25, 50, 75, 90)
+
+
+class AnaliticaCalificaciones:
+    """Estadísticas de un conjunto de calificaciones"""
+
+    def __init__(self, calificaciones: Iterable[float], min_aprobatoria: float = 6.0,
+                 nombres: Optional[List[str]] = None, usar_numpy: bool = NUMPY_DISPONIBLE):
+        self.min_aprobatoria = min_aprobatoria
+        self.nombres = nombres
+        self.usar_numpy = usar_numpy and NUMPY_DISPONIBLE
+        if self.usar_numpy:
+            cargar_numpy()
+        if self.usar_numpy and isinstance(calificaciones, array):
+            self.valores = np.array(calificaciones, dtype=np.float64)  # Copia directa del buffer
+        elif self.usar_numpy:
+            self.valores = np.fromiter(calificaciones, dtype=np.float64)
+        else:
+            self.valores = [float(valor) for valor in calificaciones]
+        self._ordenados = None
+        self._momentos = None
+
+    @classmethod
+    def desde_estudiantes(cls, estudiantes: Dict[str, dict], min_aprobatoria: float = 6.0,
+                          usar_numpy: bool = NUMPY_DISPONIBLE):
+        """Crea la analítica a partir del diccionario nombre -> {'calificacion': ...}"""
+        if hasattr(estudiantes, 'calificaciones'):
+            # RegistrosEstudiantes: las calificaciones ya están en un arreglo contiguo
+            return cls(estudiantes.calificaciones, min_aprobatoria,
+                       nombres=list(estudiantes.nombres), usar_numpy=usar_numpy)
+        return cls(
+            (info['calificacion'] for info in estudiantes.values()),
+            min_aprobatoria,
+            nombres=list(estudiantes),
+            usar_numpy=usar_numpy
+        )
+
+    @property
+    def total(self) -> int:
+        return len(self.valores)
+
+    def ordenados(self):
+        """Calificaciones ordenadas (se calculan una sola vez)"""
+        if self._ordenados is None:
+            self._ordenados = np.sort(self.valores) if self.usar_numpy else sorted(self.valores)
+        return self._ordenados
+
+    def momentos(self) -> Tuple[float, float]:
+        """Promedio y desviación estándar poblacional (se calculan una sola vez)"""
+        if self._momentos is None:
+            if not self.total:
+                self._momentos = (0.0, 0.0)
+            elif self.usar_numpy:
+                self._momentos = (float(self.valores.mean()), float(self.valores.std()))
+            else:
+                promedio = math.fsum(self.valores) / self.total
+                varianza = math.fsum((valor - promedio) ** 2 for valor in self.valores) / self.total
+                self._momentos = (promedio, math.sqrt(varianza))
+        return self._momentos
+
+    def resumen(self) -> dict:
+        """Total, aprobados, promedio, mediana, desviación estándar poblacional, mínima y máxima"""
+        if not self.total:
+            return {'total': 0, 'aprobados': 0, 'reprobados': 0, 'promedio': 0.0, 'mediana': 0.0,
+                    'desviacion': 0.0, 'minima': None, 'maxima': None}
+
+        if self.usar_numpy:
+            aprobados = int(np.count_nonzero(self.valores >= self.min_aprobatoria))
+        else:
+            aprobados = sum(1 for valor in self.valores if valor >= self.min_aprobatoria)
+        promedio, desviacion = self.momentos()
+
+        ordenados = self.ordenados()
+        return {
+            'total': self.total,
+            'aprobados': aprobados,
+            'reprobados': self.total - aprobados,
+            'promedio': promedio,
+            'mediana': self.percentiles((50,))[50],
+            'desviacion': desviacion,
+            'minima': float(ordenados[0]),
+            'maxima': float(ordenados[-1])
+        }
+
+    def percentiles(self, percentiles: Sequence[float] = PERCENTILES_POR_DEFECTO) -> Dict[float, float]:
+        """Percentiles con interpolación lineal (el mismo criterio que numpy.percentile)"""
+        if not self.total:
+            return {p: 0.0 for p in percentiles}
+
+        ordenados = self.ordenados()
+        if self.usar_numpy:
+            valores = np.percentile(ordenados, percentiles)
+            return {p: float(v) for p, v in zip(percentiles, valores)}
+
+        resultado = {}
+        for p in percentiles:
+            posicion = p / 100 * (self.total - 1)
+            abajo = int(math.floor(posicion))
+            arriba = min(abajo + 1, self.total - 1)
+            fraccion = posicion - abajo
+            resultado[p] = ordenados[abajo] + (ordenados[arriba] - ordenados[abajo]) * fraccion
+        return resultado
+
+    def histograma(self, intervalos: int = 10, minimo: float = 0.0,
+                   maximo: float = 10.0) -> List[Tuple[float, float, int]]:
+        """
+        Cuenta estudiantes por intervalos iguales entre minimo y maximo
+
+        Cada intervalo incluye su límite inferior; el último incluye también el
+        superior (la calificación máxima). Las calificaciones fuera de rango se
+        ignoran.
+
+        Returns:
+            list: Tuplas (desde, hasta, cantidad)
+        """
+        ancho = (maximo - minimo) / intervalos
+        limites = [minimo + ancho * i for i in range(intervalos)] + [maximo]
+
+        if self.usar_numpy:
+            cantidades = np.histogram(self.valores, bins=intervalos, range=(minimo, maximo))[0].tolist()
+        else:
+            cantidades = [0] * intervalos
+            for valor in self.valores:
+                if minimo <= valor <= maximo:
+                    cantidades[min(int((valor - minimo) / ancho), intervalos - 1)] += 1
+
+        return [(limites[i], limites[i + 1], cantidades[i]) for i in range(intervalos)]
+
+    def puntuaciones_z(self):
+        """Puntuación z de cada calificación, en el mismo orden que las calificaciones"""
+        promedio, desviacion = self.momentos()
+        if self.usar_numpy:
+            if desviacion == 0:
+                return np.zeros(self.total)
+            return (self.valores - promedio) / desviacion
+        if desviacion == 0:
+            return [0.0] * self.total
+        return [(valor - promedio) / desviacion for valor in self.valores]
+
+    def atipicos(self, umbral: float = 2.0) -> List[Tuple[str, float, float]]:
+        """
+        Estudiantes cuya calificación se aleja del promedio al menos `umbral` desviaciones
+
+        Returns:
+            list: Tuplas (nombre, calificación, z) ordenadas por |z| descendente
+        """
+        if self.nombres is None:
+            return []
+
+        z = self.puntuaciones_z()
+        if self.usar_numpy:
+            indices = np.flatnonzero(np.abs(z) >= umbral).tolist()
+        else:
+            indices = [i for i, valor in enumerate(z) if abs(valor) >= umbral]
+
+        resultado = [(self.nombres[i], float(self.valores[i]), float(z[i])) for i in indices]
+        resultado.sort(key=lambda atipico: (-abs(atipico[2]), atipico[0]))
+        return resultado
+
+
+def benchmark_analitica(cantidad=1_000_000):
+    """Mide el tiempo del cálculo completo de estadísticas con NumPy y con Python puro"""
+    generador = random.Random(42)
+    calificaciones = [round(min(10.0, max(0.0, generador.gauss(7, 1.8))), 1) for _ in range(cantidad)]
+
+    print(f"\n⏱️  BENCHMARK DE ANALÍTICA ({cantidad:,} calificaciones)")
+    print("━" * 60)
+
+    modos = [('NumPy', True)] if NUMPY_DISPONIBLE else []
+    if NUMPY_DISPONIBLE:
+        cargar_numpy()  # La importación no cuenta en el tiempo del cálculo
+    modos.append(('Python puro', False))
+    for etiqueta, usar_numpy in modos:
+        inicio = time.perf_counter()
+        analitica = AnaliticaCalificaciones(calificaciones, usar_numpy=usar_numpy)
+        resumen = analitica.resumen()
+        analitica.percentiles()
+        analitica.histograma()
+        analitica.puntuaciones_z()
+        duracion = time.perf_counter() - inicio
+        print(f"   {etiqueta:<12} {duracion:8.3f} s   "
+              f"(promedio {resumen['promedio']:.3f}, mediana {resumen['mediana']:.2f}, "
+              f"desviación {resumen['desviacion']:.3f})")
+
+    if not NUMPY_DISPONIBLE:
+        print("\n   💡 Instala NumPy (pip install numpy) para el cálculo vectorizado.")
+    print("━" * 60)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark_analitica(int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000)
+    else:
+        print(__doc__)
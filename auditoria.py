@@ -0,0 +1,200 @@
+"""
+Auditoría - Sistema de Calificaciones
+Registro estructurado (JSON por línea) de todas las consultas y cambios de
+calificaciones, en un archivo por mes:
+
+    logs/auditoria/auditoria_AAAAMM.jsonl
+    {"ts": "2025-04-29T14:31:45", "evento": "modificar", "estudiante": "JUAN PEREZ",
+     "anterior": 7, "nueva": 8.5}
+
+Junto a los archivos se mantiene un índice SQLite (estudiante -> archivo y
+posición de cada línea) para obtener el historial completo de un estudiante
+sin recorrer meses de registros: sólo se lee la línea de cada evento. El
+índice se pone al día al consultar (indexa lo que se agregó desde la última
+vez), así que registrar un evento es sólo agregar una línea al archivo.
+
+Uso:
+    python3 main_pro.py historial "JUAN PEREZ"
+"""
+
+import re
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# Campo "estudiante" de una línea (más rápido que decodificar la línea completa)
+PATRON_ESTUDIANTE = re.compile(rb'"estudiante": ("(?:[^"\\]|\\.)*")')
+
+
+class RegistroAuditoria:
+    """Archivos JSONL mensuales de auditoría con índice por estudiante"""
+
+    def __init__(self, directorio):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.archivo_indice = self.directorio / 'indice_auditoria.db'
+        self._f = None
+        self._mes = None
+        self._conexion = None
+
+    def archivo_del_mes(self, mes: str) -> Path:
+        return self.directorio / f"auditoria_{mes}.jsonl"
+
+    def _archivo_actual(self):
+        mes = datetime.now().strftime('%Y%m')
+        if mes != self._mes:
+            if self._f is not None:
+                self._f.close()
+            self._f = open(self.archivo_del_mes(mes), 'a', encoding='utf-8')
+            self._mes = mes
+        return self._f
+
+    # --- Registro ---
+
+    def registrar(self, evento: str, estudiante: Optional[str] = None, **datos):
+        """Agrega un evento (consulta, agregar, modificar, eliminar, acceso...)"""
+        self.registrar_varios([(evento, estudiante, datos)])
+
+    def registrar_varios(self, eventos: Iterable[Tuple[str, Optional[str], dict]]):
+        """Agrega varios eventos (evento, estudiante, datos) con una sola escritura"""
+        ts = datetime.now().isoformat(timespec='seconds')
+        lineas = []
+        for evento, estudiante, datos in eventos:
+            entrada = {'ts': ts, 'evento': evento}
+            if estudiante:
+                entrada['estudiante'] = estudiante
+            entrada.update(datos)
+            lineas.append(json.dumps(entrada, ensure_ascii=False) + '\n')
+        f = self._archivo_actual()
+        f.write(''.join(lineas))
+        f.flush()
+
+    # --- Índice ---
+
+    def conexion(self) -> sqlite3.Connection:
+        if self._conexion is None:
+            self._conexion = sqlite3.connect(self.archivo_indice)
+            self._conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS archivos (
+                    id INTEGER PRIMARY KEY,
+                    nombre TEXT NOT NULL UNIQUE,
+                    indexado INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS estudiantes (
+                    id INTEGER PRIMARY KEY,
+                    nombre TEXT NOT NULL UNIQUE
+                );
+                CREATE TABLE IF NOT EXISTS eventos (
+                    estudiante INTEGER NOT NULL,
+                    archivo INTEGER NOT NULL,
+                    posicion INTEGER NOT NULL,
+                    PRIMARY KEY (estudiante, archivo, posicion)
+                ) WITHOUT ROWID;
+            """)
+        return self._conexion
+
+    def actualizar_indice(self) -> int:
+        """
+        Indexa las líneas agregadas desde la última actualización
+
+        Los eventos se guardan agrupados por estudiante (tabla WITHOUT ROWID con
+        llave estudiante, archivo, posición), así que el historial de un
+        estudiante se lee de un solo tramo del índice. Los archivos se nombran
+        por mes, así que ordenados por nombre quedan en orden cronológico.
+
+        Returns:
+            int: Cantidad de eventos indexados
+        """
+        if self._f is not None:
+            self._f.flush()
+        conexion = self.conexion()
+        nuevos = 0
+        with conexion:
+            conexion.execute("BEGIN IMMEDIATE")  # Otra instancia del sistema no indexa lo mismo a la vez
+            archivos = {nombre: (id_archivo, indexado) for id_archivo, nombre, indexado
+                        in conexion.execute("SELECT id, nombre, indexado FROM archivos")}
+            pendientes = [archivo for archivo in sorted(self.directorio.glob('auditoria_*.jsonl'))
+                          if archivo.stat().st_size > archivos.get(archivo.name, (None, 0))[1]]
+            if not pendientes:
+                return 0
+            estudiantes = dict(conexion.execute("SELECT nombre, id FROM estudiantes"))
+
+            for archivo in pendientes:
+                id_archivo, desde = archivos.get(archivo.name, (None, 0))
+                if id_archivo is None:
+                    id_archivo = conexion.execute("INSERT INTO archivos (nombre, indexado) VALUES (?, 0)",
+                                                  (archivo.name,)).lastrowid
+
+                filas = []
+                with open(archivo, 'rb') as f:
+                    f.seek(desde)
+                    posicion = desde
+                    for linea in f:
+                        if not linea.endswith(b'\n'):
+                            break  # Línea que se está escribiendo: se indexa la próxima vez
+                        coincidencia = PATRON_ESTUDIANTE.search(linea)
+                        if coincidencia:
+                            valor = coincidencia.group(1)
+                            nombre = json.loads(valor) if b'\\' in valor else valor[1:-1].decode('utf-8')
+                            id_estudiante = estudiantes.get(nombre)
+                            if id_estudiante is None:
+                                id_estudiante = conexion.execute("INSERT INTO estudiantes (nombre) VALUES (?)",
+                                                                 (nombre,)).lastrowid
+                                estudiantes[nombre] = id_estudiante
+                            filas.append((id_estudiante, id_archivo, posicion))
+                        posicion += len(linea)
+
+                filas.sort()  # Inserción en el orden de la llave: menos trabajo para el índice
+                conexion.executemany("INSERT OR IGNORE INTO eventos VALUES (?, ?, ?)", filas)
+                conexion.execute("UPDATE archivos SET indexado = ? WHERE id = ?", (posicion, id_archivo))
+                nuevos += len(filas)
+        return nuevos
+
+    def historial(self, estudiante: str, eventos: Optional[Iterable[str]] = None) -> List[dict]:
+        """Todos los eventos de un estudiante en orden cronológico (opcionalmente sólo ciertos eventos)"""
+        self.actualizar_indice()
+        filas = self.conexion().execute("""
+            SELECT a.nombre, e.posicion
+            FROM eventos e
+            JOIN estudiantes s ON s.id = e.estudiante
+            JOIN archivos a ON a.id = e.archivo
+            WHERE s.nombre = ?
+            ORDER BY a.nombre, e.posicion
+        """, (estudiante,)).fetchall()
+
+        resultado = []
+        abierto, f = None, None
+        try:
+            for archivo, posicion in filas:
+                if archivo != abierto:
+                    if f is not None:
+                        f.close()
+                    try:
+                        f = open(self.directorio / archivo, 'rb')
+                    except FileNotFoundError:
+                        f = None  # Archivo de un mes que ya se borró
+                    abierto = archivo
+                if f is None:
+                    continue
+                f.seek(posicion)
+                resultado.append(json.loads(f.readline()))
+        finally:
+            if f is not None:
+                f.close()
+
+        if eventos is not None:
+            eventos = set(eventos)
+            resultado = [entrada for entrada in resultado if entrada['evento'] in eventos]
+        return resultado
+
+    def cerrar(self):
+        """Indexa los eventos de la sesión (así la próxima consulta no tiene que hacerlo) y cierra"""
+        if self._f is not None:
+            self.actualizar_indice()
+            self._f.close()
+            self._f = None
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
@@ -0,0 +1,176 @@
+"""
+Almacén de Backups Deduplicado - Sistema de Calificaciones
+Guarda los backups completos por contenido: cada parte del archivo se guarda
+una sola vez con el hash SHA-256 de su contenido como nombre, y cada backup
+es sólo una entrada del manifiesto que apunta a sus partes. Un .xlsx es un ZIP
+de varios XML (hoja, estilos, tema, propiedades...) y entre un guardado y otro
+casi todos quedan iguales, así que se deduplica cada parte por separado: dos
+backups idénticos o casi idénticos comparten casi todo su espacio en disco.
+
+Archivos en el directorio de backups:
+    manifiesto.json          Lista de backups y las partes de cada uno
+    objetos/ab/abcdef...gz   Contenido de cada parte (comprimido con gzip)
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+
+class AlmacenBackups:
+    """Backups completos guardados por contenido, con manifiesto"""
+
+    def __init__(self, directorio, comprimir: bool = True):
+        self.directorio = Path(directorio)
+        self.objetos = self.directorio / 'objetos'
+        self.objetos.mkdir(parents=True, exist_ok=True)
+        self.archivo_manifiesto = self.directorio / 'manifiesto.json'
+        self.comprimir = comprimir
+        self.entradas: List[dict] = self.leer_manifiesto()  # De la más antigua a la más nueva
+
+    # --- Manifiesto ---
+
+    def leer_manifiesto(self) -> List[dict]:
+        try:
+            with open(self.archivo_manifiesto, 'r', encoding='utf-8') as f:
+                return json.load(f)['backups']
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError, KeyError) as e:
+            logging.error(f"Manifiesto de backups dañado ({self.archivo_manifiesto}): {e}")
+            return []
+
+    def escribir_manifiesto(self):
+        temporal = self.archivo_manifiesto.with_suffix('.tmp')
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'backups': self.entradas}, f, ensure_ascii=False, indent=1)
+        os.replace(temporal, self.archivo_manifiesto)
+
+    # --- Objetos ---
+
+    def ruta_objeto(self, clave: str) -> Optional[Path]:
+        """Ruta del objeto guardado (comprimido o no), o None si no existe"""
+        base = self.objetos / clave[:2] / clave
+        for ruta in (base.with_name(clave + '.gz'), base):
+            if ruta.exists():
+                return ruta
+        return None
+
+    def guardar_objeto(self, datos: bytes) -> Tuple[str, int]:
+        """
+        Guarda un contenido si no existía
+
+        Returns:
+            tuple: (hash del contenido, bytes escritos en disco; 0 si ya existía)
+        """
+        clave = hashlib.sha256(datos).hexdigest()
+        if self.ruta_objeto(clave) is not None:
+            return clave, 0
+
+        ruta = self.objetos / clave[:2] / (clave + '.gz' if self.comprimir else clave)
+        ruta.parent.mkdir(exist_ok=True)
+        contenido = gzip.compress(datos, compresslevel=6) if self.comprimir else datos
+        temporal = ruta.with_name(ruta.name + '.tmp')
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+        os.replace(temporal, ruta)
+        return clave, len(contenido)
+
+    def leer_objeto(self, clave: str) -> bytes:
+        ruta = self.ruta_objeto(clave)
+        if ruta is None:
+            raise FileNotFoundError(f"falta el objeto {clave} del almacén de backups")
+        with open(ruta, 'rb') as f:
+            datos = f.read()
+        return gzip.decompress(datos) if ruta.suffix == '.gz' else datos
+
+    # --- Backups ---
+
+    def agregar(self, archivo_origen: str, nombre: str) -> dict:
+        """Guarda un backup de archivo_origen; las partes que ya existían no ocupan espacio nuevo"""
+        partes = []
+        escritos = 0
+        if zipfile.is_zipfile(archivo_origen):
+            with zipfile.ZipFile(archivo_origen) as z:
+                for info in z.infolist():
+                    clave, tamano = self.guardar_objeto(z.read(info))
+                    partes.append([info.filename, clave])
+                    escritos += tamano
+        else:
+            with open(archivo_origen, 'rb') as f:
+                clave, escritos = self.guardar_objeto(f.read())
+            partes.append([None, clave])
+
+        entrada = {
+            'nombre': nombre,
+            'fecha': datetime.fromtimestamp(os.path.getmtime(archivo_origen)).isoformat(timespec='seconds'),
+            'tamano': os.path.getsize(archivo_origen),
+            'escritos': escritos,
+            'partes': partes
+        }
+        # Dos backups en el mismo segundo tienen el mismo nombre: se conserva el último
+        self.entradas = [e for e in self.entradas if e['nombre'] != nombre] + [entrada]
+        self.escribir_manifiesto()
+        return entrada
+
+    def extraer(self, entrada: dict, destino) -> Path:
+        """Reconstruye el archivo de un backup en destino"""
+        destino = Path(destino)
+        temporal = destino.with_name(destino.name + '.tmp')
+        try:
+            if entrada['partes'][0][0] is None:
+                with open(temporal, 'wb') as f:
+                    f.write(self.leer_objeto(entrada['partes'][0][1]))
+            else:
+                with zipfile.ZipFile(temporal, 'w', zipfile.ZIP_DEFLATED) as z:
+                    for nombre, clave in entrada['partes']:
+                        z.writestr(nombre, self.leer_objeto(clave))
+            os.replace(temporal, destino)
+        except BaseException:
+            temporal.unlink(missing_ok=True)
+            raise
+        return destino
+
+    def buscar(self, nombre: str) -> Optional[dict]:
+        for entrada in self.entradas:
+            if entrada['nombre'] == nombre:
+                return entrada
+        return None
+
+    def limpiar(self, max_backups: int) -> int:
+        """
+        Conserva los últimos max_backups backups y borra los objetos que ya
+        no usa ningún backup
+
+        Returns:
+            int: Cantidad de objetos eliminados
+        """
+        if len(self.entradas) <= max_backups:
+            return 0
+
+        for entrada in self.entradas[:-max_backups]:
+            logging.info(f"Backup antiguo eliminado: {entrada['nombre']}")
+        self.entradas = self.entradas[-max_backups:] if max_backups else []
+        self.escribir_manifiesto()
+
+        usados: Set[str] = {clave for entrada in self.entradas for _, clave in entrada['partes']}
+        eliminados = 0
+        for ruta in self.objetos.glob('*/*'):
+            if ruta.name.split('.')[0] not in usados:
+                ruta.unlink(missing_ok=True)
+                eliminados += 1
+        return eliminados
+
+    def espacio(self) -> Tuple[int, int]:
+        """
+        Returns:
+            tuple: (bytes que ocupan los objetos, bytes que ocuparían los backups como copias completas)
+        """
+        en_disco = sum(ruta.stat().st_size for ruta in self.objetos.glob('*/*'))
+        return en_disco, sum(entrada['tamano'] for entrada in self.entradas)
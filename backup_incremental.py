@@ -0,0 +1,219 @@
+"""
+Backups Incrementales - Sistema de Calificaciones
+En lugar de copiar el Excel completo en cada guardado, registra cada cambio
+(alta, modificación o baja) como una línea en un diario de sólo-agregar y
+toma una copia completa (snapshot) de los datos cada cierto número de
+cambios. Para restaurar a un momento dado se parte del último snapshot
+anterior a ese momento y se aplican los cambios del diario hasta esa hora.
+
+Archivos en el directorio de backups:
+    diario_cambios.jsonl                          Un cambio por línea
+    diario_estado.json                            Firma del archivo en el último guardado
+    snapshot_<secuencia>_<AAAAMMDD_HHMMSS>.json.gz Copia completa de los datos
+"""
+
+import os
+import json
+import gzip
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+FORMATO_FECHA = '%Y%m%d_%H%M%S'
+
+# Registro de un estudiante: (nombre, calificación, número de cuenta)
+Registro = Tuple[str, float, Optional[str]]
+
+
+class Snapshot:
+    """Snapshot en disco, identificado por la secuencia del diario y la fecha en que se tomó"""
+
+    def __init__(self, ruta: Path):
+        _, secuencia, fecha, hora = ruta.name.split('.')[0].split('_')
+        self.ruta = ruta
+        self.secuencia = int(secuencia)
+        self.fecha = datetime.strptime(f"{fecha}_{hora}", FORMATO_FECHA)
+
+
+class DiarioCambios:
+    """Diario de cambios de sólo-agregar con snapshots periódicos"""
+
+    def __init__(self, directorio, cambios_por_snapshot: int = 500, max_snapshots: int = 10):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.archivo = self.directorio / 'diario_cambios.jsonl'
+        self.archivo_estado = self.directorio / 'diario_estado.json'
+        self.cambios_por_snapshot = cambios_por_snapshot
+        self.max_snapshots = max_snapshots
+
+        self.snapshots: List[Snapshot] = sorted(
+            (Snapshot(ruta) for ruta in self.directorio.glob('snapshot_*.json.gz')),
+            key=lambda snapshot: snapshot.secuencia
+        )
+        self.secuencia = max(self.ultima_secuencia(), self.snapshots[-1].secuencia if self.snapshots else 0)
+        self.estado = self.leer_estado()
+        self._f = open(self.archivo, 'a', encoding='utf-8')
+
+    # --- Estado persistente ---
+
+    def ultima_secuencia(self) -> int:
+        """Secuencia de la última línea del diario (lee sólo el final del archivo)"""
+        try:
+            with open(self.archivo, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                tamano = f.tell()
+                f.seek(max(0, tamano - 4096))
+                lineas = f.read().splitlines()
+            for linea in reversed(lineas):
+                try:
+                    return json.loads(linea)['seq']
+                except (ValueError, KeyError):
+                    continue  # Línea cortada o incompleta
+        except OSError:
+            pass
+        return 0
+
+    def leer_estado(self) -> dict:
+        try:
+            with open(self.archivo_estado, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def escribir_estado(self):
+        temporal = self.archivo_estado.with_suffix('.tmp')
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.estado, f)
+        os.replace(temporal, self.archivo_estado)
+
+    @property
+    def cambios_desde_snapshot(self) -> int:
+        return self.secuencia - (self.snapshots[-1].secuencia if self.snapshots else 0)
+
+    # --- Registro de cambios ---
+
+    def registrar(self, operacion: str, nombre: str, calificacion=None):
+        """Agrega un cambio al diario ('agregar', 'actualizar' o 'eliminar')"""
+        self.registrar_lote([(operacion, nombre, calificacion)])
+
+    def registrar_lote(self, cambios: Iterable[Tuple[str, str, Optional[float]]]):
+        """Agrega varios cambios (operación, nombre, calificación) con una sola escritura"""
+        ts = datetime.now().isoformat(timespec='seconds')
+        lineas = []
+        for operacion, nombre, calificacion in cambios:
+            self.secuencia += 1
+            entrada = {'seq': self.secuencia, 'ts': ts, 'op': operacion, 'nombre': nombre}
+            if calificacion is not None:
+                entrada['calificacion'] = calificacion
+            lineas.append(json.dumps(entrada, ensure_ascii=False) + '\n')
+        self._f.write(''.join(lineas))
+        self._f.flush()
+
+    def necesita_snapshot(self, firma) -> bool:
+        """True si no hay snapshot o si el archivo cambió fuera del sistema desde el último guardado"""
+        return not self.snapshots or self.estado.get('firma') != list(firma)
+
+    def tomar_snapshot(self, registros: Iterable[Registro], firma=None):
+        """Guarda una copia completa de los datos asociada a la secuencia actual del diario"""
+        fecha = datetime.now()
+        ruta = self.directorio / f"snapshot_{self.secuencia:09d}_{fecha.strftime(FORMATO_FECHA)}.json.gz"
+        temporal = ruta.with_name(ruta.name + '.tmp')
+        with gzip.open(temporal, 'wt', encoding='utf-8') as f:
+            json.dump({'seq': self.secuencia, 'ts': fecha.isoformat(timespec='seconds'),
+                       'registros': [list(registro) for registro in registros]}, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+
+        self.snapshots = [s for s in self.snapshots if s.ruta != ruta] + [Snapshot(ruta)]
+        if firma is not None:
+            self.estado['firma'] = list(firma)
+            self.escribir_estado()
+        logging.info(f"Snapshot de backup creado: {ruta.name}")
+        self.limpiar()
+
+    def guardado(self, firma, obtener_registros: Callable[[], Iterable[Registro]]):
+        """Registra que el archivo se guardó; toma un snapshot si se acumularon suficientes cambios"""
+        if self.cambios_desde_snapshot >= self.cambios_por_snapshot:
+            self.tomar_snapshot(obtener_registros(), firma)
+        else:
+            self.estado['firma'] = list(firma)
+            self.escribir_estado()
+
+    def limpiar(self):
+        """
+        Conserva los últimos max_snapshots y recorta del diario los cambios
+        anteriores al snapshot más antiguo que queda
+        """
+        if len(self.snapshots) <= self.max_snapshots:
+            return
+
+        for snapshot in self.snapshots[:-self.max_snapshots]:
+            snapshot.ruta.unlink(missing_ok=True)
+            logging.info(f"Snapshot antiguo eliminado: {snapshot.ruta.name}")
+        self.snapshots = self.snapshots[-self.max_snapshots:]
+        corte = self.snapshots[0].secuencia
+
+        self._f.close()
+        temporal = self.archivo.with_suffix('.tmp')
+        with open(self.archivo, 'r', encoding='utf-8') as origen, open(temporal, 'w', encoding='utf-8') as destino:
+            for linea in origen:
+                try:
+                    if json.loads(linea)['seq'] > corte:
+                        destino.write(linea)
+                except (ValueError, KeyError):
+                    continue
+        os.replace(temporal, self.archivo)
+        self._f = open(self.archivo, 'a', encoding='utf-8')
+
+    # --- Restauración ---
+
+    def reconstruir(self, momento: datetime) -> Tuple[List[Registro], int]:
+        """
+        Reconstruye los datos tal como estaban en un momento dado
+
+        Returns:
+            tuple: (registros, número de cambios del diario aplicados)
+
+        Raises:
+            ValueError: Si no hay un snapshot anterior a ese momento
+        """
+        anteriores = [snapshot for snapshot in self.snapshots if snapshot.fecha <= momento]
+        if not anteriores:
+            raise ValueError("no hay un snapshot anterior a esa fecha")
+        snapshot = anteriores[-1]
+
+        with gzip.open(snapshot.ruta, 'rt', encoding='utf-8') as f:
+            datos = json.load(f)
+        estudiantes = {nombre: [calificacion, cuenta] for nombre, calificacion, cuenta in datos['registros']}
+
+        self._f.flush()
+        aplicados = 0
+        limite = momento.isoformat(timespec='seconds')
+        with open(self.archivo, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    entrada = json.loads(linea)
+                except ValueError:
+                    continue  # Línea incompleta (p. ej. por un corte de energía)
+                if entrada['seq'] <= snapshot.secuencia:
+                    continue
+                if entrada['ts'] > limite:
+                    break
+
+                nombre = entrada['nombre']
+                if entrada['op'] == 'eliminar':
+                    estudiantes.pop(nombre, None)
+                elif nombre in estudiantes:
+                    estudiantes[nombre][0] = entrada['calificacion']
+                else:
+                    estudiantes[nombre] = [entrada['calificacion'], None]
+                aplicados += 1
+
+        return [(nombre, c, cuenta) for nombre, (c, cuenta) in estudiantes.items()], aplicados
+
+    def tamano_diario(self) -> int:
+        self._f.flush()
+        return self.archivo.stat().st_size if self.archivo.exists() else 0
+
+    def cerrar(self):
+        self._f.close()
@@ -0,0 +1,317 @@
+"""
+Índice de Búsqueda de Estudiantes - Sistema de Calificaciones
+Permite encontrar estudiantes por nombre parcial o con errores de escritura:
+los nombres se normalizan (sin acentos, mayúsculas, espacios simples) y se
+indexan por palabra (búsqueda por prefijo con bisect) y por trigramas
+(búsqueda aproximada cuando ninguna palabra coincide).
+"""
+
+import bisect
+import heapq
+import itertools
+import unicodedata
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+SIMILITUD_MINIMA = 0.35  # Similitud de trigramas mínima para sugerir un nombre
+CANDIDATOS_DIRECTOS = 1000  # Hasta cuántos candidatos se califican todos sin recorrer las listas
+
+
+def normalizar(texto) -> str:
+    """Quita acentos, signos y espacios repetidos y convierte a mayúsculas"""
+    descompuesto = unicodedata.normalize('NFKD', str(texto))
+    sin_acentos = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    limpio = ''.join(c if c.isalnum() else ' ' for c in sin_acentos.upper())
+    return ' '.join(limpio.split())
+
+
+def trigramas(texto_normalizado: str) -> Set[str]:
+    """Trigramas de cada palabra, con espacios de relleno para marcar los bordes"""
+    resultado = set()
+    for palabra in texto_normalizado.split():
+        relleno = f"  {palabra} "
+        for i in range(len(relleno) - 2):
+            resultado.add(relleno[i:i + 3])
+    return resultado
+
+
+class IndiceBusqueda:
+    """
+    Índice en memoria de nombres de estudiantes para búsqueda por prefijo y aproximada
+
+    El índice se construye la primera vez que se usa, a partir de `fuente`
+    (una función que retorna los nombres actuales), así que no cuesta nada
+    al arrancar. Los nombres normalizados (para coincidencias exactas) y las
+    palabras y trigramas (para búsquedas aproximadas) se construyen por
+    separado: una consulta exacta no arma el índice de trigramas.
+    """
+
+    def __init__(self, fuente: Optional[Callable[[], Iterable[str]]] = None):
+        self.fuente = fuente
+        self.invalidar()
+
+    def invalidar(self):
+        """Descarta el índice; se vuelve a construir desde la fuente al usarlo"""
+        self.normalizados: Dict[str, str] = {}              # nombre -> nombre normalizado
+        self.por_normalizado: Dict[str, Set[str]] = {}      # nombre normalizado -> nombres
+        self.por_palabra: Dict[str, Set[str]] = {}          # palabra -> nombres
+        self.por_largo: Dict[str, List[Tuple[int, str]]] = {}  # palabra -> (largo, nombre) ordenados
+        self.palabras: List[str] = []                       # palabras ordenadas (para prefijos)
+        self.por_trigrama: Dict[str, Set[str]] = {}         # trigrama -> palabras
+        self.nombres_listos = False
+        self.palabras_listas = False
+
+    def __len__(self):
+        self.preparar_nombres()
+        return len(self.normalizados)
+
+    def preparar_nombres(self):
+        """Normaliza los nombres de la fuente si todavía no se hizo"""
+        if self.nombres_listos:
+            return
+        self.nombres_listos = True
+        for nombre in (self.fuente() if self.fuente is not None else ()):
+            if nombre not in self.normalizados:
+                normalizado = normalizar(nombre)
+                self.normalizados[nombre] = normalizado
+                self.por_normalizado.setdefault(normalizado, set()).add(nombre)
+
+    def preparar_palabras(self):
+        """Indexa palabras y trigramas si todavía no se hizo"""
+        if self.palabras_listas:
+            return
+        self.preparar_nombres()
+        self.palabras_listas = True
+        for nombre, normalizado in self.normalizados.items():
+            self._indexar_palabras(nombre, normalizado)
+
+    def agregar(self, nombre: str):
+        """Agrega un nombre al índice (si aún no se construyó, lo tomará de la fuente)"""
+        if not self.nombres_listos or nombre in self.normalizados:
+            return
+
+        normalizado = normalizar(nombre)
+        self.normalizados[nombre] = normalizado
+        self.por_normalizado.setdefault(normalizado, set()).add(nombre)
+        if self.palabras_listas:
+            self._indexar_palabras(nombre, normalizado)
+
+    def _indexar_palabras(self, nombre: str, normalizado: str):
+        for palabra in set(normalizado.split()):
+            if palabra not in self.por_palabra:
+                self.por_palabra[palabra] = set()
+                bisect.insort(self.palabras, palabra)
+                for gram in trigramas(palabra):
+                    self.por_trigrama.setdefault(gram, set()).add(palabra)
+            self.por_palabra[palabra].add(nombre)
+            self.por_largo.pop(palabra, None)
+
+    def eliminar(self, nombre: str):
+        """Quita un nombre del índice"""
+        normalizado = self.normalizados.pop(nombre, None)
+        if normalizado is None:
+            return
+
+        self._descartar(self.por_normalizado, normalizado, nombre)
+        if not self.palabras_listas:
+            return
+
+        for palabra in set(normalizado.split()):
+            self.por_largo.pop(palabra, None)
+            if self._descartar(self.por_palabra, palabra, nombre):
+                posicion = bisect.bisect_left(self.palabras, palabra)
+                if posicion < len(self.palabras) and self.palabras[posicion] == palabra:
+                    del self.palabras[posicion]
+                for gram in trigramas(palabra):
+                    self._descartar(self.por_trigrama, gram, palabra)
+
+    @staticmethod
+    def _descartar(indice: Dict[str, Set[str]], clave: str, valor: str) -> bool:
+        """Quita un valor de una entrada del índice; retorna True si la entrada quedó vacía"""
+        valores = indice.get(clave)
+        if valores is None:
+            return False
+        valores.discard(valor)
+        if not valores:
+            del indice[clave]
+            return True
+        return False
+
+    def palabras_con_prefijo(self, prefijo: str) -> List[str]:
+        """Palabras indexadas que empiezan con el prefijo (búsqueda binaria)"""
+        inicio = bisect.bisect_left(self.palabras, prefijo)
+        fin = inicio
+        while fin < len(self.palabras) and self.palabras[fin].startswith(prefijo):
+            fin += 1
+        return self.palabras[inicio:fin]
+
+    def palabras_parecidas(self, palabra: str) -> Dict[str, float]:
+        """
+        Palabras indexadas parecidas a una palabra de la consulta
+
+        Returns:
+            dict: palabra -> similitud (1.0 para coincidencias por prefijo,
+                  coeficiente de Dice de trigramas para errores de escritura)
+        """
+        parecidas = {candidata: 1.0 for candidata in self.palabras_con_prefijo(palabra)}
+
+        grams = trigramas(palabra)
+        comunes = Counter()
+        for gram in grams:
+            comunes.update(self.por_trigrama.get(gram, ()))
+        for candidata, cantidad in comunes.items():
+            if candidata in parecidas:
+                continue
+            similitud = 2 * cantidad / (len(grams) + len(candidata) + 2)  # Una palabra de n letras tiene n + 2 trigramas
+            if similitud >= SIMILITUD_MINIMA:
+                parecidas[candidata] = similitud
+        return parecidas
+
+    def ordenados_por_largo(self, palabra: str) -> List[Tuple[int, str]]:
+        """Nombres que contienen la palabra como (largo normalizado, nombre), del más corto al más largo"""
+        lista = self.por_largo.get(palabra)
+        if lista is None:
+            lista = sorted((len(self.normalizados[nombre]), nombre) for nombre in self.por_palabra[palabra])
+            self.por_largo[palabra] = lista
+        return lista
+
+    def buscar_exacto(self, consulta: str) -> List[str]:
+        """Nombres que coinciden con la consulta salvo acentos, signos, mayúsculas y espacios"""
+        self.preparar_nombres()
+        return sorted(self.por_normalizado.get(normalizar(consulta), ()))
+
+    def buscar(self, consulta: str, limite: int = 5) -> List[Tuple[str, float]]:
+        """
+        Busca nombres parecidos a la consulta
+
+        Cada palabra de la consulta se compara contra el vocabulario del índice
+        (como prefijo o por trigramas, lo que tolera acentos y errores de
+        escritura); se prefieren los nombres que coinciden con todas las
+        palabras de la consulta, en cualquier orden. A igual puntaje van
+        primero los nombres más cortos y luego en orden alfabético.
+
+        Returns:
+            list: Tuplas (nombre, puntaje entre 0 y 1) ordenadas de mejor a peor
+        """
+        normalizado = normalizar(consulta)
+        if not normalizado or limite <= 0:
+            return []
+
+        self.preparar_palabras()
+        exactos = self.por_normalizado.get(normalizado)
+        if exactos:
+            return [(nombre, 1.0) for nombre in sorted(exactos)][:limite]
+
+        parecidas = [self.palabras_parecidas(palabra) for palabra in set(normalizado.split())]
+        parecidas = [p for p in parecidas if p]
+        if not parecidas:
+            return []
+
+        # Primero los nombres que coinciden con todas las palabras (intersección
+        # de las listas de cada palabra); si no hay, los que coinciden con alguna
+        if len(parecidas) == 1:
+            return self._mejores(normalizado, parecidas, limite, guias=[0])
+
+        uniones = [set().union(*(self.por_palabra[candidata] for candidata in p)) for p in parecidas]
+        mas_selectiva = min(range(len(uniones)), key=lambda i: len(uniones[i]))
+        interseccion = uniones[mas_selectiva].intersection(*uniones)
+        if len(interseccion) > CANDIDATOS_DIRECTOS:
+            return self._mejores(normalizado, parecidas, limite, guias=[mas_selectiva],
+                                 permitidos=interseccion)
+        if interseccion:
+            return self._mejores(normalizado, parecidas, limite, nombres=interseccion)
+
+        # Ningún nombre coincide con todas las palabras: se califican los que
+        # coinciden con todas menos una y el resto se acota con una menos
+        todas = range(len(parecidas))
+        if len(parecidas) > 2:
+            casi = set().union(*(set.intersection(*(uniones[j] for j in todas if j != i)) for i in todas))
+            if len(casi) <= CANDIDATOS_DIRECTOS:
+                return self._mejores(normalizado, parecidas, limite, nombres=casi, guias=todas,
+                                     coinciden=len(parecidas) - 2)
+        return self._mejores(normalizado, parecidas, limite, guias=todas, coinciden=len(parecidas) - 1)
+
+    def _mejores(self, normalizado: str, parecidas: List[Dict[str, float]], limite: int,
+                 guias: Iterable[int] = (), permitidos: Optional[Set[str]] = None,
+                 nombres: Iterable[str] = (), coinciden: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Los `limite` nombres con mejor puntaje sin calcular el de todos los candidatos
+
+        El puntaje es el promedio de la mejor similitud de cada palabra de la
+        consulta, multiplicado por un factor que favorece a los nombres cortos
+        (cobertura). Los `nombres` dados se califican todos de una vez; además se recorren
+        las listas de las palabras parecidas a las palabras `guias` de la
+        consulta, de la mayor a la menor cota de puntaje (cada lista está
+        ordenada por largo), y se termina en cuanto ningún nombre pendiente
+        puede superar a los `limite` mejores encontrados. `coinciden` es el
+        máximo de palabras de la consulta con que puede coincidir un nombre
+        (acota mejor el puntaje cuando se sabe que ninguno coincide con todas).
+        """
+        largo = len(normalizado)
+        total = len(normalizado.split())
+        maximos = [max(p.values()) for p in parecidas]
+
+        def factor(largo_nombre):
+            return 0.5 + 0.5 * (largo / max(largo_nombre, largo))
+
+        mejores = []  # (-puntaje, largo, nombre) de los mejores hasta ahora, ordenados
+        vistos = set()
+
+        ceros = itertools.repeat(0.0)
+
+        def calificar(largo_nombre, nombre):
+            vistos.add(nombre)
+            palabras = self.normalizados[nombre].split()
+            suma = sum([max(map(p.get, palabras, ceros)) for p in parecidas])
+            puntaje = round(suma / total * factor(largo_nombre), 4)
+            entrada = (-puntaje, largo_nombre, nombre)
+            if len(mejores) < limite or entrada < mejores[-1]:
+                bisect.insort(mejores, entrada)
+                del mejores[limite:]
+
+        if nombres:
+            # Se suman las similitudes por palabra de la consulta con operaciones
+            # de conjuntos en vez de comparar cada nombre contra cada palabra
+            nombres = set(nombres)
+            sumas = dict.fromkeys(nombres, 0.0)
+            for p in parecidas:
+                mejor = {}
+                for candidata, similitud in sorted(p.items(), key=lambda item: item[1]):
+                    mejor.update(dict.fromkeys(self.por_palabra[candidata] & nombres, similitud))
+                for nombre, similitud in mejor.items():
+                    sumas[nombre] += similitud
+            entradas = []
+            for nombre, suma in sumas.items():
+                largo_nombre = len(self.normalizados[nombre])
+                entradas.append((-round(suma / total * factor(largo_nombre), 4), largo_nombre, nombre))
+            mejores = heapq.nsmallest(limite, entradas)
+            vistos = nombres
+
+        # Cursores (-cota, largo, nombre, desempate, lista, posición, similitud máxima / total)
+        cursores = []
+        desempate = itertools.count()
+        if coinciden is None:
+            coinciden = len(parecidas)
+        for i in (guias if coinciden > 0 else ()):
+            # Cota: esta palabra más las mejores similitudes posibles de las demás
+            otras = sorted(maximos[:i] + maximos[i + 1:], reverse=True)
+            resto = sum(otras[:coinciden - 1])
+            for candidata, similitud in parecidas[i].items():
+                lista = self.ordenados_por_largo(candidata)
+                base = (similitud + resto) / total + 1e-9  # Margen por redondeo de la suma
+                cursores.append((-round(base * factor(lista[0][0]), 4), *lista[0], next(desempate), lista, 0, base))
+        heapq.heapify(cursores)
+
+        while cursores:
+            # Ningún nombre pendiente supera la cota de su cursor ni va antes de él a igual puntaje
+            if len(mejores) >= limite and cursores[0][:3] > mejores[-1]:
+                break
+            _, largo_nombre, nombre, _, lista, posicion, base = heapq.heappop(cursores)
+            if posicion + 1 < len(lista):
+                siguiente = lista[posicion + 1]
+                heapq.heappush(cursores, (-round(base * factor(siguiente[0]), 4), *siguiente,
+                                          next(desempate), lista, posicion + 1, base))
+            if nombre not in vistos and (permitidos is None or nombre in permitidos):
+                calificar(largo_nombre, nombre)
+
+        return [(nombre, -puntaje) for puntaje, _, nombre in mejores]
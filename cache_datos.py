@@ -0,0 +1,143 @@
+"""
+Caché de Datos de Estudiantes - Sistema de Calificaciones
+Guarda en disco una copia columnar y compacta del contenido del Excel para que
+main_pro.py, email_system.py, agregar_emails.py y generar_cuentas.py no tengan
+que volver a parsear el archivo mientras éste no cambie.
+"""
+
+import os
+import pickle
+import hashlib
+from pathlib import Path
+
+DIRECTORIO_CACHE = '.cache'
+VERSION_CACHE = 1
+
+
+class TablaEstudiantes:
+    """Contenido de la hoja activa del Excel organizado por columnas"""
+
+    def __init__(self, encabezados, columnas, filas):
+        self.encabezados = encabezados  # Valores de la fila 1
+        self.columnas = columnas        # Una lista de valores por columna
+        self.filas = filas              # Número de fila en el Excel de cada registro
+
+    def __len__(self):
+        return len(self.filas)
+
+    def indice(self, encabezado, defecto=None):
+        """Retorna el índice (base 0) de una columna a partir de su encabezado"""
+        if encabezado in self.encabezados:
+            return self.encabezados.index(encabezado)
+        return defecto
+
+    def columna(self, indice):
+        """Retorna los valores de una columna (None si la columna no existe)"""
+        if indice is not None and 0 <= indice < len(self.columnas):
+            return self.columnas[indice]
+        return [None] * len(self.filas)
+
+    def registros(self, *indices):
+        """Itera tuplas (fila, valor1, valor2, ...) para las columnas indicadas"""
+        return zip(self.filas, *(self.columna(i) for i in indices))
+
+
+def firma_archivo(archivo_excel):
+    """Identifica una versión del archivo por ruta, fecha de modificación y tamaño"""
+    ruta = os.path.abspath(archivo_excel)
+    info = os.stat(ruta)
+    return (ruta, info.st_mtime_ns, info.st_size)
+
+
+def ruta_cache(archivo_excel, directorio_cache=DIRECTORIO_CACHE):
+    """Ruta del archivo de caché correspondiente a un Excel"""
+    ruta = os.path.abspath(archivo_excel)
+    huella = hashlib.sha1(ruta.encode('utf-8')).hexdigest()[:10]
+    return Path(directorio_cache) / f"{Path(ruta).stem}_{huella}.cache"
+
+
+def parsear_excel(archivo_excel):
+    """Lee la hoja activa del Excel en modo streaming y la convierte a columnas"""
+    import openpyxl  # Sólo hace falta cuando la caché no está al día
+    wb = openpyxl.load_workbook(archivo_excel, read_only=True)
+    try:
+        ws = wb.active
+        filas_excel = ws.iter_rows(values_only=True)
+        encabezados = list(next(filas_excel, ()))
+        columnas = [[] for _ in encabezados]
+        filas = []
+
+        for numero, row in enumerate(filas_excel, start=2):
+            if not row or all(valor is None for valor in row):
+                continue
+
+            # Ajustar el número de columnas si la fila es más ancha que los encabezados
+            while len(columnas) < len(row):
+                columnas.append([None] * len(filas))
+                encabezados.append(None)
+
+            filas.append(numero)
+            for i, columna in enumerate(columnas):
+                columna.append(row[i] if i < len(row) else None)
+
+        return TablaEstudiantes(encabezados, columnas, filas)
+    finally:
+        wb.close()
+
+
+def guardar_cache(archivo_excel, tabla, firma, directorio_cache=DIRECTORIO_CACHE):
+    """Escribe la caché de forma atómica (archivo temporal + reemplazo)"""
+    destino = ruta_cache(archivo_excel, directorio_cache)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporal = destino.with_suffix(f'.tmp{os.getpid()}')
+
+    datos = {
+        'version': VERSION_CACHE,
+        'firma': firma,
+        'encabezados': tabla.encabezados,
+        'columnas': tabla.columnas,
+        'filas': tabla.filas
+    }
+    with open(temporal, 'wb') as f:
+        pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporal, destino)
+
+
+def leer_cache(archivo_excel, firma, directorio_cache=DIRECTORIO_CACHE):
+    """Lee la caché si existe y corresponde a la versión actual del Excel"""
+    try:
+        with open(ruta_cache(archivo_excel, directorio_cache), 'rb') as f:
+            datos = pickle.load(f)
+        if datos.get('version') != VERSION_CACHE or tuple(datos.get('firma', ())) != firma:
+            return None
+        return TablaEstudiantes(datos['encabezados'], datos['columnas'], datos['filas'])
+    except (OSError, EOFError, KeyError, AttributeError, pickle.UnpicklingError):
+        return None
+
+
+def cargar_tabla(archivo_excel, directorio_cache=DIRECTORIO_CACHE):
+    """
+    Carga los datos del Excel desde la caché, parseando el archivo sólo si cambió
+
+    Args:
+        archivo_excel (str): Ruta del archivo Excel
+        directorio_cache (str): Directorio donde se guardan las cachés
+
+    Returns:
+        TablaEstudiantes: Datos de la hoja activa
+
+    Raises:
+        FileNotFoundError: Si el archivo Excel no existe
+    """
+    firma = firma_archivo(archivo_excel)
+
+    tabla = leer_cache(archivo_excel, firma, directorio_cache)
+    if tabla is not None:
+        return tabla
+
+    tabla = parsear_excel(archivo_excel)
+    try:
+        guardar_cache(archivo_excel, tabla, firma, directorio_cache)
+    except OSError:
+        pass  # La caché es opcional: si no se puede escribir se usa el parseo directo
+    return tabla
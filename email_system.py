@@ -3,15 +3,27 @@ Sistema de Notificaciones por Email - Sistema de Calificaciones
 Envía calificaciones y números de cuenta a los estudiantes por correo electrónico
 """
 
+import base64
+import os
 import smtplib
+import socket
+import sqlite3
+import string
+import sys
+import threading
+import uuid
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
-import openpyxl
+from email.header import Header
+from email.utils import formataddr, formatdate
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+from cache_datos import cargar_tabla
+
 # ============================================================================
 # CONFIGURACIÓN DE EMAIL
 # ============================================================================
@@ -26,87 +38,27 @@ EMAIL_CONFIG = {
     'puerto': 587,
     'remitente_email': 'tu_email@gmail.com',  # TU EMAIL AQUÍ
     'remitente_password': 'tu_contraseña_de_aplicacion',  # CONTRASEÑA DE APLICACIÓN AQUÍ
-    'remitente_nombre': 'Sistema de Calificaciones'
+    'remitente_nombre': 'Sistema de Calificaciones',
+    'usar_tls': True,
+    'timeout': 30,
+    'mensajes_por_segundo': 1.0,  # Límite de envío para no saturar el servidor
+    'rafaga': 5,                  # Mensajes que se pueden enviar seguidos antes de esperar
+    'conexiones_simultaneas': 1,  # Sesiones SMTP en paralelo para el envío masivo
+    'reintentos': 2,              # Reintentos por destinatario antes de darlo por fallido
+    'espera_reintento': 2.0,      # Segundos de espera antes del primer reintento (se duplica)
+    'mime_precodificado': False,  # Armar el MIME reutilizando las partes constantes ya codificadas
+    'bandeja_salida': 'bandeja_salida.db'  # Bitácora para reanudar envíos interrumpidos
 }
 
 
-class GestorEmails:
-    """Clase para gestionar el envío de emails"""
-    
-    def __init__(self, config=EMAIL_CONFIG):
-        self.config = config
-        self.smtp_server = config['smtp_server']
-        self.puerto = config['puerto']
-        self.remitente_email = config['remitente_email']
-        self.remitente_password = config['remitente_password']
-        self.remitente_nombre = config['remitente_nombre']
-    
-    def verificar_configuracion(self):
-        """Verifica que la configuración de email esté completa"""
-        if 'tu_email@gmail.com' in self.remitente_email or 'tu_contraseña' in self.remitente_password:
-            print("\n⚠️  CONFIGURACIÓN INCOMPLETA")
-            print("━" * 60)
-            print("\nPara enviar emails, debes configurar:")
-            print("\n1. Tu email en EMAIL_CONFIG['remitente_email']")
-            print("2. Tu contraseña de aplicación en EMAIL_CONFIG['remitente_password']")
-            print("\n📖 Instrucciones:")
-            print("   1. Ve a: https://myaccount.google.com/apppasswords")
-            print("   2. Crea una contraseña de aplicación")
-            print("   3. Cópiala en el archivo email_system.py")
-            print("\n━" * 60)
-            return False
-        return True
-    
-    def enviar_email(self, destinatario, asunto, cuerpo_html, cuerpo_texto=None):
-        """
-        Envía un email
-        
-        Args:
-            destinatario (str): Email del destinatario
-            asunto (str): Asunto del email
-            cuerpo_html (str): Contenido del email en HTML
-            cuerpo_texto (str): Contenido alternativo en texto plano
-        
-        Returns:
-            bool: True si se envió correctamente, False si hubo error
-        """
-        try:
-            # Crear mensaje
-            mensaje = MIMEMultipart('alternative')
-            mensaje['From'] = f"{self.remitente_nombre} <{self.remitente_email}>"
-            mensaje['To'] = destinatario
-            mensaje['Subject'] = asunto
-            mensaje['Date'] = datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
-            
-            # Agregar cuerpo en texto plano (fallback)
-            if cuerpo_texto:
-                parte_texto = MIMEText(cuerpo_texto, 'plain', 'utf-8')
-                mensaje.attach(parte_texto)
-            
-            # Agregar cuerpo en HTML
-            parte_html = MIMEText(cuerpo_html, 'html', 'utf-8')
-            mensaje.attach(parte_html)
-            
-            # Conectar y enviar
-            with smtplib.SMTP(self.smtp_server, self.puerto) as servidor:
-                servidor.starttls()  # Seguridad TLS
-                servidor.login(self.remitente_email, self.remitente_password)
-                servidor.send_message(mensaje)
-            
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error al enviar email a {destinatario}: {e}")
-            return False
-    
-    def generar_email_calificacion(self, nombre, calificacion, estado, numero_cuenta):
-        """Genera el contenido HTML del email de calificación"""
-        
-        # Color según el estado
-        color_estado = "#4CAF50" if estado == "APROBADO" else "#f44336"
-        emoji_estado = "🎉" if estado == "APROBADO" else "📚"
-        
-        html = f"""
+# ============================================================================
+# PLANTILLAS DEL EMAIL DE CALIFICACIÓN
+# ============================================================================
+
+# Campos: nombre, calificacion, numero_cuenta, fecha, más los que dependen del
+# estado (estado, color_estado, emoji_estado, mensaje_estado), que se fijan al
+# precompilar una variante por estado.
+PLANTILLA_HTML = """
         <!DOCTYPE html>
         <html>
         <head>
@@ -240,13 +192,13 @@ class GestorEmails:
                         </ol>
                     </div>
                     
-                    {"<div style='background: #c8e6c9; padding: 15px; border-radius: 8px; text-align: center;'><strong>🎉 ¡Felicidades por aprobar!</strong><br>Continúa con ese excelente desempeño.</div>" if estado == "APROBADO" else "<div style='background: #ffccbc; padding: 15px; border-radius: 8px; text-align: center;'><strong>📚 No te desanimes</strong><br>Sigue esforzándote, ¡tú puedes lograrlo!</div>"}
+                    {mensaje_estado}
                     
                     <div class="footer">
                         <p><strong>Sistema de Calificaciones Académico</strong></p>
                         <p>Este es un mensaje automático. Por favor no respondas a este correo.</p>
                         <p style="color: #999; font-size: 11px;">
-                            Enviado el {datetime.now().strftime('%d de %B de %Y a las %H:%M')}
+                            Enviado el {fecha}
                         </p>
                     </div>
                 </div>
@@ -254,9 +206,8 @@ class GestorEmails:
         </body>
         </html>
         """
-        
-        # Versión texto plano (fallback)
-        texto = f"""
+
+PLANTILLA_TEXTO = """
         Sistema de Calificaciones
         
         Hola {nombre},
@@ -278,17 +229,629 @@ class GestorEmails:
         
         ---
         Sistema de Calificaciones Académico
-        {datetime.now().strftime('%d de %B de %Y')}
+        {fecha_corta}
         """
+
+MENSAJE_APROBADO = "<div style='background: #c8e6c9; padding: 15px; border-radius: 8px; text-align: center;'><strong>🎉 ¡Felicidades por aprobar!</strong><br>Continúa con ese excelente desempeño.</div>"
+MENSAJE_REPROBADO = "<div style='background: #ffccbc; padding: 15px; border-radius: 8px; text-align: center;'><strong>📚 No te desanimes</strong><br>Sigue esforzándote, ¡tú puedes lograrlo!</div>"
+
+VARIANTES_ESTADO = {
+    'APROBADO': {
+        'estado': 'APROBADO',
+        'color_estado': '#4CAF50',
+        'emoji_estado': '🎉',
+        'mensaje_estado': MENSAJE_APROBADO
+    },
+    'REPROBADO': {
+        'estado': 'REPROBADO',
+        'color_estado': '#f44336',
+        'emoji_estado': '📚',
+        'mensaje_estado': MENSAJE_REPROBADO
+    }
+}
+
+
+class PlantillaCompilada:
+    """
+    Plantilla dividida una sola vez en segmentos estáticos y campos variables
+    
+    Los campos indicados en `fijos` se incorporan al texto estático al
+    compilar, de modo que al renderizar sólo se sustituyen los datos propios
+    de cada estudiante.
+    """
+    
+    def __init__(self, plantilla, fijos=None):
+        fijos = fijos or {}
+        self.literales = []
+        self.campos = []
+        actual = []
+        
+        for literal, campo, formato, conversion in string.Formatter().parse(plantilla):
+            actual.append(literal)
+            if campo is None:
+                continue
+            if campo in fijos:
+                actual.append(format(fijos[campo], formato or ''))
+            else:
+                self.literales.append(''.join(actual))
+                self.campos.append(campo)
+                actual = []
+        self.literales.append(''.join(actual))
+    
+    def renderizar(self, valores):
+        """Genera el texto final sustituyendo los campos variables"""
+        partes = [self.literales[0]]
+        for campo, literal in zip(self.campos, self.literales[1:]):
+            partes.append(str(valores[campo]))
+            partes.append(literal)
+        return ''.join(partes)
+
+
+# Variantes precompiladas por estado (se construyen una sola vez al importar)
+PLANTILLAS_HTML = {
+    estado: PlantillaCompilada(PLANTILLA_HTML, fijos) for estado, fijos in VARIANTES_ESTADO.items()
+}
+PLANTILLAS_TEXTO = {
+    estado: PlantillaCompilada(PLANTILLA_TEXTO, fijos) for estado, fijos in VARIANTES_ESTADO.items()
+}
+
+
+class ConstructorMIME:
+    """
+    Arma mensajes multipart/alternative como bytes listos para SMTP
+    
+    Las partes constantes del mensaje (remitente, encabezados MIME, límites
+    de las partes) se codifican una sola vez; por mensaje sólo se codifican el
+    destinatario, el asunto, la fecha y los cuerpos en base64.
+    """
+    
+    def __init__(self, remitente_nombre, remitente_email):
+        self.limite = f"=============== {uuid.uuid4().hex}=="
+        self.remitente = f"From: {formataddr((remitente_nombre, remitente_email))}\r\n".encode('utf-8')
+        self.encabezado_mime = (
+            "MIME-Version: 1.0\r\n"
+            f'Content-Type: multipart/alternative; boundary="{self.limite}"\r\n'
+        ).encode('ascii')
+        inicio_parte = f"\r\n--{self.limite}\r\n"
+        self.parte_texto = (
+            inicio_parte +
+            'Content-Type: text/plain; charset="utf-8"\r\n'
+            "MIME-Version: 1.0\r\n"
+            "Content-Transfer-Encoding: base64\r\n\r\n"
+        ).encode('ascii')
+        self.parte_html = (
+            inicio_parte +
+            'Content-Type: text/html; charset="utf-8"\r\n'
+            "MIME-Version: 1.0\r\n"
+            "Content-Transfer-Encoding: base64\r\n\r\n"
+        ).encode('ascii')
+        self.cierre = f"\r\n--{self.limite}--\r\n".encode('ascii')
+    
+    @staticmethod
+    def codificar_cuerpo(texto):
+        """Codifica un cuerpo en base64 con líneas de 76 caracteres y fin de línea CRLF"""
+        return base64.encodebytes(texto.encode('utf-8')).replace(b'\n', b'\r\n')
+    
+    def construir(self, destinatario, asunto, cuerpo_html, cuerpo_texto=None):
+        """Retorna el mensaje completo en bytes"""
+        asunto_codificado = Header(asunto, 'utf-8').encode(linesep='\r\n')
+        partes = [
+            self.remitente,
+            f"To: {destinatario}\r\n".encode('utf-8'),
+            f"Subject: {asunto_codificado}\r\n".encode('ascii'),
+            f"Date: {formatdate(localtime=True)}\r\n".encode('ascii'),
+            self.encabezado_mime
+        ]
+        if cuerpo_texto:
+            partes.append(self.parte_texto)
+            partes.append(self.codificar_cuerpo(cuerpo_texto))
+        partes.append(self.parte_html)
+        partes.append(self.codificar_cuerpo(cuerpo_html))
+        partes.append(self.cierre)
+        return b''.join(partes)
+
+
+class LimitadorTasa:
+    """Limitador de tasa de envío tipo token bucket (seguro entre hilos)"""
+    
+    def __init__(self, tasa, capacidad=1):
+        self.tasa = tasa
+        self.capacidad = max(1, capacidad)
+        self.tokens = float(self.capacidad)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def esperar(self):
+        """Bloquea hasta que haya un token disponible y lo consume"""
+        if not self.tasa or self.tasa <= 0:
+            return
+        
+        while True:
+            with self.lock:
+                ahora = time.monotonic()
+                self.tokens = min(self.capacidad, self.tokens + (ahora - self.ultimo) * self.tasa)
+                self.ultimo = ahora
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                espera = (1 - self.tokens) / self.tasa
+            time.sleep(espera)
+
+
+class SesionSMTP:
+    """Conexión SMTP autenticada que se reutiliza para enviar varios mensajes"""
+    
+    # Errores que indican que la conexión se perdió y conviene reconectar
+    ERRORES_CONEXION = (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout)
+    
+    def __init__(self, gestor):
+        self.gestor = gestor
+        self.servidor = None
+    
+    def conectar(self):
+        """Abre la conexión, activa TLS e inicia sesión"""
+        self.cerrar()
+        servidor = smtplib.SMTP(self.gestor.smtp_server, self.gestor.puerto, timeout=self.gestor.timeout)
+        try:
+            if self.gestor.usar_tls:
+                servidor.starttls()  # Seguridad TLS
+            if self.gestor.remitente_password:
+                servidor.login(self.gestor.remitente_email, self.gestor.remitente_password)
+        except Exception:
+            servidor.close()
+            raise
+        self.servidor = servidor
+    
+    def enviar(self, mensaje, destinatario=None):
+        """
+        Envía un mensaje reconectando una vez si el servidor cerró la conexión
+        
+        `mensaje` puede ser un objeto de email.message o los bytes generados por
+        ConstructorMIME; en ese caso se debe indicar el destinatario.
+        """
+        if self.servidor is None:
+            self.conectar()
+        
+        try:
+            self.enviar_una_vez(mensaje, destinatario)
+        except self.ERRORES_CONEXION:
+            self.conectar()
+            self.enviar_una_vez(mensaje, destinatario)
+    
+    def enviar_una_vez(self, mensaje, destinatario):
+        """Envía el mensaje por la conexión actual"""
+        if isinstance(mensaje, bytes):
+            self.servidor.sendmail(self.gestor.remitente_email, [destinatario], mensaje)
+        else:
+            self.servidor.send_message(mensaje)
+    
+    def cerrar(self):
+        """Cierra la conexión si está abierta"""
+        if self.servidor is None:
+            return
+        try:
+            self.servidor.quit()
+        except Exception:
+            self.servidor.close()
+        finally:
+            self.servidor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *args):
+        self.cerrar()
+
+
+def es_error_temporal(error):
+    """
+    Indica si vale la pena reintentar un envío que falló con `error`
+    
+    Son temporales los códigos SMTP 4xx (buzón ocupado, demasiadas conexiones)
+    y las fallas de conexión. Los 5xx (destinatario inexistente, autenticación
+    rechazada) y cualquier otro error darían el mismo resultado al reintentar.
+    """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= codigo < 500 for codigo, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, SesionSMTP.ERRORES_CONEXION)
+
+
+class BandejaSalida:
+    """
+    Bitácora persistente (SQLite) de los envíos masivos
+    
+    Registra cada destinatario de un envío con su estado (pendiente, enviado
+    o fallido) para poder reanudar un envío interrumpido sin duplicar correos
+    y reintentar los fallidos sin volver a leer el Excel.
+    """
+    
+    def __init__(self, archivo='bandeja_salida.db'):
+        self.conexion = sqlite3.connect(archivo, check_same_thread=False)
+        self.conexion.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        with self.lock, self.conexion:
+            self.conexion.execute("PRAGMA journal_mode=WAL")
+            self.conexion.execute("PRAGMA synchronous=NORMAL")
+            self.conexion.executescript("""
+                CREATE TABLE IF NOT EXISTS envios (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    archivo TEXT NOT NULL,
+                    creado TEXT NOT NULL,
+                    terminado TEXT
+                );
+                CREATE TABLE IF NOT EXISTS destinatarios (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    envio_id INTEGER NOT NULL REFERENCES envios(id),
+                    fila INTEGER,
+                    nombre TEXT NOT NULL,
+                    email TEXT NOT NULL,
+                    calificacion REAL,
+                    numero_cuenta TEXT,
+                    estado TEXT NOT NULL DEFAULT 'pendiente',
+                    intentos INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    actualizado TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_destinatarios_envio
+                    ON destinatarios (envio_id, estado);
+            """)
+    
+    def crear_envio(self, archivo_excel, destinatarios):
+        """Registra un envío nuevo con todos sus destinatarios en estado pendiente"""
+        ahora = datetime.now().isoformat(timespec='seconds')
+        with self.lock, self.conexion:
+            cursor = self.conexion.execute(
+                "INSERT INTO envios (archivo, creado) VALUES (?, ?)",
+                (os.path.abspath(archivo_excel), ahora)
+            )
+            envio_id = cursor.lastrowid
+            self.conexion.executemany(
+                "INSERT INTO destinatarios (envio_id, fila, nombre, email, calificacion, numero_cuenta, actualizado) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (envio_id, d.get('fila'), d['nombre'], d['email'], d['calificacion'],
+                     None if d['numero_cuenta'] is None else str(d['numero_cuenta']), ahora)
+                    for d in destinatarios
+                ]
+            )
+        return envio_id
+    
+    def ultimo_envio(self, archivo_excel):
+        """Retorna el id del envío más reciente del archivo (o None)"""
+        with self.lock:
+            fila = self.conexion.execute(
+                "SELECT id FROM envios WHERE archivo = ? ORDER BY id DESC LIMIT 1",
+                (os.path.abspath(archivo_excel),)
+            ).fetchone()
+        return fila['id'] if fila else None
+    
+    def ultimo_envio_incompleto(self, archivo_excel):
+        """Retorna el id del envío más reciente del archivo que no terminó (o None)"""
+        with self.lock:
+            fila = self.conexion.execute(
+                "SELECT id FROM envios WHERE archivo = ? AND terminado IS NULL ORDER BY id DESC LIMIT 1",
+                (os.path.abspath(archivo_excel),)
+            ).fetchone()
+        return fila['id'] if fila else None
+    
+    def destinatarios(self, envio_id, estados=None):
+        """Lista los destinatarios de un envío, opcionalmente filtrados por estado"""
+        consulta = "SELECT * FROM destinatarios WHERE envio_id = ?"
+        parametros = [envio_id]
+        if estados:
+            consulta += f" AND estado IN ({', '.join('?' for _ in estados)})"
+            parametros.extend(estados)
+        consulta += " ORDER BY id"
+        
+        with self.lock:
+            return [dict(fila) for fila in self.conexion.execute(consulta, parametros)]
+    
+    def conteo(self, envio_id):
+        """Cuenta los destinatarios de un envío por estado"""
+        with self.lock:
+            filas = self.conexion.execute(
+                "SELECT estado, COUNT(*) AS cantidad FROM destinatarios WHERE envio_id = ? GROUP BY estado",
+                (envio_id,)
+            ).fetchall()
+        return {fila['estado']: fila['cantidad'] for fila in filas}
+    
+    def marcar(self, destinatario_id, exito, error=None):
+        """Registra el resultado del envío a un destinatario"""
+        with self.lock, self.conexion:
+            self.conexion.execute(
+                "UPDATE destinatarios SET estado = ?, intentos = intentos + 1, error = ?, actualizado = ? "
+                "WHERE id = ?",
+                ('enviado' if exito else 'fallido', error,
+                 datetime.now().isoformat(timespec='seconds'), destinatario_id)
+            )
+    
+    def cerrar_envio_si_completo(self, envio_id):
+        """Marca el envío como terminado si ya no quedan destinatarios pendientes ni fallidos"""
+        with self.lock, self.conexion:
+            restantes = self.conexion.execute(
+                "SELECT COUNT(*) FROM destinatarios WHERE envio_id = ? AND estado != 'enviado'",
+                (envio_id,)
+            ).fetchone()[0]
+            if restantes == 0:
+                self.conexion.execute(
+                    "UPDATE envios SET terminado = ? WHERE id = ?",
+                    (datetime.now().isoformat(timespec='seconds'), envio_id)
+                )
+    
+    def descartar_envio(self, envio_id):
+        """Da por terminado un envío incompleto sin enviar a sus destinatarios restantes"""
+        with self.lock, self.conexion:
+            self.conexion.execute(
+                "UPDATE envios SET terminado = ? WHERE id = ? AND terminado IS NULL",
+                (datetime.now().isoformat(timespec='seconds'), envio_id)
+            )
+    
+    def cerrar(self):
+        """Cierra la conexión a la base de datos"""
+        self.conexion.close()
+
+
+class GestorEmails:
+    """Clase para gestionar el envío de emails"""
+    
+    def __init__(self, config=EMAIL_CONFIG):
+        self.config = config
+        self.smtp_server = config['smtp_server']
+        self.puerto = config['puerto']
+        self.remitente_email = config['remitente_email']
+        self.remitente_password = config['remitente_password']
+        self.remitente_nombre = config['remitente_nombre']
+        self.usar_tls = config.get('usar_tls', True)
+        self.timeout = config.get('timeout', 30)
+        self.mensajes_por_segundo = config.get('mensajes_por_segundo', 1.0)
+        self.rafaga = config.get('rafaga', 5)
+        self.conexiones_simultaneas = config.get('conexiones_simultaneas', 1)
+        self.reintentos = config.get('reintentos', 2)
+        self.espera_reintento = config.get('espera_reintento', 2.0)
+        self.mime_precodificado = config.get('mime_precodificado', False)
+        self.bandeja_salida = config.get('bandeja_salida', 'bandeja_salida.db')
+        self.constructor_mime = ConstructorMIME(self.remitente_nombre, self.remitente_email)
+    
+    def verificar_configuracion(self):
+        """Verifica que la configuración de email esté completa"""
+        if 'tu_email@gmail.com' in self.remitente_email or 'tu_contraseña' in self.remitente_password:
+            print("\n⚠️  CONFIGURACIÓN INCOMPLETA")
+            print("━" * 60)
+            print("\nPara enviar emails, debes configurar:")
+            print("\n1. Tu email en EMAIL_CONFIG['remitente_email']")
+            print("2. Tu contraseña de aplicación en EMAIL_CONFIG['remitente_password']")
+            print("\n📖 Instrucciones:")
+            print("   1. Ve a: https://myaccount.google.com/apppasswords")
+            print("   2. Crea una contraseña de aplicación")
+            print("   3. Cópiala en el archivo email_system.py")
+            print("\n━" * 60)
+            return False
+        return True
+    
+    def construir_mensaje(self, destinatario, asunto, cuerpo_html, cuerpo_texto=None):
+        """Construye el mensaje MIME (texto plano + HTML)"""
+        mensaje = MIMEMultipart('alternative')
+        mensaje['From'] = f"{self.remitente_nombre} <{self.remitente_email}>"
+        mensaje['To'] = destinatario
+        mensaje['Subject'] = asunto
+        mensaje['Date'] = datetime.now().strftime('%a, %d %b %Y %H:%M:%S %z')
+        
+        # Agregar cuerpo en texto plano (fallback)
+        if cuerpo_texto:
+            parte_texto = MIMEText(cuerpo_texto, 'plain', 'utf-8')
+            mensaje.attach(parte_texto)
+        
+        # Agregar cuerpo en HTML
+        parte_html = MIMEText(cuerpo_html, 'html', 'utf-8')
+        mensaje.attach(parte_html)
+        
+        return mensaje
+    
+    def enviar_email(self, destinatario, asunto, cuerpo_html, cuerpo_texto=None, sesion=None):
+        """
+        Envía un email
+        
+        Args:
+            destinatario (str): Email del destinatario
+            asunto (str): Asunto del email
+            cuerpo_html (str): Contenido del email en HTML
+            cuerpo_texto (str): Contenido alternativo en texto plano
+            sesion (SesionSMTP): Conexión a reutilizar; si no se indica se abre una nueva
+        
+        Returns:
+            bool: True si se envió correctamente, False si hubo error
+        """
+        try:
+            mensaje = self.construir_mensaje(destinatario, asunto, cuerpo_html, cuerpo_texto)
+            
+            # Conectar y enviar
+            if sesion is not None:
+                sesion.enviar(mensaje)
+            else:
+                with SesionSMTP(self) as sesion_temporal:
+                    sesion_temporal.enviar(mensaje)
+            
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error al enviar email a {destinatario}: {e}")
+            return False
+    
+    def generar_email_calificacion(self, nombre, calificacion, estado, numero_cuenta, fecha=None):
+        """
+        Genera el contenido HTML y texto plano del email de calificación
+        
+        Usa las plantillas precompiladas por estado, así que sólo se sustituyen
+        los datos del estudiante. `fecha` permite reutilizar el mismo momento de
+        envío para todo un lote.
+        """
+        fecha = fecha or datetime.now()
+        variante = 'APROBADO' if estado == 'APROBADO' else 'REPROBADO'
+        valores = {
+            'nombre': nombre,
+            'calificacion': calificacion,
+            'estado': estado,
+            'numero_cuenta': numero_cuenta,
+            'fecha': fecha.strftime('%d de %B de %Y a las %H:%M'),
+            'fecha_corta': fecha.strftime('%d de %B de %Y')
+        }
+        
+        html = PLANTILLAS_HTML[variante].renderizar(valores)
+        
+        # Versión texto plano (fallback)
+        texto = PLANTILLAS_TEXTO[variante].renderizar(valores)
         
         return html, texto
     
-    def enviar_calificaciones_masivas(self, archivo_excel='grupo001.xlsx'):
+    def enviar_con_reintentos(self, destinatario, sesion, limitador, fecha=None):
+        """
+        Envía el email de calificación de un destinatario reintentando con espera exponencial
+        
+        Sólo se reintentan los errores temporales (ver es_error_temporal); un
+        rechazo definitivo del servidor se reporta en el primer intento.
+        
+        Args:
+            destinatario (dict): Datos del estudiante (nombre, email, calificacion, numero_cuenta)
+            sesion (SesionSMTP): Conexión a utilizar
+            limitador (LimitadorTasa): Limitador global de velocidad de envío
+            fecha (datetime): Fecha de envío que se muestra en el email
+        
+        Returns:
+            tuple: (True, None) si se envió, (False, error) si se agotaron los intentos
+        """
+        nombre = destinatario['nombre']
+        estado = 'APROBADO' if destinatario['calificacion'] >= 6 else 'REPROBADO'
+        html, texto = self.generar_email_calificacion(
+            nombre, destinatario['calificacion'], estado, destinatario['numero_cuenta'], fecha
+        )
+        asunto = f"📚 Tu Calificación y Número de Cuenta - {nombre}"
+        if self.mime_precodificado:
+            mensaje = self.constructor_mime.construir(destinatario['email'], asunto, html, texto)
+        else:
+            mensaje = self.construir_mensaje(destinatario['email'], asunto, html, texto)
+        
+        for intento in range(self.reintentos + 1):
+            # Respetar el límite de envío para no saturar el servidor
+            limitador.esperar()
+            try:
+                sesion.enviar(mensaje, destinatario['email'])
+                return True, None
+            except Exception as e:
+                temporal = es_error_temporal(e)
+                if temporal or not isinstance(e, smtplib.SMTPException):
+                    sesion.cerrar()  # El siguiente envío abre una conexión nueva
+                # Tras una respuesta de rechazo (5xx) la conexión sigue siendo válida
+                if not temporal or intento == self.reintentos:
+                    print(f"❌ Error al enviar email a {destinatario['email']}: {e}")
+                    return False, str(e)
+                time.sleep(self.espera_reintento * (2 ** intento))
+        return False, None
+    
+    def despachar(self, destinatarios, conexiones, bandeja=None):
+        """
+        Envía los emails de una lista de destinatarios
+        
+        Args:
+            destinatarios (list): Diccionarios con nombre, email, calificacion y numero_cuenta
+                (y 'id' si provienen de la bandeja de salida)
+            conexiones (int): Número de sesiones SMTP en paralelo
+            bandeja (BandejaSalida): Bitácora donde se registra el resultado de cada envío
+        
+        Returns:
+            tuple: (enviados, fallidos)
+        """
+        enviados = 0
+        fallidos = 0
+        limitador = LimitadorTasa(self.mensajes_por_segundo, self.rafaga)
+        fecha_envio = datetime.now()
+        lock = threading.Lock()
+        
+        def enviar_y_reportar(destinatario, sesion):
+            nonlocal enviados, fallidos
+            exito, error = self.enviar_con_reintentos(destinatario, sesion, limitador, fecha_envio)
+            if bandeja is not None:
+                bandeja.marcar(destinatario['id'], exito, error)
+            with lock:
+                if exito:
+                    print(f"✅ {destinatario['nombre']:<30} → {destinatario['email']}")
+                    enviados += 1
+                else:
+                    print(f"❌ {destinatario['nombre']:<30} → {destinatario['email']} (Error)")
+                    fallidos += 1
+        
+        if conexiones == 1:
+            with SesionSMTP(self) as sesion:
+                for destinatario in destinatarios:
+                    enviar_y_reportar(destinatario, sesion)
+        else:
+            # Cada hilo del pool mantiene su propia sesión SMTP
+            local = threading.local()
+            sesiones = []
+            
+            def enviar_en_hilo(destinatario):
+                if not hasattr(local, 'sesion'):
+                    local.sesion = SesionSMTP(self)
+                    with lock:
+                        sesiones.append(local.sesion)
+                enviar_y_reportar(destinatario, local.sesion)
+            
+            try:
+                with ThreadPoolExecutor(max_workers=conexiones) as pool:
+                    list(pool.map(enviar_en_hilo, destinatarios))
+            finally:
+                for sesion in sesiones:
+                    sesion.cerrar()
+        
+        return enviados, fallidos
+    
+    def imprimir_resumen(self, resumen):
+        """Imprime el resumen de un envío masivo"""
+        print("\n" + "━" * 60)
+        print("📊 RESUMEN DEL ENVÍO")
+        print("━" * 60)
+        print(f"Total de estudiantes: {resumen['total']}")
+        print(f"✅ Enviados exitosamente: {resumen['enviados']}")
+        print(f"❌ Fallidos: {resumen['fallidos']}")
+        print(f"⊘  Sin email: {resumen['sin_email']}")
+        print("━" * 60)
+    
+    def envio_incompleto(self, archivo_excel='grupo001.xlsx'):
+        """
+        Busca el último envío masivo del archivo que no terminó
+        
+        Returns:
+            tuple: (envio_id, conteo por estado) o None si no hay envíos incompletos
+        """
+        bandeja = BandejaSalida(self.bandeja_salida)
+        try:
+            envio_id = bandeja.ultimo_envio_incompleto(archivo_excel)
+            if envio_id is None:
+                return None
+            return envio_id, bandeja.conteo(envio_id)
+        finally:
+            bandeja.cerrar()
+    
+    def enviar_calificaciones_masivas(self, archivo_excel='grupo001.xlsx', conexiones=None, reanudar=False,
+                                      descartar_incompleto=False):
         """
         Envía calificaciones a todos los estudiantes que tengan email registrado
         
+        Cada destinatario queda registrado en la bandeja de salida; si el envío
+        se interrumpe, con reanudar=True se continúa el último envío incompleto
+        del archivo sin volver a leer el Excel ni repetir los ya enviados.
+        Mientras haya un envío incompleto no se inicia uno nuevo (volvería a
+        enviar a todos), salvo que se pida descartarlo.
+        
         Args:
             archivo_excel (str): Ruta del archivo Excel con los datos
+            conexiones (int): Número de sesiones SMTP en paralelo
+                (por defecto EMAIL_CONFIG['conexiones_simultaneas'])
+            reanudar (bool): Continuar el último envío incompleto en lugar de iniciar uno nuevo
+            descartar_incompleto (bool): Dar por terminado el envío incompleto e iniciar uno nuevo
         
         Returns:
             dict: Estadísticas del envío
@@ -296,98 +859,161 @@ class GestorEmails:
         if not self.verificar_configuracion():
             return None
         
+        if conexiones is None:
+            conexiones = self.conexiones_simultaneas
+        conexiones = max(1, int(conexiones))
+        
         print("\n📧 ENVÍO MASIVO DE CALIFICACIONES")
         print("━" * 60)
         
         try:
-            # Cargar Excel
-            wb = openpyxl.load_workbook(archivo_excel)
-            ws = wb.active
-            
-            # Verificar columnas
-            headers = [cell.value for cell in ws[1]]
+            bandeja = BandejaSalida(self.bandeja_salida)
+            try:
+                if reanudar:
+                    envio_id = bandeja.ultimo_envio_incompleto(archivo_excel)
+                    if envio_id is None:
+                        print("\n✅ No hay envíos incompletos que reanudar")
+                        return None
+                    
+                    conteo = bandeja.conteo(envio_id)
+                    destinatarios = bandeja.destinatarios(envio_id, estados=('pendiente', 'fallido'))
+                    print(f"\n🔁 Reanudando envío #{envio_id}: "
+                          f"{conteo.get('enviado', 0)} ya enviados, {len(destinatarios)} por enviar")
+                    total = len(destinatarios)
+                    sin_email = 0
+                else:
+                    incompleto = bandeja.ultimo_envio_incompleto(archivo_excel)
+                    if incompleto is not None:
+                        if not descartar_incompleto:
+                            print(f"\n⚠️  El envío #{incompleto} no terminó; reanúdalo (opción 5) "
+                                  f"para no repetir correos a quienes ya los recibieron")
+                            return None
+                        bandeja.descartar_envio(incompleto)
+                        print(f"\n🗑️  Envío #{incompleto} descartado")
+                    
+                    envio_id, total, sin_email = self.registrar_envio(bandeja, archivo_excel)
+                    if envio_id is None:
+                        return None
+                    destinatarios = bandeja.destinatarios(envio_id)
+                
+                # Procesar cada estudiante
+                print("\n⏳ Enviando emails...")
+                print()
+                
+                enviados, fallidos = self.despachar(destinatarios, conexiones, bandeja)
+                bandeja.cerrar_envio_si_completo(envio_id)
+            finally:
+                bandeja.cerrar()
             
-            # Buscar índices de columnas
-            idx_nombre = headers.index('NOMBRE DE ALUMNO') if 'NOMBRE DE ALUMNO' in headers else 0
-            idx_calificacion = headers.index('CALIFICACION') if 'CALIFICACION' in headers else 1
-            idx_numero_cuenta = headers.index('NUMERO DE CUENTA') if 'NUMERO DE CUENTA' in headers else 3
-            idx_email = headers.index('EMAIL') if 'EMAIL' in headers else None
+            resumen = {
+                'total': total,
+                'enviados': enviados,
+                'fallidos': fallidos,
+                'sin_email': sin_email
+            }
+            self.imprimir_resumen(resumen)
+            return resumen
             
-            if idx_email is None:
-                print("\n⚠️  No se encontró la columna 'EMAIL' en el archivo Excel")
-                print("   Agrega una columna 'EMAIL' con los correos de los estudiantes")
-                return None
+        except Exception as e:
+            print(f"\n❌ Error en el envío masivo: {e}")
+            return None
+    
+    def registrar_envio(self, bandeja, archivo_excel):
+        """
+        Lee los estudiantes del Excel y los registra como un envío nuevo en la bandeja
+        
+        Returns:
+            tuple: (envio_id, total, sin_email); envio_id es None si falta la columna EMAIL
+        """
+        # Cargar datos (desde la caché si el Excel no cambió)
+        tabla = cargar_tabla(archivo_excel)
+        
+        # Buscar índices de columnas
+        idx_nombre = tabla.indice('NOMBRE DE ALUMNO', 0)
+        idx_calificacion = tabla.indice('CALIFICACION', 1)
+        idx_numero_cuenta = tabla.indice('NUMERO DE CUENTA', 3)
+        idx_email = tabla.indice('EMAIL')
+        
+        if idx_email is None:
+            print("\n⚠️  No se encontró la columna 'EMAIL' en el archivo Excel")
+            print("   Agrega una columna 'EMAIL' con los correos de los estudiantes")
+            return None, 0, 0
+        
+        total = 0
+        sin_email = 0
+        destinatarios = []
+        registros = tabla.registros(idx_nombre, idx_calificacion, idx_numero_cuenta, idx_email)
+        for fila, nombre, calificacion, numero_cuenta, email in registros:
+            if not nombre:
+                continue
             
-            # Estadísticas
-            total = 0
-            enviados = 0
-            fallidos = 0
-            sin_email = 0
+            total += 1
+            nombre = str(nombre).strip()
             
-            # Procesar cada estudiante
-            print("\n⏳ Enviando emails...")
-            print()
+            # Verificar si tiene email
+            if not email or str(email).strip() == '' or '@' not in str(email):
+                print(f"⊘  {nombre:<30} - Sin email registrado")
+                sin_email += 1
+                continue
             
-            for row in range(2, ws.max_row + 1):
-                nombre = ws.cell(row, idx_nombre + 1).value
-                calificacion = ws.cell(row, idx_calificacion + 1).value
-                numero_cuenta = ws.cell(row, idx_numero_cuenta + 1).value
-                email = ws.cell(row, idx_email + 1).value
-                
-                if not nombre:
-                    continue
-                
-                total += 1
-                nombre = str(nombre).strip()
-                
-                # Verificar si tiene email
-                if not email or str(email).strip() == '' or '@' not in str(email):
-                    print(f"⊘  {nombre:<30} - Sin email registrado")
-                    sin_email += 1
-                    continue
-                
-                email = str(email).strip()
-                
-                # Determinar estado
-                estado = 'APROBADO' if calificacion >= 6 else 'REPROBADO'
-                
-                # Generar contenido del email
-                html, texto = self.generar_email_calificacion(
-                    nombre, calificacion, estado, numero_cuenta
-                )
-                
-                # Enviar email
-                asunto = f"📚 Tu Calificación y Número de Cuenta - {nombre}"
+            destinatarios.append({
+                'fila': fila,
+                'nombre': nombre,
+                'email': str(email).strip(),
+                'calificacion': calificacion,
+                'numero_cuenta': numero_cuenta
+            })
+        
+        envio_id = bandeja.crear_envio(archivo_excel, destinatarios)
+        return envio_id, total, sin_email
+    
+    def reintentar_fallidos(self, archivo_excel='grupo001.xlsx', conexiones=None):
+        """
+        Reintenta los destinatarios fallidos del último envío del archivo
+        
+        Los datos se toman de la bandeja de salida, sin volver a leer el Excel.
+        
+        Returns:
+            dict: Estadísticas del reintento
+        """
+        if not self.verificar_configuracion():
+            return None
+        
+        if conexiones is None:
+            conexiones = self.conexiones_simultaneas
+        conexiones = max(1, int(conexiones))
+        
+        print("\n♻️  REINTENTO DE ENVÍOS FALLIDOS")
+        print("━" * 60)
+        
+        try:
+            bandeja = BandejaSalida(self.bandeja_salida)
+            try:
+                envio_id = bandeja.ultimo_envio(archivo_excel)
+                destinatarios = bandeja.destinatarios(envio_id, estados=('fallido',)) if envio_id else []
+                if not destinatarios:
+                    print("\n✅ No hay envíos fallidos que reintentar")
+                    return None
                 
-                if self.enviar_email(email, asunto, html, texto):
-                    print(f"✅ {nombre:<30} → {email}")
-                    enviados += 1
-                else:
-                    print(f"❌ {nombre:<30} → {email} (Error)")
-                    fallidos += 1
+                print(f"\n⏳ Reintentando {len(destinatarios)} email(s) del envío #{envio_id}...")
+                print()
                 
-                # Pausa para no saturar el servidor
-                time.sleep(1)
+                enviados, fallidos = self.despachar(destinatarios, conexiones, bandeja)
+                bandeja.cerrar_envio_si_completo(envio_id)
+            finally:
+                bandeja.cerrar()
             
-            # Resumen
-            print("\n" + "━" * 60)
-            print("📊 RESUMEN DEL ENVÍO")
-            print("━" * 60)
-            print(f"Total de estudiantes: {total}")
-            print(f"✅ Enviados exitosamente: {enviados}")
-            print(f"❌ Fallidos: {fallidos}")
-            print(f"⊘  Sin email: {sin_email}")
-            print("━" * 60)
-            
-            return {
-                'total': total,
+            resumen = {
+                'total': len(destinatarios),
                 'enviados': enviados,
                 'fallidos': fallidos,
-                'sin_email': sin_email
+                'sin_email': 0
             }
+            self.imprimir_resumen(resumen)
+            return resumen
             
         except Exception as e:
-            print(f"\n❌ Error en el envío masivo: {e}")
+            print(f"\n❌ Error al reintentar envíos: {e}")
             return None
     
     def enviar_email_individual(self, email, nombre, calificacion, estado, numero_cuenta):
@@ -402,9 +1028,71 @@ class GestorEmails:
         return self.enviar_email(email, asunto, html, texto)
 
 
+def benchmark_plantillas(cantidad=10000):
+    """Mide cuántos emails de calificación por segundo se pueden generar"""
+    gestor = GestorEmails()
+    fecha = datetime.now()
+    estudiantes = [
+        (f"ESTUDIANTE {i:05d}", round((i * 7) % 101 / 10, 1), f"3240{i % 100000:05d}")
+        for i in range(cantidad)
+    ]
+    
+    print(f"\n⏱️  BENCHMARK DE PLANTILLAS ({cantidad} emails)")
+    print("━" * 60)
+    
+    # Referencia: formatear la plantilla completa para cada estudiante
+    inicio = time.perf_counter()
+    for nombre, calificacion, numero_cuenta in estudiantes:
+        estado = 'APROBADO' if calificacion >= 6 else 'REPROBADO'
+        valores = dict(VARIANTES_ESTADO[estado], nombre=nombre, calificacion=calificacion,
+                       numero_cuenta=numero_cuenta,
+                       fecha=fecha.strftime('%d de %B de %Y a las %H:%M'),
+                       fecha_corta=fecha.strftime('%d de %B de %Y'))
+        PLANTILLA_HTML.format(**valores)
+        PLANTILLA_TEXTO.format(**valores)
+    sin_precompilar = time.perf_counter() - inicio
+    
+    # Plantillas precompiladas
+    inicio = time.perf_counter()
+    for nombre, calificacion, numero_cuenta in estudiantes:
+        estado = 'APROBADO' if calificacion >= 6 else 'REPROBADO'
+        gestor.generar_email_calificacion(nombre, calificacion, estado, numero_cuenta, fecha)
+    precompilado = time.perf_counter() - inicio
+    
+    # Plantillas precompiladas + construcción del mensaje MIME
+    inicio = time.perf_counter()
+    for nombre, calificacion, numero_cuenta in estudiantes:
+        estado = 'APROBADO' if calificacion >= 6 else 'REPROBADO'
+        html, texto = gestor.generar_email_calificacion(nombre, calificacion, estado, numero_cuenta, fecha)
+        gestor.construir_mensaje('alumno@ejemplo.com', f"📚 Tu Calificación - {nombre}", html, texto).as_bytes()
+    con_mime = time.perf_counter() - inicio
+    
+    # Plantillas precompiladas + MIME con partes constantes precodificadas
+    inicio = time.perf_counter()
+    for nombre, calificacion, numero_cuenta in estudiantes:
+        estado = 'APROBADO' if calificacion >= 6 else 'REPROBADO'
+        html, texto = gestor.generar_email_calificacion(nombre, calificacion, estado, numero_cuenta, fecha)
+        gestor.constructor_mime.construir('alumno@ejemplo.com', f"📚 Tu Calificación - {nombre}", html, texto)
+    con_mime_precodificado = time.perf_counter() - inicio
+    
+    print(f"Sin precompilar:          {cantidad / sin_precompilar:>12,.0f} emails/s")
+    print(f"Plantilla precompilada:   {cantidad / precompilado:>12,.0f} emails/s")
+    print(f"Precompilada + MIME:      {cantidad / con_mime:>12,.0f} emails/s")
+    print(f"Precompilada + MIME pre.: {cantidad / con_mime_precodificado:>12,.0f} emails/s")
+    print("━" * 60)
+    
+    return {
+        'sin_precompilar': cantidad / sin_precompilar,
+        'precompilado': cantidad / precompilado,
+        'con_mime': cantidad / con_mime,
+        'con_mime_precodificado': cantidad / con_mime_precodificado
+    }
+
+
 def agregar_columna_email():
     """Agrega la columna EMAIL al archivo Excel si no existe"""
     try:
+        import openpyxl  # Sólo para escribir: la lectura usa la caché
         archivo = 'grupo001.xlsx'
         wb = openpyxl.load_workbook(archivo)
         ws = wb.active
@@ -438,18 +1126,35 @@ def menu_principal():
         print("2. 📧 Enviar email a un estudiante específico")
         print("3. ⚙️  Agregar columna EMAIL al Excel")
         print("4. 🔧 Verificar configuración")
-        print("5. 🚪 Salir")
+        print("5. 🔁 Reanudar último envío masivo interrumpido")
+        print("6. ♻️  Reintentar envíos fallidos")
+        print("7. 🚪 Salir")
         print("\n" + "="*60)
         
-        opcion = input("\nSelecciona una opción (1-5): ").strip()
+        opcion = input("\nSelecciona una opción (1-7): ").strip()
         
         if opcion == '1':
-            print("\n⚠️  Se enviará un email a TODOS los estudiantes con email registrado")
-            confirmacion = input("¿Deseas continuar? (SI/NO): ").strip().upper()
-            if confirmacion == 'SI':
-                gestor.enviar_calificaciones_masivas()
+            incompleto = gestor.envio_incompleto()
+            if incompleto:
+                envio_id, conteo = incompleto
+                print(f"\n⚠️  El envío #{envio_id} quedó incompleto: {conteo.get('enviado', 0)} enviados, "
+                      f"{conteo.get('pendiente', 0) + conteo.get('fallido', 0)} por enviar")
+                print("   REANUDAR: continúa ese envío sin repetir a quienes ya recibieron su email")
+                print("   NUEVO: lo descarta y envía a TODOS los estudiantes otra vez")
+                respuesta = input("¿Qué deseas hacer? (REANUDAR/NUEVO/NO): ").strip().upper()
+                if respuesta == 'REANUDAR':
+                    gestor.enviar_calificaciones_masivas(reanudar=True)
+                elif respuesta == 'NUEVO':
+                    gestor.enviar_calificaciones_masivas(descartar_incompleto=True)
+                else:
+                    print("❌ Operación cancelada")
             else:
-                print("❌ Operación cancelada")
+                print("\n⚠️  Se enviará un email a TODOS los estudiantes con email registrado")
+                confirmacion = input("¿Deseas continuar? (SI/NO): ").strip().upper()
+                if confirmacion == 'SI':
+                    gestor.enviar_calificaciones_masivas()
+                else:
+                    print("❌ Operación cancelada")
         
         elif opcion == '2':
             print("\n📧 ENVIAR EMAIL INDIVIDUAL")
@@ -483,6 +1188,12 @@ def menu_principal():
                 print("\n❌ Configuración incompleta. Revisa las instrucciones arriba.")
         
         elif opcion == '5':
+            gestor.enviar_calificaciones_masivas(reanudar=True)
+        
+        elif opcion == '6':
+            gestor.reintentar_fallidos()
+        
+        elif opcion == '7':
             print("\n👋 ¡Hasta pronto!")
             break
         
@@ -493,4 +1204,7 @@ def menu_principal():
 
 
 if __name__ == "__main__":
-    menu_principal()
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark_plantillas(int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
+    else:
+        menu_principal()
@@ -0,0 +1,176 @@
+"""
+Exportación de Reportes CSV - Sistema de Calificaciones
+Escribe reportes CSV por bloques a partir de un flujo de filas, sin armar
+antes la lista completa: las filas pueden venir de los datos en memoria, del
+Excel leído en streaming, de la base SQLite o de todos los grupos. La salida
+puede comprimirse con gzip y la exportación puede correr en un hilo en
+segundo plano mientras el menú sigue respondiendo.
+"""
+
+import io
+import os
+import csv
+import gzip
+import sqlite3
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+ENCABEZADOS_REPORTE = ['NOMBRE', 'CALIFICACIÓN', 'ESTADO']
+FILAS_POR_BLOQUE = 5000
+
+
+def estado_calificacion(calificacion, min_aprobatoria: float) -> str:
+    return 'APROBADO' if calificacion >= min_aprobatoria else 'REPROBADO'
+
+
+def filas_desde_registros(estudiantes) -> Iterator[list]:
+    """Filas ordenadas por nombre a partir de los estudiantes en memoria"""
+    for nombre in sorted(estudiantes):
+        info = estudiantes[nombre]
+        yield [nombre, info['calificacion'], info['estado']]
+
+
+def filas_desde_excel(archivo_excel: str, min_aprobatoria: float = 6.0) -> Iterator[list]:
+    """Filas leídas en streaming (read_only) directamente de un Excel de grupo"""
+    import openpyxl
+    wb = openpyxl.load_workbook(archivo_excel, read_only=True)
+    try:
+        for row in wb.active.iter_rows(min_row=2, max_col=2, values_only=True):
+            if row and row[0]:
+                calificacion = row[1] if row[1] is not None else 0
+                yield [str(row[0]).strip().upper(), calificacion, estado_calificacion(calificacion, min_aprobatoria)]
+    finally:
+        wb.close()
+
+
+def filas_desde_sqlite(archivo_db: str, min_aprobatoria: float = 6.0,
+                       filas_por_bloque: int = FILAS_POR_BLOQUE) -> Iterator[list]:
+    """Filas leídas por bloques de la base SQLite con una conexión propia (apta para otro hilo)"""
+    conexion = sqlite3.connect(archivo_db)
+    try:
+        cursor = conexion.execute("SELECT nombre, calificacion FROM estudiantes ORDER BY orden")
+        while True:
+            bloque = cursor.fetchmany(filas_por_bloque)
+            if not bloque:
+                break
+            for nombre, calificacion in bloque:
+                yield [nombre, calificacion, estado_calificacion(calificacion, min_aprobatoria)]
+    finally:
+        conexion.close()
+
+
+def filas_desde_catalogo(grupos: Dict[str, Sequence[tuple]], min_aprobatoria: float = 6.0) -> Iterator[list]:
+    """Filas de los grupos ya cargados en memoria (grupo -> registros), con el grupo como primera columna"""
+    for grupo, registros in grupos.items():
+        for nombre, calificacion, _ in registros:
+            yield [grupo, nombre, calificacion, estado_calificacion(calificacion, min_aprobatoria)]
+
+
+class ExportadorCSV:
+    """
+    Escribe un flujo de filas a CSV (opcionalmente .csv.gz) por bloques
+
+    Las filas se formatean en un buffer en memoria y se escriben al archivo
+    cada `filas_por_bloque` filas. Se escribe a un archivo temporal que se
+    renombra al terminar, así que nunca queda un reporte a medias.
+    """
+
+    def __init__(self, destino, comprimir: bool = False, filas_por_bloque: int = FILAS_POR_BLOQUE):
+        destino = Path(destino)
+        if comprimir and destino.suffix != '.gz':
+            destino = destino.with_name(destino.name + '.gz')
+        self.destino = destino
+        self.comprimir = comprimir
+        self.filas_por_bloque = filas_por_bloque
+        self.filas_escritas = 0  # Progreso (se puede consultar desde otro hilo)
+
+    def abrir(self, ruta: Path):
+        if self.comprimir:
+            return gzip.open(ruta, 'wt', encoding='utf-8', newline='', compresslevel=6)
+        return open(ruta, 'w', encoding='utf-8', newline='')
+
+    def exportar(self, filas: Iterable[list], encabezados: List[str] = ENCABEZADOS_REPORTE) -> int:
+        """
+        Escribe las filas y retorna cuántas se escribieron
+
+        Raises:
+            OSError: Si no se puede escribir el archivo
+        """
+        self.destino.parent.mkdir(parents=True, exist_ok=True)
+        temporal = self.destino.with_name(self.destino.name + '.tmp')
+
+        try:
+            with self.abrir(temporal) as f:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(encabezados)
+
+                en_bloque = 0
+                for fila in filas:
+                    writer.writerow(fila)
+                    en_bloque += 1
+                    if en_bloque >= self.filas_por_bloque:
+                        f.write(buffer.getvalue())
+                        buffer.seek(0)
+                        buffer.truncate()
+                        self.filas_escritas += en_bloque
+                        en_bloque = 0
+
+                f.write(buffer.getvalue())
+                self.filas_escritas += en_bloque
+
+            os.replace(temporal, self.destino)
+        except BaseException:
+            temporal.unlink(missing_ok=True)
+            raise
+        return self.filas_escritas
+
+
+class ExportacionEnSegundoPlano(threading.Thread):
+    """
+    Ejecuta un ExportadorCSV en un hilo y guarda su resultado para consultarlo después
+
+    `temporal` es un archivo del que se leen las filas (p. ej. una copia del
+    Excel tomada al iniciar) y que se borra al terminar, con o sin error.
+    """
+
+    def __init__(self, exportador: ExportadorCSV, filas: Iterable[list],
+                 encabezados: List[str] = ENCABEZADOS_REPORTE, descripcion: str = "reporte",
+                 temporal: Optional[Path] = None):
+        super().__init__(daemon=True, name=f"exportacion-{exportador.destino.name}")
+        self.exportador = exportador
+        self.filas = filas
+        self.encabezados = encabezados
+        self.descripcion = descripcion
+        self.temporal = temporal
+        self.error: Optional[Exception] = None
+        self.inicio = None
+        self.duracion = None
+
+    def run(self):
+        self.inicio = time.perf_counter()
+        try:
+            self.exportador.exportar(self.filas, self.encabezados)
+            logging.info(f"Exportación en segundo plano terminada: {self.exportador.destino} "
+                         f"({self.exportador.filas_escritas} filas)")
+        except Exception as e:
+            self.error = e
+            logging.error(f"Error en exportación en segundo plano ({self.descripcion}): {e}")
+        finally:
+            if self.temporal is not None:
+                Path(self.temporal).unlink(missing_ok=True)
+            self.duracion = time.perf_counter() - self.inicio
+
+    @property
+    def estado(self) -> str:
+        if self.is_alive():
+            return f"⏳ En curso: {self.exportador.filas_escritas:,} filas escritas"
+        if self.error is not None:
+            return f"❌ Error: {self.error}"
+        if self.duracion is None:
+            return "⏸️  Pendiente"
+        return (f"✅ Terminada: {self.exportador.filas_escritas:,} filas en {self.duracion:.2f}s "
+                f"({self.exportador.filas_escritas / max(self.duracion, 1e-9):,.0f} filas/s)")
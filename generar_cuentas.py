@@ -3,9 +3,10 @@ Script para generar números de cuenta únicos para los estudiantes
 Formato: 3240XXXXX (donde XXXXX son números aleatorios únicos)
 """
 
-import openpyxl
 import random
 
+from cache_datos import cargar_tabla
+
 def generar_numero_cuenta():
     """Genera un número de cuenta único con formato 3240XXXXX"""
     sufijo = random.randint(10000, 99999)
@@ -14,12 +15,15 @@ def generar_numero_cuenta():
 def agregar_numeros_cuenta(archivo_excel='grupo001.xlsx'):
     """Agrega números de cuenta únicos a todos los estudiantes"""
     try:
-        # Cargar archivo
-        wb = openpyxl.load_workbook(archivo_excel)
-        ws = wb.active
+        # Verificar en la caché si ya existe la columna de número de cuenta
+        tabla = cargar_tabla(archivo_excel)
         
-        # Verificar si ya existe la columna de número de cuenta
-        if ws.cell(1, 4).value != 'NUMERO DE CUENTA':
+        if tabla.encabezados[3:4] != ['NUMERO DE CUENTA']:
+            # Cargar archivo para edición
+            import openpyxl
+            wb = openpyxl.load_workbook(archivo_excel)
+            ws = wb.active
+            
             # Agregar encabezado
             ws.cell(1, 4).value = 'NUMERO DE CUENTA'
             
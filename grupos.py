@@ -0,0 +1,166 @@
+"""
+Catálogo de Grupos - Sistema de Calificaciones
+Carga en paralelo todos los Excel de grupo de un directorio (grupo001.xlsx ...
+grupo060.xlsx) y mantiene un índice unificado de estudiantes entre grupos.
+Sólo se vuelven a leer los grupos cuyo archivo cambió.
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cache_datos import DIRECTORIO_CACHE, cargar_tabla, firma_archivo
+
+# Registro de un estudiante en el catálogo: (grupo, nombre, calificación, número de cuenta)
+RegistroGrupo = Tuple[str, str, float, Optional[str]]
+
+
+def leer_grupo(archivo_excel: str, directorio_cache: str = DIRECTORIO_CACHE):
+    """
+    Lee un Excel de grupo (se ejecuta en un proceso del pool)
+
+    Returns:
+        tuple: (archivo, firma, registros) con registros (nombre, calificación, número de cuenta)
+    """
+    firma = firma_archivo(archivo_excel)
+    tabla = cargar_tabla(archivo_excel, directorio_cache)
+    registros = []
+    for _, nombre, calificacion, numero_cuenta in tabla.registros(0, 1, 3):
+        if nombre:
+            registros.append((
+                str(nombre).strip().upper(),
+                calificacion if calificacion is not None else 0,
+                str(numero_cuenta).strip() if numero_cuenta else None
+            ))
+    return archivo_excel, firma, registros
+
+
+class CatalogoGrupos:
+    """Índice unificado de estudiantes de todos los grupos de un directorio"""
+
+    def __init__(self, directorio: str = '.', patron: str = 'grupo*.xlsx',
+                 procesos: Optional[int] = None, directorio_cache: str = DIRECTORIO_CACHE):
+        self.directorio = Path(directorio)
+        self.patron = patron
+        self.procesos = procesos
+        self.directorio_cache = directorio_cache
+        self.grupos: Dict[str, List[Tuple[str, float, Optional[str]]]] = {}  # grupo -> registros
+        self.archivos: Dict[str, str] = {}     # grupo -> ruta del Excel
+        self.firmas: Dict[str, tuple] = {}     # grupo -> firma del archivo leído
+        self.indice: Dict[str, List[RegistroGrupo]] = {}  # nombre -> registros en todos los grupos
+        self.cuentas: Dict[str, RegistroGrupo] = {}       # número de cuenta -> registro
+
+    @staticmethod
+    def nombre_grupo(archivo: str) -> str:
+        """Nombre del grupo a partir del archivo (grupo001.xlsx -> grupo001)"""
+        return Path(archivo).stem
+
+    def archivos_en_directorio(self) -> List[str]:
+        """Lista los Excel de grupo del directorio, ignorando temporales de Excel (~$)"""
+        return sorted(
+            str(ruta) for ruta in self.directorio.glob(self.patron)
+            if not ruta.name.startswith('~$')
+        )
+
+    def cargar(self) -> int:
+        """
+        Carga (o actualiza) el catálogo
+
+        Los grupos cuyo archivo no cambió desde la última carga se conservan;
+        los nuevos o modificados se leen en paralelo con un pool de procesos.
+
+        Returns:
+            int: Número de grupos que se volvieron a leer
+        """
+        archivos = self.archivos_en_directorio()
+        vigentes = {self.nombre_grupo(archivo) for archivo in archivos}
+
+        # Quitar grupos cuyo archivo ya no existe
+        for grupo in list(self.grupos):
+            if grupo not in vigentes:
+                self.quitar_grupo(grupo)
+
+        pendientes = []
+        for archivo in archivos:
+            grupo = self.nombre_grupo(archivo)
+            try:
+                if self.firmas.get(grupo) != firma_archivo(archivo):
+                    pendientes.append(archivo)
+            except OSError:
+                continue
+
+        if not pendientes:
+            return 0
+
+        if len(pendientes) > 1 and self.procesos != 1:
+            from concurrent.futures import ProcessPoolExecutor  # multiprocessing no se carga al arrancar
+            with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                resultados = list(pool.map(leer_grupo, pendientes, [self.directorio_cache] * len(pendientes)))
+        else:
+            resultados = [leer_grupo(archivo, self.directorio_cache) for archivo in pendientes]
+
+        for archivo, firma, registros in resultados:
+            grupo = self.nombre_grupo(archivo)
+            self.quitar_grupo(grupo)
+            self.grupos[grupo] = registros
+            self.archivos[grupo] = archivo
+            self.firmas[grupo] = firma
+            for nombre, calificacion, numero_cuenta in registros:
+                registro = (grupo, nombre, calificacion, numero_cuenta)
+                self.indice.setdefault(nombre, []).append(registro)
+                if numero_cuenta:
+                    self.cuentas[numero_cuenta] = registro
+
+        logging.info(f"Catálogo de grupos: {len(resultados)} grupo(s) leídos, {len(self.grupos)} en total")
+        return len(resultados)
+
+    def quitar_grupo(self, grupo: str):
+        """Elimina un grupo del catálogo y del índice unificado"""
+        registros = self.grupos.pop(grupo, None)
+        self.archivos.pop(grupo, None)
+        self.firmas.pop(grupo, None)
+        if not registros:
+            return
+
+        for nombre, _, numero_cuenta in registros:
+            if numero_cuenta and self.cuentas.get(numero_cuenta, ('',))[0] == grupo:
+                del self.cuentas[numero_cuenta]
+            entradas = [entrada for entrada in self.indice.get(nombre, []) if entrada[0] != grupo]
+            if entradas:
+                self.indice[nombre] = entradas
+            else:
+                self.indice.pop(nombre, None)
+
+    def buscar(self, nombre: str) -> List[RegistroGrupo]:
+        """Retorna los registros de un estudiante en todos los grupos"""
+        return list(self.indice.get(nombre, []))
+
+    def buscar_cuenta(self, numero_cuenta: str) -> Optional[RegistroGrupo]:
+        """Retorna el registro de un estudiante a partir de su número de cuenta"""
+        return self.cuentas.get(numero_cuenta)
+
+    @property
+    def total_estudiantes(self) -> int:
+        return sum(len(registros) for registros in self.grupos.values())
+
+
+def archivos_de_grupos(config) -> List[str]:
+    """Excel de grupo del directorio configurado (aunque el modo multi-grupo esté desactivado)"""
+    return CatalogoGrupos(
+        directorio=config.get('grupos', 'directorio', default='.'),
+        patron=config.get('grupos', 'patron', default='grupo*.xlsx')
+    ).archivos_en_directorio()
+
+
+def crear_catalogo(config) -> Optional[CatalogoGrupos]:
+    """Crea el catálogo de grupos si grupos.activar está habilitado en la configuración"""
+    if not config.get('grupos', 'activar', default=False):
+        return None
+
+    return CatalogoGrupos(
+        directorio=config.get('grupos', 'directorio', default='.'),
+        patron=config.get('grupos', 'patron', default='grupo*.xlsx'),
+        procesos=config.get('grupos', 'procesos', default=None) or os.cpu_count(),
+        directorio_cache=config.get('archivos', 'directorio_cache', default=DIRECTORIO_CACHE)
+    )
@@ -14,18 +14,39 @@ Características Pro:
 """
 
 import time
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+INICIO_PROCESO = time.perf_counter()  # Para medir el tiempo hasta el primer menú
+
+import bisect
+import argparse
 import os
 import sys
 import json
 import logging
+import threading
 from datetime import datetime
 import shutil
 import csv
 from pathlib import Path
 import getpass
-from typing import Dict, Tuple, Optional
+import sqlite3
+from typing import Callable, Dict, List, Tuple, Optional
+
+from almacenamiento import AlmacenamientoExcel, AlmacenamientoSQLite, crear_almacenamiento, escribir_excel
+from backup_incremental import DiarioCambios
+from backup_deduplicado import AlmacenBackups
+from rotacion_logs import ManejadorLogRotativo, archivos_de_log
+from registro_asincrono import iniciar_registro_asincrono
+from visor_logs import NIVELES, OPERACIONES, FiltroLogs, VisorLogs
+from auditoria import RegistroAuditoria
+from cache_datos import firma_archivo
+from grupos import archivos_de_grupos, crear_catalogo
+from busqueda import IndiceBusqueda
+from analitica import AnaliticaCalificaciones
+from registros import RegistrosEstudiantes
+from exportacion import (ENCABEZADOS_REPORTE, ExportacionEnSegundoPlano, ExportadorCSV,
+                         filas_desde_catalogo, filas_desde_excel, filas_desde_registros, filas_desde_sqlite)
+from reportes import (escribir_estadisticas, escritura_atomica, generar_todos_los_reportes,
+                      lineas_histograma, parametros_reporte)
 
 # Intentar importar colorama para colores en terminal
 try:
@@ -68,8 +89,9 @@ class ConfigManager:
             "seguridad": {"admin_password": "admin123", "max_intentos_login": 3},
             "archivos": {"excel_principal": "grupo001.xlsx"},
             "calificaciones": {"minima_aprobatoria": 6.0},
-            "interfaz": {"usar_colores": True, "limpiar_pantalla": True},
-            "backups": {"automaticos": True, "max_backups": 10},
+            "interfaz": {"usar_colores": True, "animaciones": True, "limpiar_pantalla": True,
+                         "tiempo_espera": 1, "inicio_rapido": False},
+            "backups": {"automaticos": True, "max_backups": 10, "max_backups_deduplicados": 200},
             "logs": {"activar": True, "nivel": "INFO"}
         }
     
@@ -90,6 +112,7 @@ class LogManager:
     def __init__(self, config: ConfigManager):
         self.config = config
         self.log_dir = Path(config.get('archivos', 'directorio_logs', default='logs'))
+        self.listener = None  # Hilo de escritura del log en modo asíncrono
         self.setup_logging()
     
     def setup_logging(self):
@@ -100,22 +123,36 @@ class LogManager:
         # Crear directorio de logs si no existe
         self.log_dir.mkdir(exist_ok=True)
         
-        # Archivo de log con fecha
-        log_file = self.log_dir / f"sistema_{datetime.now().strftime('%Y%m%d')}.log"
-        
         # Configurar logging
         nivel = self.config.get('logs', 'nivel', default='INFO')
         formato = self.config.get('logs', 'formato', 
                                   default='[%(asctime)s] %(levelname)s: %(message)s')
         
-        logging.basicConfig(
-            level=getattr(logging, nivel),
-            format=formato,
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        # Si otra instancia del sistema ya configuró el logging, se reutiliza
+        if not logging.getLogger().handlers:
+            # Archivo de log por día, rotado por tamaño y comprimido
+            manejador_archivo = ManejadorLogRotativo(
+                self.log_dir,
+                max_bytes=int(self.config.get('logs', 'max_size_mb', default=10) * 1024 * 1024),
+                max_archivos=self.config.get('logs', 'max_archivos', default=30)
+            )
+            manejador_archivo.setFormatter(logging.Formatter(formato))
+            
+            # En modo asíncrono un hilo formatea y escribe el archivo; la consola
+            # sigue siendo síncrona para no desordenar los mensajes del menú
+            if self.config.get('logs', 'asincrono', default=True):
+                manejador_archivo, self.listener = iniciar_registro_asincrono(
+                    [manejador_archivo], self.config.get('logs', 'tamano_cola', default=10000)
+                )
+            
+            logging.basicConfig(
+                level=getattr(logging, nivel),
+                format=formato,
+                handlers=[
+                    manejador_archivo,
+                    logging.StreamHandler(sys.stdout)
+                ]
+            )
         
         logging.info("="*60)
         logging.info("Sistema iniciado")
@@ -123,27 +160,56 @@ class LogManager:
 
 
 class BackupManager:
-    """Gestor de backups automáticos"""
+    """Gestor de backups automáticos (copias completas o diario incremental)"""
     
     def __init__(self, config: ConfigManager):
         self.config = config
         self.backup_dir = Path(config.get('archivos', 'directorio_backups', default='backups'))
         self.backup_dir.mkdir(exist_ok=True)
+        self.modo = config.get('backups', 'modo', default='completo')
+        self.max_backups = config.get('backups', 'max_backups', default=10)
+        # Copias completas (.xlsx, o .db con almacenamiento SQLite), de la más antigua a la más nueva
+        self.backups = sorted(ruta for ruta in self.backup_dir.glob('backup_*') if ruta.is_file())
+        self.almacen = None
+        if config.get('backups', 'deduplicar', default=False):
+            self.almacen = AlmacenBackups(self.backup_dir, comprimir=config.get('backups', 'comprimir', default=True))
+        # Un backup deduplicado sólo ocupa las partes que cambiaron: se conservan muchos más
+        self.max_backups_deduplicados = config.get('backups', 'max_backups_deduplicados', default=200)
+        self.diario = None
+        if self.modo == 'incremental' and config.get('backups', 'automaticos', default=True):
+            self.diario = DiarioCambios(
+                self.backup_dir,
+                cambios_por_snapshot=config.get('backups', 'cambios_por_snapshot', default=500),
+                max_snapshots=self.max_backups
+            )
     
     def crear_backup(self, archivo_origen: str) -> bool:
-        """Crea un backup del archivo Excel"""
+        """Crea un backup del archivo de datos (Excel o copia de la base SQLite)"""
         if not self.config.get('backups', 'automaticos', default=True):
             return True
         
+        # En modo incremental los cambios ya quedaron en el diario
+        if self.diario is not None:
+            return True
+        
         try:
             # Nombre del backup con timestamp
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            nombre_backup = f"backup_{timestamp}.xlsx"
+            nombre_backup = f"backup_{timestamp}{Path(archivo_origen).suffix}"
             ruta_backup = self.backup_dir / nombre_backup
             
+            # Almacén deduplicado: sólo se escriben las partes que cambiaron
+            if self.almacen is not None:
+                entrada = self.almacen.agregar(archivo_origen, nombre_backup)
+                logging.info(f"Backup creado: {nombre_backup} ({entrada['escritos']} bytes nuevos)")
+                self.almacen.limpiar(self.max_backups_deduplicados)
+                return True
+            
             # Copiar archivo
             shutil.copy2(archivo_origen, ruta_backup)
             logging.info(f"Backup creado: {nombre_backup}")
+            if ruta_backup not in self.backups:
+                self.backups.append(ruta_backup)
             
             # Limpiar backups antiguos
             self.limpiar_backups_antiguos()
@@ -155,29 +221,362 @@ class BackupManager:
     
     def limpiar_backups_antiguos(self):
         """Elimina backups antiguos según configuración"""
-        max_backups = self.config.get('backups', 'max_backups', default=10)
-        backups = sorted(self.backup_dir.glob('backup_*.xlsx'), reverse=True)
+        excedentes = self.backups[:-self.max_backups] if self.max_backups else list(self.backups)
         
         # Eliminar backups excedentes
-        for backup in backups[max_backups:]:
+        for backup in excedentes:
             try:
                 backup.unlink()
+                self.backups.remove(backup)
                 logging.info(f"Backup antiguo eliminado: {backup.name}")
             except Exception as e:
                 logging.error(f"Error al eliminar backup {backup.name}: {e}")
+    
+    def registrar_cambios(self, cambios: List[Tuple[str, str, Optional[float]]]):
+        """Agrega varios cambios (operación, nombre, calificación) al diario incremental"""
+        if self.diario is None:
+            return
+        try:
+            self.diario.registrar_lote(cambios)
+        except OSError as e:
+            logging.error(f"Error al registrar cambios en el diario de backups: {e}")
+    
+    def registrar_guardado(self, archivo: str, obtener_registros: Callable[[], list]):
+        """Avisa al diario que el archivo se guardó (toma un snapshot cada N cambios)"""
+        if self.diario is None:
+            return
+        try:
+            self.diario.guardado(firma_archivo(archivo), obtener_registros)
+        except OSError as e:
+            logging.error(f"Error al actualizar el diario de backups: {e}")
+    
+    def verificar_snapshot(self, archivo: str, obtener_registros: Callable[[], list]):
+        """Toma un snapshot al cargar si no hay ninguno o si el archivo se modificó fuera del sistema"""
+        if self.diario is None:
+            return
+        try:
+            firma = firma_archivo(archivo)
+            if self.diario.necesita_snapshot(firma):
+                self.diario.tomar_snapshot(obtener_registros(), firma)
+        except OSError as e:
+            logging.error(f"Error al crear snapshot de backup: {e}")
+    
+    def restaurar(self, momento: datetime, destino: Optional[str] = None,
+                  min_aprobatoria: float = 6.0) -> Tuple[Path, int, int]:
+        """
+        Reconstruye los datos de un momento dado en un Excel nuevo
+        
+        Returns:
+            tuple: (archivo generado, estudiantes, cambios del diario aplicados)
+        
+        Raises:
+            ValueError: Si no está activo el modo incremental o no hay snapshot anterior
+        """
+        if self.diario is None:
+            raise ValueError("los backups incrementales no están activos")
+        
+        registros, aplicados = self.diario.reconstruir(momento)
+        ruta = Path(destino) if destino else self.backup_dir / f"restaurado_{momento.strftime('%Y%m%d_%H%M%S')}.xlsx"
+        cantidad = escribir_excel(str(ruta), registros, min_aprobatoria)
+        logging.info(f"Backup restaurado al {momento.isoformat(sep=' ')}: {ruta} "
+                     f"({cantidad} estudiantes, {aplicados} cambios del diario)")
+        return ruta, cantidad, aplicados
+    
+    def cerrar(self):
+        if self.diario is not None:
+            self.diario.cerrar()
+
+
+class PersistenciaManager:
+    """
+    Gestor de guardado diferido (write-behind) de cambios en el Excel
+    
+    El intervalo de guardado se vigila con un temporizador, así que los cambios
+    se guardan aunque nadie vuelva a usar el menú. Para que el temporizador no
+    guarde a mitad de una operación, el hilo que creó el gestor tiene el
+    candado todo el tiempo y sólo lo suelta mientras espera una opción del
+    menú (esperar_entrada). Por eso los backends deben aceptar que se guarde
+    desde el hilo del temporizador (AlmacenamientoSQLite abre su conexión con
+    check_same_thread=False).
+    """
+    
+    def __init__(self, config: ConfigManager,
+                 funcion_guardar: Callable[[List[Tuple[str, str, Optional[float]]],
+                                            List[Tuple[str, Optional[str], dict]]], bool]):
+        self.config = config
+        self.funcion_guardar = funcion_guardar
+        self.modo = config.get('persistencia', 'modo', default='inmediato')
+        self.max_pendientes = config.get('persistencia', 'max_cambios_pendientes', default=25)
+        self.intervalo = config.get('persistencia', 'intervalo_guardado', default=60)
+        self.pendientes = set()
+        self.cambios = []  # Cambios para el diario de backups, en orden, hasta que se guarden
+        self.eventos = []  # Eventos de auditoría de esos cambios
+        self.primer_cambio = None
+        self.candado = threading.RLock()
+        self.candado.acquire()
+        self.temporizador = None
+    
+    @property
+    def diferido(self) -> bool:
+        """Indica si los cambios se acumulan antes de guardarse"""
+        return self.modo == 'diferido'
+    
+    def registrar_cambio(self, nombre: str, cambio: Optional[Tuple[str, str, Optional[float]]] = None,
+                         evento: Optional[Tuple[str, Optional[str], dict]] = None) -> bool:
+        """
+        Registra un estudiante modificado y guarda si se alcanzó algún umbral
+        
+        `cambio` (operación, nombre, calificación) para el diario de backups y
+        `evento` (evento, estudiante, datos) para la auditoría se entregan
+        junto con el guardado que lleva el cambio al disco, nunca antes.
+        """
+        if self.diferido and not self.pendientes:
+            self.primer_cambio = time.monotonic()
+            self.iniciar_temporizador()
+        self.pendientes.add(nombre)
+        if cambio is not None:
+            self.cambios.append(cambio)
+        if evento is not None:
+            self.eventos.append(evento)
+        
+        if not self.diferido or self.umbral_alcanzado():
+            return self.guardar_pendientes()
+        return True
+    
+    def umbral_alcanzado(self) -> bool:
+        """Verifica si se superó el número de cambios o el tiempo de espera"""
+        if not self.pendientes:
+            return False
+        if len(self.pendientes) >= self.max_pendientes:
+            return True
+        return time.monotonic() - self.primer_cambio >= self.intervalo
+    
+    def verificar_tiempo(self) -> bool:
+        """Guarda los cambios pendientes si ya venció el intervalo de guardado"""
+        with self.candado:
+            if self.umbral_alcanzado():
+                return self.guardar_pendientes()
+            return True
+    
+    def iniciar_temporizador(self):
+        """Programa el guardado por tiempo de los cambios pendientes"""
+        if self.temporizador is not None:
+            self.temporizador.cancel()
+            self.temporizador = None
+        if self.intervalo and self.intervalo > 0:
+            self.temporizador = threading.Timer(self.intervalo, self.verificar_tiempo)
+            self.temporizador.daemon = True
+            self.temporizador.start()
+    
+    def esperar_entrada(self, mensaje: str) -> str:
+        """input() durante el cual el temporizador puede guardar los cambios pendientes"""
+        self.candado.release()
+        try:
+            return input(mensaje)
+        finally:
+            self.candado.acquire()
+    
+    def guardar_pendientes(self) -> bool:
+        """Guarda todos los cambios acumulados (un solo backup y un solo guardado)"""
+        with self.candado:
+            if not self.pendientes:
+                return True
+            
+            cantidad = len(self.pendientes)
+            if not self.funcion_guardar(list(self.cambios), list(self.eventos)):
+                # Los cambios siguen pendientes: se vuelve a intentar en el siguiente intervalo
+                if self.diferido:
+                    logging.warning(f"Guardado diferido fallido: {cantidad} estudiante(s) siguen pendientes")
+                    self.iniciar_temporizador()
+                return False
+            
+            if self.diferido:
+                logging.info(f"Guardado diferido: {cantidad} estudiante(s) modificados")
+            self.pendientes.clear()
+            self.cambios.clear()
+            self.eventos.clear()
+            self.primer_cambio = None
+            if self.temporizador is not None:
+                self.temporizador.cancel()
+                self.temporizador = None
+            return True
+
+
+class EstadisticasGrupo:
+    """
+    Agregados del grupo mantenidos de forma incremental
+    
+    Cada alta, baja o cambio de calificación actualiza los acumulados en
+    O(1) (O(log n) para el orden de calificaciones distintas), por lo que las
+    estadísticas no requieren recorrer a todos los estudiantes. La mediana,
+    los percentiles y el histograma se obtienen recorriendo sólo las
+    calificaciones distintas (a lo sumo ~100 con un decimal) con su cantidad
+    de estudiantes; no se guardan nombres, así que no duplica las cadenas que
+    ya están en RegistrosEstudiantes.
+    """
+    
+    def __init__(self, min_aprobatoria: float = 6.0):
+        self.min_aprobatoria = min_aprobatoria
+        self.reiniciar()
+    
+    def reiniciar(self):
+        """Deja los acumulados en cero"""
+        self.total = 0
+        self.suma = 0.0
+        self.suma_cuadrados = 0.0
+        self.aprobados = 0
+        self.cantidades = {}        # calificación -> cantidad de estudiantes con esa calificación
+        self.valores = []           # Calificaciones distintas, ordenadas
+    
+    def recalcular(self, estudiantes: Dict[str, dict]):
+        """Reconstruye los acumulados a partir del diccionario de estudiantes"""
+        self.reiniciar()
+        for info in estudiantes.values():
+            self.agregar(info['calificacion'])
+    
+    def agregar(self, calificacion):
+        """Registra un estudiante nuevo"""
+        self.total += 1
+        self.suma += calificacion
+        self.suma_cuadrados += calificacion * calificacion
+        if calificacion >= self.min_aprobatoria:
+            self.aprobados += 1
+        
+        cantidad = self.cantidades.get(calificacion, 0)
+        if not cantidad:
+            bisect.insort(self.valores, calificacion)
+        self.cantidades[calificacion] = cantidad + 1
+    
+    def eliminar(self, calificacion):
+        """Quita a un estudiante de los acumulados"""
+        self.total -= 1
+        self.suma -= calificacion
+        self.suma_cuadrados -= calificacion * calificacion
+        if calificacion >= self.min_aprobatoria:
+            self.aprobados -= 1
+        
+        cantidad = self.cantidades.get(calificacion)
+        if cantidad is not None:
+            if cantidad > 1:
+                self.cantidades[calificacion] = cantidad - 1
+            else:
+                del self.cantidades[calificacion]
+                indice = bisect.bisect_left(self.valores, calificacion)
+                if indice < len(self.valores) and self.valores[indice] == calificacion:
+                    self.valores.pop(indice)
+        
+        if self.total == 0:
+            self.reiniciar()  # Evita arrastrar errores de redondeo
+    
+    def modificar(self, anterior, nueva):
+        """Actualiza la calificación de un estudiante"""
+        self.eliminar(anterior)
+        self.agregar(nueva)
+    
+    @property
+    def reprobados(self) -> int:
+        return self.total - self.aprobados
+    
+    @property
+    def promedio(self) -> float:
+        return self.suma / self.total if self.total else 0.0
+    
+    @property
+    def desviacion(self) -> float:
+        """Desviación estándar poblacional"""
+        if not self.total:
+            return 0.0
+        varianza = self.suma_cuadrados / self.total - self.promedio ** 2
+        return max(0.0, varianza) ** 0.5
+    
+    @property
+    def maxima(self):
+        return self.valores[-1] if self.valores else None
+    
+    @property
+    def minima(self):
+        return self.valores[0] if self.valores else None
+    
+    def mejores(self, estudiantes: RegistrosEstudiantes) -> list:
+        """Nombres de los estudiantes con la calificación más alta (recorre las calificaciones del registro)"""
+        if not self.valores:
+            return []
+        maxima = self.valores[-1]
+        return sorted(
+            nombre for nombre, calificacion in zip(estudiantes.nombres, estudiantes.calificaciones)
+            if calificacion >= maxima
+        )
+    
+    def valores_en(self, posiciones) -> Dict[int, float]:
+        """Calificación en cada posición (0 = la más baja) del orden de todos los estudiantes"""
+        pendientes = sorted(set(posiciones))
+        resultado = {}
+        acumulado = 0
+        i = 0
+        for valor in self.valores:
+            acumulado += self.cantidades[valor]
+            while i < len(pendientes) and pendientes[i] < acumulado:
+                resultado[pendientes[i]] = valor
+                i += 1
+            if i == len(pendientes):
+                break
+        return resultado
+    
+    def percentiles(self, percentiles=(10, 25, 50, 75, 90)) -> Dict[float, float]:
+        """Percentiles con interpolación lineal (el mismo criterio que AnaliticaCalificaciones)"""
+        if not self.total:
+            return {p: 0.0 for p in percentiles}
+        
+        limites = {}
+        for p in percentiles:
+            posicion = p / 100 * (self.total - 1)
+            abajo = int(posicion)
+            limites[p] = (abajo, min(abajo + 1, self.total - 1), posicion - abajo)
+        valores = self.valores_en(i for abajo, arriba, _ in limites.values() for i in (abajo, arriba))
+        return {
+            p: float(valores[abajo] + (valores[arriba] - valores[abajo]) * fraccion)
+            for p, (abajo, arriba, fraccion) in limites.items()
+        }
+    
+    @property
+    def mediana(self) -> float:
+        return self.percentiles((50,))[50]
+    
+    def histograma(self, intervalos: int = 10, minimo: float = 0.0,
+                   maximo: float = 10.0) -> List[Tuple[float, float, int]]:
+        """Estudiantes por intervalos iguales (mismo criterio que AnaliticaCalificaciones.histograma)"""
+        ancho = (maximo - minimo) / intervalos
+        limites = [minimo + ancho * i for i in range(intervalos)] + [maximo]
+        cantidades = [0] * intervalos
+        for valor in self.valores:
+            if minimo <= valor <= maximo:
+                cantidades[min(int((valor - minimo) / ancho), intervalos - 1)] += self.cantidades[valor]
+        return [(limites[i], limites[i + 1], cantidades[i]) for i in range(intervalos)]
 
 
 class InterfazUI:
     """Clase para manejar la interfaz de usuario con colores"""
     
-    def __init__(self, config: ConfigManager):
+    def __init__(self, config: ConfigManager, inicio_rapido: bool = False):
         self.config = config
         self.usar_colores = config.get('interfaz', 'usar_colores', default=True) and COLORAMA_AVAILABLE
+        # Modo rápido (kioscos): sin pausas y sin abrir un proceso para limpiar la pantalla
+        self.inicio_rapido = inicio_rapido or config.get('interfaz', 'inicio_rapido', default=False)
+        self.animaciones = config.get('interfaz', 'animaciones', default=True) and not self.inicio_rapido
+        self.tiempo_espera = config.get('interfaz', 'tiempo_espera', default=1)
     
     def limpiar_pantalla(self):
         """Limpia la consola"""
         if self.config.get('interfaz', 'limpiar_pantalla', default=True):
-            os.system('clear' if os.name != 'nt' else 'cls')
+            if self.inicio_rapido and os.name != 'nt':
+                print("\033[H\033[2J\033[3J", end='', flush=True)  # Lo mismo que escribe 'clear'
+            else:
+                os.system('clear' if os.name != 'nt' else 'cls')
+    
+    def pausa(self, veces: float = 1):
+        """Espera `veces` el tiempo de espera configurado para que se lea un mensaje (si hay animaciones)"""
+        if self.animaciones and self.tiempo_espera > 0:
+            time.sleep(self.tiempo_espera * veces)
     
     def print_header(self, texto: str, color=None):
         """Imprime un header estilizado"""
@@ -233,35 +632,59 @@ class InterfazUI:
 class SistemaCalificaciones:
     """Clase principal del sistema de calificaciones"""
     
-    def __init__(self):
+    def __init__(self, inicio_rapido: bool = False):
         self.config = ConfigManager()
         self.log_manager = LogManager(self.config)
         self.backup_manager = BackupManager(self.config)
-        self.ui = InterfazUI(self.config)
-        self.estudiantes = {}
-        self.wb = None
-        self.ws = None
+        self.ui = InterfazUI(self.config, inicio_rapido)
+        self.persistencia = PersistenciaManager(self.config, self.guardar_cambios)
+        self.estudiantes = RegistrosEstudiantes(
+            self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+        )
+        self.indice_busqueda = IndiceBusqueda(lambda: self.estudiantes)  # Se construye al buscar
+        self.cuentas: Dict[str, str] = {}  # Número de cuenta -> nombre
+        self.estadisticas = EstadisticasGrupo(
+            self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+        )
         self.archivo_excel = self.config.get('archivos', 'excel_principal', default='grupo001.xlsx')
+        self.almacenamiento = crear_almacenamiento(self.config, self.backup_manager.crear_backup)
+        self.catalogo = crear_catalogo(self.config)  # Modo multi-grupo (None si está desactivado)
+        self.exportaciones = []  # Exportaciones CSV en segundo plano
+        self.cerrado = False
+        self.auditoria = None
+        if self.config.get('auditoria', 'activar', default=True):
+            self.auditoria = RegistroAuditoria(
+                self.config.get('auditoria', 'directorio', default='logs/auditoria')
+            )
     
-    def cargar_datos_excel(self) -> bool:
-        """Carga los datos del archivo Excel"""
+    def cargar_datos_excel(self, solo_lectura: Optional[bool] = None) -> bool:
+        """
+        Carga los datos desde el backend de almacenamiento configurado
+        
+        Con el backend de Excel en modo solo lectura los datos se obtienen de
+        la caché columnar (cache_datos) y el libro editable se abre hasta que
+        un administrador modifica datos.
+        """
+        if solo_lectura is not None and isinstance(self.almacenamiento, AlmacenamientoExcel):
+            self.almacenamiento.solo_lectura = solo_lectura
+        
         try:
-            self.wb = openpyxl.load_workbook(self.archivo_excel)
-            self.ws = self.wb.active
-            self.estudiantes = {}
+            self.estudiantes.clear()
+            self.cuentas = {}
+            
+            for nombre, calificacion, numero_cuenta in self.almacenamiento.cargar():
+                self.estudiantes.agregar(nombre, calificacion, numero_cuenta)
+                if numero_cuenta:
+                    self.cuentas[numero_cuenta] = nombre
             
-            # Leer datos (empezando desde la fila 2 para saltar encabezados)
-            for row in self.ws.iter_rows(min_row=2, values_only=True):
-                if row[0]:  # Si hay nombre
-                    nombre = str(row[0]).strip().upper()
-                    calificacion = row[1] if row[1] is not None else 0
-                    min_aprobatoria = self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
-                    self.estudiantes[nombre] = {
-                        'calificacion': calificacion,
-                        'estado': 'APROBADO' if calificacion >= min_aprobatoria else 'REPROBADO'
-                    }
+            self.estadisticas.recalcular(self.estudiantes)
+            self.indice_busqueda.invalidar()
+            self.backup_manager.verificar_snapshot(self.almacenamiento.descripcion, self.registros_actuales)
             
             logging.info(f"Datos cargados: {len(self.estudiantes)} estudiantes")
+            
+            if self.catalogo is not None:
+                self.catalogo.cargar()
             return True
         except FileNotFoundError:
             self.ui.print_error(f"No se encontró el archivo {self.archivo_excel}")
@@ -269,22 +692,47 @@ class SistemaCalificaciones:
             return False
         except Exception as e:
             self.ui.print_error(f"Error al cargar el archivo: {e}")
-            logging.error(f"Error al cargar Excel: {e}")
+            logging.error(f"Error al cargar datos de {self.almacenamiento.descripcion}: {e}")
             return False
     
-    def guardar_cambios(self) -> bool:
-        """Guarda cambios en el Excel con backup automático"""
+    def auditar(self, evento: str, estudiante: Optional[str] = None, **datos):
+        """Agrega un evento al registro de auditoría (si está activo)"""
+        self.auditar_varios([(evento, estudiante, datos)])
+    
+    def auditar_varios(self, eventos: List[Tuple[str, Optional[str], dict]]):
+        """Agrega varios eventos (evento, estudiante, datos) al registro de auditoría"""
+        if self.auditoria is None or not eventos:
+            return
         try:
-            # Crear backup antes de guardar
-            self.backup_manager.crear_backup(self.archivo_excel)
-            
-            # Guardar cambios
-            self.wb.save(self.archivo_excel)
+            self.auditoria.registrar_varios(eventos)
+        except OSError as e:
+            logging.error(f"Error al escribir en el registro de auditoría: {e}")
+    
+    def registros_actuales(self) -> List[Tuple[str, float, Optional[str]]]:
+        """Datos en memoria como registros (nombre, calificación, número de cuenta)"""
+        return [(nombre, info['calificacion'], info['numero_cuenta']) for nombre, info in self.estudiantes.items()]
+    
+    def guardar_cambios(self, cambios: Optional[List[Tuple[str, str, Optional[float]]]] = None,
+                        eventos: Optional[List[Tuple[str, Optional[str], dict]]] = None) -> bool:
+        """
+        Hace permanentes los cambios (en Excel, con backup automático)
+        
+        Args:
+            cambios: Cambios para el diario de backups que sólo se registran si se guardó
+            eventos: Eventos de auditoría que sólo se registran si se guardó
+        """
+        try:
+            self.almacenamiento.guardar()
+            if cambios:
+                self.backup_manager.registrar_cambios(cambios)
+            if eventos:
+                self.auditar_varios(eventos)
+            self.backup_manager.registrar_guardado(self.almacenamiento.descripcion, self.registros_actuales)
             logging.info("Cambios guardados exitosamente")
             return True
         except Exception as e:
             self.ui.print_error(f"Error al guardar: {e}")
-            logging.error(f"Error al guardar Excel: {e}")
+            logging.error(f"Error al guardar en {self.almacenamiento.descripcion}: {e}")
             return False
     
     def mostrar_menu_principal(self):
@@ -307,7 +755,8 @@ class SistemaCalificaciones:
         print("6. 📈 Estadísticas del grupo")
         print("7. 📁 Gestión de backups")
         print("8. 📜 Ver logs del sistema")
-        print("9. 🔙 Volver al menú principal")
+        print("9. 🕘 Historial de un estudiante")
+        print("10. 🔙 Volver al menú principal")
         print("\n" + "="*60)
     
     def mostrar_menu_estudiante(self):
@@ -323,27 +772,128 @@ class SistemaCalificaciones:
         titulo = "🔍 CONSULTAR CALIFICACIÓN DE ESTUDIANTE" if modo == 'admin' else "🔍 CONSULTAR MI CALIFICACIÓN"
         self.ui.print_subheader(titulo, Fore.YELLOW)
         
-        nombre = input("\nIngresa el nombre completo en MAYÚSCULAS (ej. JUAN PEREZ): ").strip().upper()
+        nombre = input("\nIngresa el número de cuenta o el nombre completo (ej. JUAN PEREZ): ").strip().upper()
         
-        if nombre in self.estudiantes:
+        if nombre.isdigit():
+            self.consultar_por_cuenta(nombre, modo)
+        elif nombre in self.estudiantes:
             info = self.estudiantes[nombre]
             self.ui.print_exito("Estudiante encontrado!")
-            print(f"\n   👤 Nombre: {nombre}")
-            print(f"   📝 Calificación: {info['calificacion']}")
-            print(f"   📊 Estado: {info['estado']}")
-            
-            if info['estado'] == 'APROBADO':
-                self.ui.print_info("\n   🎉 ¡Felicidades! Has aprobado la materia.")
-            else:
-                self.ui.print_info("\n   😔 Lo siento, no has aprobado. ¡Sigue esforzándote!")
-            
+            self.mostrar_info_estudiante(nombre, info['calificacion'], info['estado'])
             logging.info(f"Consulta de estudiante: {nombre} - Calificación: {info['calificacion']}")
+            self.auditar('consulta', nombre, calificacion=info['calificacion'], modo=modo)
+        elif self.catalogo is not None and self.buscar_en_grupos(nombre):
+            pass
+        elif self.sugerir_estudiante(nombre, modo):
+            pass
         else:
             self.ui.print_error(f"El estudiante '{nombre}' no se encuentra en el sistema.")
             if modo == 'estudiante':
                 self.ui.print_info("   💡 Verifica que escribiste tu nombre correctamente en MAYÚSCULAS.")
             logging.warning(f"Estudiante no encontrado: {nombre}")
     
+    def consultar_por_cuenta(self, numero_cuenta: str, modo='admin') -> bool:
+        """Consulta la calificación de un estudiante por su número de cuenta"""
+        nombre = self.cuentas.get(numero_cuenta)
+        if nombre is not None:
+            info = self.estudiantes[nombre]
+            self.ui.print_exito("Estudiante encontrado!")
+            self.mostrar_info_estudiante(nombre, info['calificacion'], info['estado'])
+            logging.info(f"Consulta de estudiante por cuenta {numero_cuenta}: {nombre} - Calificación: {info['calificacion']}")
+            self.auditar('consulta', nombre, calificacion=info['calificacion'], modo=modo, cuenta=numero_cuenta)
+            return True
+        
+        if self.catalogo is not None:
+            self.catalogo.cargar()
+            registro = self.catalogo.buscar_cuenta(numero_cuenta)
+            if registro is not None:
+                grupo, nombre, calificacion, _ = registro
+                min_aprobatoria = self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+                estado = 'APROBADO' if calificacion >= min_aprobatoria else 'REPROBADO'
+                self.ui.print_exito("Estudiante encontrado!")
+                self.mostrar_info_estudiante(nombre, calificacion, estado, grupo)
+                logging.info(f"Consulta de estudiante por cuenta {numero_cuenta}: {nombre} ({grupo}) - Calificación: {calificacion}")
+                self.auditar('consulta', nombre, calificacion=calificacion, modo=modo, cuenta=numero_cuenta, grupo=grupo)
+                return True
+        
+        self.ui.print_error(f"El número de cuenta '{numero_cuenta}' no se encuentra en el sistema.")
+        if modo == 'estudiante':
+            self.ui.print_info("   💡 Verifica tu número de cuenta (9 dígitos, ej. 324056192).")
+        logging.warning(f"Número de cuenta no encontrado: {numero_cuenta}")
+        return False
+    
+    def mostrar_info_estudiante(self, nombre: str, calificacion, estado: str, grupo: Optional[str] = None):
+        """Muestra la ficha de un estudiante"""
+        print(f"\n   👤 Nombre: {nombre}")
+        if grupo:
+            print(f"   🏫 Grupo: {grupo}")
+        print(f"   📝 Calificación: {calificacion}")
+        print(f"   📊 Estado: {estado}")
+        
+        if estado == 'APROBADO':
+            self.ui.print_info("\n   🎉 ¡Felicidades! Has aprobado la materia.")
+        else:
+            self.ui.print_info("\n   😔 Lo siento, no has aprobado. ¡Sigue esforzándote!")
+    
+    def sugerir_estudiante(self, consulta: str, modo='admin') -> bool:
+        """
+        Busca nombres parecidos (parciales, sin acentos o con errores de escritura)
+        y permite elegir uno de los candidatos
+        
+        En modo estudiante no se listan candidatos (mostraría los nombres y
+        calificaciones de otros estudiantes): sólo se acepta el nombre que
+        coincide salvo acentos, signos y espacios.
+        
+        Returns:
+            bool: True si se mostró un estudiante
+        """
+        if modo != 'admin':
+            exactos = self.indice_busqueda.buscar_exacto(consulta)
+            if len(exactos) != 1:
+                return False
+            candidatos = [(exactos[0], 1.0)]
+        else:
+            candidatos = self.indice_busqueda.buscar(consulta)
+        if not candidatos:
+            return False
+        
+        if len(candidatos) == 1 and candidatos[0][1] == 1.0:
+            nombre = candidatos[0][0]  # Sólo difiere en acentos, signos o espacios
+        else:
+            self.ui.print_advertencia(f"No hay coincidencia exacta para '{consulta}'. ¿Quisiste decir...?")
+            for i, (candidato, _) in enumerate(candidatos, 1):
+                print(f"   {i}. {candidato}")
+            
+            eleccion = input(f"\nElige un número (1-{len(candidatos)}) o ENTER para cancelar: ").strip()
+            if not eleccion.isdigit() or not 1 <= int(eleccion) <= len(candidatos):
+                self.ui.print_info("Búsqueda cancelada.")
+                logging.info(f"Búsqueda sin selección: {consulta}")
+                return True
+            nombre = candidatos[int(eleccion) - 1][0]
+        
+        info = self.estudiantes[nombre]
+        self.ui.print_exito("Estudiante encontrado!")
+        self.mostrar_info_estudiante(nombre, info['calificacion'], info['estado'])
+        logging.info(f"Consulta de estudiante: {nombre} (búsqueda: {consulta}) - Calificación: {info['calificacion']}")
+        self.auditar('consulta', nombre, calificacion=info['calificacion'], modo=modo, busqueda=consulta)
+        return True
+    
+    def buscar_en_grupos(self, nombre: str) -> bool:
+        """Busca a un estudiante en el resto de los grupos (modo multi-grupo)"""
+        self.catalogo.cargar()  # Sólo vuelve a leer los grupos que cambiaron
+        registros = self.catalogo.buscar(nombre)
+        if not registros:
+            return False
+        
+        min_aprobatoria = self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+        self.ui.print_exito(f"Estudiante encontrado en {len(registros)} grupo(s)!")
+        for grupo, _, calificacion, _ in registros:
+            estado = 'APROBADO' if calificacion >= min_aprobatoria else 'REPROBADO'
+            self.mostrar_info_estudiante(nombre, calificacion, estado, grupo)
+            logging.info(f"Consulta de estudiante: {nombre} ({grupo}) - Calificación: {calificacion}")
+            self.auditar('consulta', nombre, calificacion=calificacion, grupo=grupo)
+        return True
+    
     def ver_todos_estudiantes(self):
         """Muestra todos los estudiantes y sus calificaciones"""
         self.ui.print_subheader("📊 LISTA COMPLETA DE ESTUDIANTES", Fore.YELLOW)
@@ -389,21 +939,24 @@ class SistemaCalificaciones:
             self.ui.print_error("Calificación inválida.")
             return
         
+        # Agregar al almacenamiento (Excel o SQLite)
+        if not self.almacenamiento.agregar(nombre, calificacion):
+            self.ui.print_error("No se pudo agregar el estudiante. Revisa los logs.")
+            return
+        
         # Agregar al diccionario
         min_aprobatoria = self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
         estado = 'APROBADO' if calificacion >= min_aprobatoria else 'REPROBADO'
         self.estudiantes[nombre] = {
             'calificacion': calificacion,
-            'estado': estado
+            'estado': estado,
+            'numero_cuenta': None  # Se asigna con generar_cuentas.py
         }
+        self.estadisticas.agregar(calificacion)
+        self.indice_busqueda.agregar(nombre)
         
-        # Agregar al Excel
-        nueva_fila = self.ws.max_row + 1
-        self.ws[f'A{nueva_fila}'] = nombre
-        self.ws[f'B{nueva_fila}'] = calificacion
-        self.ws[f'C{nueva_fila}'] = f'=IF(B{nueva_fila}>={min_aprobatoria}, "Aprobado", "Reprobado")'
-        
-        if self.guardar_cambios():
+        if self.persistencia.registrar_cambio(nombre, ('agregar', nombre, calificacion),
+                                              ('agregar', nombre, {'calificacion': calificacion})):
             self.ui.print_exito(f"Estudiante '{nombre}' agregado exitosamente!")
             print(f"   📝 Calificación: {calificacion}")
             print(f"   📊 Estado: {estado}")
@@ -430,20 +983,21 @@ class SistemaCalificaciones:
             self.ui.print_error("Calificación inválida.")
             return
         
+        # Actualizar almacenamiento (Excel o SQLite)
+        if not self.almacenamiento.actualizar(nombre, nueva_calificacion):
+            self.ui.print_error("No se pudo actualizar la calificación. Revisa los logs.")
+            return
+        
         # Actualizar diccionario
         min_aprobatoria = self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
         estado = 'APROBADO' if nueva_calificacion >= min_aprobatoria else 'REPROBADO'
         calificacion_anterior = self.estudiantes[nombre]['calificacion']
         self.estudiantes[nombre]['calificacion'] = nueva_calificacion
         self.estudiantes[nombre]['estado'] = estado
+        self.estadisticas.modificar(calificacion_anterior, nueva_calificacion)
         
-        # Actualizar Excel
-        for row in range(2, self.ws.max_row + 1):
-            if str(self.ws[f'A{row}'].value).strip().upper() == nombre:
-                self.ws[f'B{row}'] = nueva_calificacion
-                break
-        
-        if self.guardar_cambios():
+        evento = ('modificar', nombre, {'anterior': calificacion_anterior, 'nueva': nueva_calificacion})
+        if self.persistencia.registrar_cambio(nombre, ('actualizar', nombre, nueva_calificacion), evento):
             self.ui.print_exito("Calificación actualizada exitosamente!")
             print(f"   📝 Nueva calificación: {nueva_calificacion}")
             print(f"   📊 Estado: {estado}")
@@ -466,21 +1020,178 @@ class SistemaCalificaciones:
             self.ui.print_error("Operación cancelada.")
             return
         
+        # Eliminar del almacenamiento (Excel o SQLite)
+        if not self.almacenamiento.eliminar(nombre):
+            self.ui.print_error("No se pudo eliminar el estudiante. Revisa los logs.")
+            return
+        
         # Eliminar del diccionario
+        calificacion = self.estudiantes[nombre]['calificacion']
+        self.estadisticas.eliminar(calificacion)
+        self.indice_busqueda.eliminar(nombre)
+        self.cuentas.pop(self.estudiantes[nombre]['numero_cuenta'], None)
         del self.estudiantes[nombre]
         
-        # Eliminar del Excel
-        fila_eliminar = None
-        for row in range(2, self.ws.max_row + 1):
-            if str(self.ws[f'A{row}'].value).strip().upper() == nombre:
-                fila_eliminar = row
-                break
+        if self.persistencia.registrar_cambio(nombre, ('eliminar', nombre, None),
+                                              ('eliminar', nombre, {'calificacion': calificacion})):
+            self.ui.print_exito(f"Estudiante '{nombre}' eliminado exitosamente.")
+            logging.info(f"Estudiante eliminado: {nombre}")
+    
+    def leer_lote(self, archivo: str) -> List[Tuple[int, dict]]:
+        """
+        Lee un archivo de cambios masivos (CSV o JSON)
+        
+        CSV: columnas nombre, calificacion y accion (opcional).
+        JSON: lista de objetos con las mismas llaves.
+        
+        Returns:
+            list: Tuplas (línea o posición, registro) con llaves en minúsculas
+        """
+        if Path(archivo).suffix.lower() == '.json':
+            with open(archivo, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            if not isinstance(datos, list):
+                raise ValueError("el JSON debe ser una lista de objetos")
+            return [
+                (i, {str(k).strip().lower(): v for k, v in registro.items()} if isinstance(registro, dict) else {})
+                for i, registro in enumerate(datos, start=1)
+            ]
+        
+        with open(archivo, 'r', encoding='utf-8-sig', newline='') as f:
+            lector = csv.DictReader(f)
+            return [
+                (linea, {str(k).strip().lower(): v for k, v in registro.items() if k is not None})
+                for linea, registro in enumerate(lector, start=2)
+            ]
+    
+    def validar_lote(self, registros: List[Tuple[int, dict]]) -> Tuple[Dict[str, float], List[str], List[str]]:
+        """
+        Valida todos los registros de un lote antes de aplicar cualquier cambio
+        
+        Returns:
+            tuple: (calificaciones nombre -> calificación, bajas, errores)
+        """
+        minima = self.config.get('calificaciones', 'minima', default=0.0)
+        maxima = self.config.get('calificaciones', 'maxima', default=10.0)
+        calificaciones = {}
+        bajas = []
+        errores = []
+        vistos = set()
         
-        if fila_eliminar:
-            self.ws.delete_rows(fila_eliminar, 1)
-            if self.guardar_cambios():
-                self.ui.print_exito(f"Estudiante '{nombre}' eliminado exitosamente.")
-                logging.info(f"Estudiante eliminado: {nombre}")
+        for linea, registro in registros:
+            nombre = str(registro.get('nombre') or '').strip().upper()
+            accion = str(registro.get('accion') or '').strip().lower()
+            
+            if not nombre:
+                errores.append(f"Línea {linea}: falta el nombre")
+                continue
+            if nombre in vistos:
+                errores.append(f"Línea {linea}: '{nombre}' aparece más de una vez en el archivo")
+                continue
+            vistos.add(nombre)
+            
+            if accion in ('eliminar', 'baja'):
+                if nombre not in self.estudiantes:
+                    errores.append(f"Línea {linea}: no se puede eliminar '{nombre}', no existe")
+                else:
+                    bajas.append(nombre)
+                continue
+            if accion not in ('', 'agregar', 'alta', 'modificar'):
+                errores.append(f"Línea {linea}: acción desconocida '{accion}'")
+                continue
+            
+            try:
+                calificacion = float(str(registro.get('calificacion')).strip().replace(',', '.'))
+            except ValueError:
+                errores.append(f"Línea {linea}: calificación inválida '{registro.get('calificacion')}'")
+                continue
+            if not minima <= calificacion <= maxima:
+                errores.append(f"Línea {linea}: la calificación debe estar entre {minima} y {maxima}")
+                continue
+            if accion in ('agregar', 'alta') and nombre in self.estudiantes:
+                errores.append(f"Línea {linea}: '{nombre}' ya existe")
+                continue
+            if accion == 'modificar' and nombre not in self.estudiantes:
+                errores.append(f"Línea {linea}: '{nombre}' no existe")
+                continue
+            
+            calificaciones[nombre] = calificacion
+        
+        return calificaciones, bajas, errores
+    
+    def importar_lote(self, archivo: str, simular: bool = False) -> bool:
+        """
+        Aplica un archivo de cambios masivos sin interacción
+        
+        El lote completo se valida antes de tocar los datos; si hay errores no
+        se aplica nada. Los cambios se aplican en una sola pasada y se guardan
+        una sola vez (con un solo backup).
+        """
+        inicio = time.perf_counter()
+        try:
+            registros = self.leer_lote(archivo)
+        except (OSError, ValueError, csv.Error) as e:
+            self.ui.print_error(f"No se pudo leer {archivo}: {e}")
+            logging.error(f"Error al leer lote {archivo}: {e}")
+            return False
+        
+        calificaciones, bajas, errores = self.validar_lote(registros)
+        fin_validacion = time.perf_counter()
+        
+        if errores:
+            self.ui.print_error(f"El lote tiene {len(errores)} error(es); no se aplicó ningún cambio.")
+            for error in errores[:20]:
+                print(f"   • {error}")
+            if len(errores) > 20:
+                print(f"   ... y {len(errores) - 20} más")
+            logging.warning(f"Lote rechazado {archivo}: {len(errores)} errores")
+            return False
+        
+        altas = sum(1 for nombre in calificaciones if nombre not in self.estudiantes)
+        resumen = f"{altas} altas, {len(calificaciones) - altas} modificaciones, {len(bajas)} bajas"
+        if simular:
+            self.ui.print_exito(f"Lote válido ({len(registros)} registros): {resumen}")
+            return True
+        
+        if not self.almacenamiento.aplicar_lote(calificaciones, bajas):
+            self.ui.print_error("No se pudo aplicar el lote. Revisa los logs.")
+            return False
+        
+        cambios = []
+        eventos = []
+        origen = Path(archivo).name
+        for nombre, calificacion in calificaciones.items():
+            if nombre in self.estudiantes:
+                anterior = self.estudiantes[nombre]['calificacion']
+                self.estudiantes[nombre]['calificacion'] = calificacion
+                cambios.append(('actualizar', nombre, calificacion))
+                eventos.append(('modificar', nombre, {'anterior': anterior, 'nueva': calificacion, 'lote': origen}))
+            else:
+                self.estudiantes.agregar(nombre, calificacion)
+                self.indice_busqueda.agregar(nombre)
+                cambios.append(('agregar', nombre, calificacion))
+                eventos.append(('agregar', nombre, {'calificacion': calificacion, 'lote': origen}))
+        for nombre in bajas:
+            info = self.estudiantes.pop(nombre)
+            self.cuentas.pop(info['numero_cuenta'], None)
+            self.indice_busqueda.eliminar(nombre)
+            cambios.append(('eliminar', nombre, None))
+            eventos.append(('eliminar', nombre, {'calificacion': info['calificacion'], 'lote': origen}))
+        self.estadisticas.recalcular(self.estudiantes)
+        fin_aplicacion = time.perf_counter()
+        
+        # El diario de backups y la auditoría sólo registran el lote si llegó al disco
+        if not self.guardar_cambios(cambios, eventos):
+            return False
+        fin = time.perf_counter()
+        
+        total = len(registros)
+        self.ui.print_exito(f"Lote aplicado: {resumen}")
+        print(f"   ⏱️  Validación: {fin_validacion - inicio:.3f}s | "
+              f"Aplicación: {fin_aplicacion - fin_validacion:.3f}s | Guardado: {fin - fin_aplicacion:.3f}s")
+        print(f"   🚀 {total} registros en {fin - inicio:.3f}s ({total / max(fin - inicio, 1e-9):,.0f} registros/s)")
+        logging.info(f"Lote aplicado desde {archivo}: {resumen} en {fin - inicio:.3f}s")
+        return True
     
     def mostrar_estadisticas(self):
         """Muestra estadísticas del grupo"""
@@ -490,34 +1201,51 @@ class SistemaCalificaciones:
             self.ui.print_error("No hay estudiantes registrados.")
             return
         
-        calificaciones = [info['calificacion'] for info in self.estudiantes.values()]
-        aprobados = sum(1 for info in self.estudiantes.values() if info['estado'] == 'APROBADO')
-        reprobados = len(self.estudiantes) - aprobados
+        stats = self.estadisticas
         
-        promedio = sum(calificaciones) / len(calificaciones)
-        maxima = max(calificaciones)
-        minima = min(calificaciones)
+        print(f"\n📊 Total de estudiantes: {stats.total}")
+        print(f"✅ Aprobados: {stats.aprobados} ({stats.aprobados/stats.total*100:.1f}%)")
+        print(f"❌ Reprobados: {stats.reprobados} ({stats.reprobados/stats.total*100:.1f}%)")
+        print(f"\n📈 Calificación promedio: {stats.promedio:.2f}")
+        print(f"📐 Desviación estándar: {stats.desviacion:.2f}")
+        print(f"🏆 Calificación más alta: {stats.maxima}")
+        print(f"📉 Calificación más baja: {stats.minima}")
         
-        print(f"\n📊 Total de estudiantes: {len(self.estudiantes)}")
-        print(f"✅ Aprobados: {aprobados} ({aprobados/len(self.estudiantes)*100:.1f}%)")
-        print(f"❌ Reprobados: {reprobados} ({reprobados/len(self.estudiantes)*100:.1f}%)")
-        print(f"\n📈 Calificación promedio: {promedio:.2f}")
-        print(f"🏆 Calificación más alta: {maxima}")
-        print(f"📉 Calificación más baja: {minima}")
+        # Mediana, percentiles y distribución a partir de los acumulados (sin recorrer a los estudiantes)
+        percentiles = stats.percentiles(self.config.get('analitica', 'percentiles', default=[10, 25, 50, 75, 90]))
+        print(f"📏 Mediana: {stats.mediana:.2f}")
+        print("📊 Percentiles: " + " | ".join(f"P{p:g}: {valor:.2f}" for p, valor in percentiles.items()))
+        
+        print(f"\n📊 Distribución de calificaciones:")
+        for linea in lineas_histograma(stats, parametros_reporte(self.config)):
+            print(f"   {linea}")
         
         # Estudiante(s) con mejor calificación
-        mejores = [nombre for nombre, info in self.estudiantes.items() if info['calificacion'] == maxima]
         print(f"\n🥇 Mejor(es) estudiante(s):")
-        for nombre in mejores:
+        for nombre in stats.mejores(self.estudiantes):
             print(f"   - {nombre}")
         
         logging.info("Estadísticas consultadas")
     
+    def crear_analitica(self) -> AnaliticaCalificaciones:
+        """Analítica (NumPy o Python puro) sobre las calificaciones cargadas"""
+        return AnaliticaCalificaciones.desde_estudiantes(
+            self.estudiantes,
+            self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+        )
+    
     def gestionar_backups(self):
         """Gestiona los backups del sistema"""
         self.ui.print_subheader("📁 GESTIÓN DE BACKUPS", Fore.YELLOW)
         
-        backups = sorted(self.backup_manager.backup_dir.glob('backup_*.xlsx'), reverse=True)
+        if self.backup_manager.diario is not None:
+            self.gestionar_backups_incrementales()
+            return
+        if self.backup_manager.almacen is not None:
+            self.gestionar_backups_deduplicados()
+            return
+        
+        backups = list(reversed(self.backup_manager.backups))
         
         if not backups:
             self.ui.print_info("No hay backups disponibles.")
@@ -532,29 +1260,196 @@ class SistemaCalificaciones:
         print(f"\n💡 Directorio de backups: {self.backup_manager.backup_dir}")
         logging.info("Gestión de backups consultada")
     
+    def gestionar_backups_deduplicados(self):
+        """Muestra los backups del manifiesto y permite extraer uno como Excel"""
+        almacen = self.backup_manager.almacen
+        backups = list(reversed(almacen.entradas))
+        
+        if not backups:
+            self.ui.print_info("No hay backups disponibles.")
+            return
+        
+        print(f"\n📦 Backups encontrados: {len(backups)}\n")
+        for i, entrada in enumerate(backups[:10], 1):  # Mostrar últimos 10
+            fecha = datetime.fromisoformat(entrada['fecha'])
+            print(f"{i}. {entrada['nombre']} - {entrada['tamano'] / 1024:.1f} KB - "
+                  f"{fecha.strftime('%d/%m/%Y %H:%M:%S')} - {entrada['escritos'] / 1024:.1f} KB nuevos")
+        
+        en_disco, completo = almacen.espacio()
+        print(f"\n💾 Espacio en disco: {en_disco / 1024:.1f} KB "
+              f"(como copias completas serían {completo / 1024:.1f} KB)")
+        print(f"💡 Directorio de backups: {self.backup_manager.backup_dir}")
+        logging.info("Gestión de backups consultada")
+        
+        opcion = input("\nNúmero de backup a extraer (Enter para volver): ").strip()
+        if not opcion:
+            return
+        
+        if not opcion.isdigit() or not 1 <= int(opcion) <= min(len(backups), 10):
+            self.ui.print_error("Opción inválida.")
+            return
+        
+        entrada = backups[int(opcion) - 1]
+        try:
+            ruta = almacen.extraer(entrada, self.backup_manager.backup_dir / f"restaurado_{entrada['nombre']}")
+        except OSError as e:
+            self.ui.print_error(f"No se pudo extraer el backup: {e}")
+            logging.error(f"Error al extraer backup {entrada['nombre']}: {e}")
+            return
+        
+        self.ui.print_exito(f"Backup extraído en {ruta}")
+        print(f"   💡 Para usarlo: cp {ruta} {self.archivo_excel}")
+        logging.info(f"Backup extraído: {entrada['nombre']} -> {ruta}")
+    
+    def gestionar_backups_incrementales(self):
+        """Muestra los snapshots y el diario de cambios y permite restaurar a una fecha"""
+        diario = self.backup_manager.diario
+        
+        if not diario.snapshots:
+            self.ui.print_info("No hay snapshots disponibles.")
+            return
+        
+        print(f"\n📦 Snapshots: {len(diario.snapshots)}\n")
+        for i, snapshot in enumerate(reversed(diario.snapshots), 1):
+            tamaño = snapshot.ruta.stat().st_size / 1024  # KB
+            print(f"{i}. {snapshot.fecha.strftime('%d/%m/%Y %H:%M:%S')} - cambio #{snapshot.secuencia} - {tamaño:.1f} KB")
+        
+        print(f"\n📝 Diario de cambios: {diario.secuencia} cambios registrados "
+              f"({diario.cambios_desde_snapshot} desde el último snapshot) - {diario.tamano_diario() / 1024:.1f} KB")
+        print(f"💡 Directorio de backups: {self.backup_manager.backup_dir}")
+        logging.info("Gestión de backups consultada")
+        
+        fecha = input("\nFecha y hora a restaurar (AAAA-MM-DD HH:MM, Enter para volver): ").strip()
+        if not fecha:
+            return
+        
+        try:
+            momento = datetime.fromisoformat(fecha)
+            ruta, cantidad, aplicados = self.backup_manager.restaurar(
+                momento, min_aprobatoria=self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+            )
+        except ValueError as e:
+            self.ui.print_error(f"No se pudo restaurar: {e}")
+            return
+        except OSError as e:
+            self.ui.print_error(f"Error al escribir el archivo restaurado: {e}")
+            logging.error(f"Error al restaurar backup: {e}")
+            return
+        
+        self.ui.print_exito(f"Datos al {momento.strftime('%d/%m/%Y %H:%M:%S')} restaurados en {ruta}")
+        print(f"   👥 {cantidad} estudiantes ({aplicados} cambios aplicados desde el snapshot)")
+        print(f"   💡 Para usarlo: cp {ruta} {self.archivo_excel}")
+    
     def ver_logs(self):
-        """Muestra los últimos logs del sistema"""
+        """Muestra los logs del sistema, de los más recientes a los más antiguos"""
         self.ui.print_subheader("📜 LOGS DEL SISTEMA", Fore.YELLOW)
         
-        log_file = self.log_manager.log_dir / f"sistema_{datetime.now().strftime('%Y%m%d')}.log"
-        
-        if not log_file.exists():
-            self.ui.print_info("No hay logs disponibles para hoy.")
+        if not archivos_de_log(self.log_manager.log_dir):
+            self.ui.print_info("No hay logs disponibles.")
             return
         
+        visor = VisorLogs(self.log_manager.log_dir)
+        mostradas = 0
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                lineas = f.readlines()
-                ultimas_lineas = lineas[-20:]  # Últimas 20 líneas
+            while True:
+                entradas = visor.pagina(20)
+                mostradas += len(entradas)
+                if entradas:
+                    print(f"\n📄 {len(entradas)} entradas del log ({visor.filtro}):\n")
+                    archivo_actual = None
+                    for archivo, linea in entradas:
+                        if archivo != archivo_actual:
+                            print(f"{Fore.CYAN}── {archivo.name} ──{Style.RESET_ALL}")
+                            archivo_actual = archivo
+                        print(linea)
+                elif mostradas:
+                    self.ui.print_info("No hay más entradas.")
+                else:
+                    self.ui.print_info(f"No hay entradas que coincidan ({visor.filtro}).")
                 
-                print(f"\n📄 Últimas {len(ultimas_lineas)} entradas del log:\n")
-                for linea in ultimas_lineas:
-                    print(linea.rstrip())
+                print(f"\n💡 Directorio de logs: {self.log_manager.log_dir}")
+                hay_mas = entradas and not visor.agotado
+                opciones = "[Enter] Más antiguos  [f] Filtrar  [q] Volver" if hay_mas else "[f] Filtrar  [q] Volver"
+                opcion = input(f"{opciones}: ").strip().lower()
                 
-                print(f"\n💡 Archivo de log: {log_file}")
+                while opcion == 'f':
+                    filtro = self.pedir_filtro_logs()
+                    if filtro is not None:
+                        visor = VisorLogs(self.log_manager.log_dir, filtro)
+                        mostradas = 0
+                        break
+                    opcion = input("[f] Filtrar  [q] Volver: ").strip().lower()
+                else:
+                    if opcion or not hay_mas:
+                        break
         except Exception as e:
             self.ui.print_error(f"Error al leer logs: {e}")
     
+    def pedir_filtro_logs(self) -> Optional[FiltroLogs]:
+        """Pide los criterios de filtrado del visor de logs (Enter = sin filtrar ese campo)"""
+        nivel = input(f"Nivel mínimo ({'/'.join(NIVELES)}): ").strip().upper() or None
+        if nivel and nivel not in NIVELES:
+            self.ui.print_error("Nivel inválido.")
+            return None
+        
+        estudiante = input("Nombre del estudiante: ").strip() or None
+        
+        operacion = input(f"Operación ({'/'.join(OPERACIONES)}): ").strip().lower() or None
+        if operacion and operacion not in OPERACIONES:
+            self.ui.print_error("Operación inválida.")
+            return None
+        
+        return FiltroLogs(nivel, estudiante, operacion)
+    
+    def historial_estudiante(self):
+        """Muestra todas las consultas y cambios registrados de un estudiante"""
+        self.ui.print_subheader("🕘 HISTORIAL DE UN ESTUDIANTE", Fore.YELLOW)
+        
+        if self.auditoria is None:
+            self.ui.print_info("El registro de auditoría está desactivado (auditoria.activar en config.json).")
+            return
+        
+        nombre = input("\nIngresa el nombre completo del estudiante: ").strip().upper()
+        if not nombre:
+            return
+        self.mostrar_historial(nombre)
+    
+    def mostrar_historial(self, nombre: str) -> bool:
+        """Imprime el historial de auditoría de un estudiante (True si tiene eventos)"""
+        inicio = time.perf_counter()
+        try:
+            eventos = self.auditoria.historial(nombre)
+        except (OSError, sqlite3.Error) as e:
+            self.ui.print_error(f"Error al leer el registro de auditoría: {e}")
+            logging.error(f"Error al consultar historial de {nombre}: {e}")
+            return False
+        duracion = time.perf_counter() - inicio
+        
+        if not eventos:
+            self.ui.print_info(f"No hay eventos registrados para '{nombre}'.")
+            return False
+        
+        print(f"\n👤 {nombre} - {len(eventos)} evento(s)\n")
+        for evento in eventos:
+            fecha = datetime.fromisoformat(evento['ts']).strftime('%d/%m/%Y %H:%M:%S')
+            tipo = evento['evento']
+            if tipo == 'consulta':
+                detalle = f"🔍 Consulta (calificación {evento.get('calificacion')})"
+            elif tipo == 'agregar':
+                detalle = f"➕ Alta con calificación {evento.get('calificacion')}"
+            elif tipo == 'modificar':
+                detalle = f"✏️  Calificación {evento.get('anterior')} → {evento.get('nueva')}"
+            elif tipo == 'eliminar':
+                detalle = f"🗑️  Baja (calificación {evento.get('calificacion')})"
+            else:
+                detalle = tipo
+            extras = [f"{clave}: {evento[clave]}" for clave in ('modo', 'grupo', 'cuenta', 'lote') if clave in evento]
+            print(f"   {fecha}  {detalle}" + (f"  [{', '.join(extras)}]" if extras else ""))
+        
+        print(f"\n⏱️  Historial obtenido en {duracion * 1000:.1f} ms")
+        logging.info(f"Historial consultado: {nombre} ({len(eventos)} eventos)")
+        return True
+    
     def exportar_reporte_csv(self):
         """Exporta un reporte en formato CSV"""
         self.ui.print_subheader("📊 EXPORTAR REPORTE CSV", Fore.YELLOW)
@@ -570,15 +1465,11 @@ class SistemaCalificaciones:
             
             # Nombre del archivo
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            archivo_csv = reportes_dir / f"reporte_{timestamp}.csv"
+            exportador = self.crear_exportador(reportes_dir / f"reporte_{timestamp}.csv")
+            archivo_csv = exportador.destino
             
-            # Escribir CSV
-            with open(archivo_csv, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['NOMBRE', 'CALIFICACIÓN', 'ESTADO'])
-                
-                for nombre, info in sorted(self.estudiantes.items()):
-                    writer.writerow([nombre, info['calificacion'], info['estado']])
+            # Escribir CSV por bloques
+            exportador.exportar(filas_desde_registros(self.estudiantes))
             
             self.ui.print_exito(f"Reporte exportado: {archivo_csv.name}")
             print(f"   📁 Ubicación: {archivo_csv}")
@@ -588,6 +1479,90 @@ class SistemaCalificaciones:
             self.ui.print_error(f"Error al exportar reporte: {e}")
             logging.error(f"Error al exportar CSV: {e}")
     
+    def crear_exportador(self, destino: Path) -> ExportadorCSV:
+        """Exportador CSV con la compresión y el tamaño de bloque configurados"""
+        return ExportadorCSV(
+            destino,
+            comprimir=self.config.get('exportacion', 'comprimir', default=False),
+            filas_por_bloque=self.config.get('exportacion', 'filas_por_bloque', default=5000)
+        )
+    
+    def exportar_csv_segundo_plano(self):
+        """
+        Exporta a CSV en un hilo aparte
+        
+        Con el modo multi-grupo activo se exportan todos los grupos en un solo
+        archivo (con la columna GRUPO). El menú sigue disponible mientras tanto.
+        
+        El hilo nunca lee el Excel que un administrador puede volver a guardar
+        mientras tanto: antes de iniciarlo se copia el archivo y el hilo lee la
+        copia en streaming, así que la memoria no crece con el tamaño del grupo.
+        Con SQLite el hilo usa su propia conexión (lectura consistente) y en
+        modo multi-grupo se usan los registros ya cargados de cada grupo.
+        """
+        self.ui.print_subheader("📦 EXPORTAR CSV EN SEGUNDO PLANO", Fore.YELLOW)
+        
+        # El archivo debe reflejar los cambios hechos en esta sesión
+        self.persistencia.guardar_pendientes()
+        
+        min_aprobatoria = self.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+        reportes_dir = Path(self.config.get('archivos', 'directorio_reportes', default='reportes'))
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        encabezados = ENCABEZADOS_REPORTE
+        temporal = None
+        
+        if self.catalogo is not None:
+            self.catalogo.cargar()
+            grupos = dict(sorted(self.catalogo.grupos.items()))  # Los registros de un grupo se reemplazan, no se modifican
+            filas = filas_desde_catalogo(grupos, min_aprobatoria)
+            encabezados = ['GRUPO'] + ENCABEZADOS_REPORTE
+            destino = reportes_dir / f"reporte_grupos_{timestamp}.csv"
+            descripcion = f"{len(grupos)} grupos"
+        elif isinstance(self.almacenamiento, AlmacenamientoSQLite):
+            filas = filas_desde_sqlite(self.almacenamiento.archivo_db, min_aprobatoria)
+            destino = reportes_dir / f"reporte_{timestamp}.csv"
+            descripcion = self.almacenamiento.archivo_db
+        else:
+            reportes_dir.mkdir(exist_ok=True)
+            temporal = reportes_dir / f".copia_{timestamp}{Path(self.archivo_excel).suffix}"
+            try:
+                shutil.copyfile(self.archivo_excel, temporal)
+            except OSError as e:
+                self.ui.print_error(f"No se pudo copiar {self.archivo_excel} para exportarlo: {e}")
+                logging.error(f"Error al copiar el Excel para exportar: {e}")
+                return
+            filas = filas_desde_excel(str(temporal), min_aprobatoria)
+            destino = reportes_dir / f"reporte_{timestamp}.csv"
+            descripcion = self.archivo_excel
+        
+        exportacion = ExportacionEnSegundoPlano(self.crear_exportador(destino), filas, encabezados,
+                                                descripcion, temporal)
+        exportacion.start()
+        self.exportaciones.append(exportacion)
+        
+        self.ui.print_exito(f"Exportación iniciada ({descripcion}): {exportacion.exportador.destino.name}")
+        self.ui.print_info("   💡 Puedes seguir usando el sistema; revisa el avance en 'Ver exportaciones'.")
+        logging.info(f"Exportación en segundo plano iniciada desde {descripcion}: {exportacion.exportador.destino}")
+    
+    def ver_exportaciones(self):
+        """Muestra el avance de las exportaciones en segundo plano"""
+        self.ui.print_subheader("⏳ EXPORTACIONES EN SEGUNDO PLANO", Fore.YELLOW)
+        
+        if not self.exportaciones:
+            self.ui.print_info("No se han iniciado exportaciones en esta sesión.")
+            return
+        
+        for exportacion in self.exportaciones:
+            print(f"\n   📄 {exportacion.exportador.destino.name} ({exportacion.descripcion})")
+            print(f"      {exportacion.estado}")
+    
+    def esperar_exportaciones(self):
+        """Espera a que terminen las exportaciones en curso antes de salir"""
+        for exportacion in self.exportaciones:
+            if exportacion.is_alive():
+                self.ui.print_info(f"⏳ Esperando a que termine {exportacion.exportador.destino.name}...")
+                exportacion.join()
+    
     def verificar_admin(self) -> bool:
         """Verifica la contraseña del administrador"""
         self.ui.print_subheader("🔐 ACCESO DE ADMINISTRADOR", Fore.MAGENTA)
@@ -602,17 +1577,20 @@ class SistemaCalificaciones:
             if password == password_correcta:
                 self.ui.print_exito("Acceso concedido. Bienvenido, Maestro.")
                 logging.info("Acceso de administrador concedido")
-                time.sleep(1)
+                self.auditar('acceso', resultado='concedido')
+                self.ui.pausa()
                 return True
             else:
                 intentos -= 1
                 if intentos > 0:
                     self.ui.print_error(f"Contraseña incorrecta. Te quedan {intentos} intentos.")
                     logging.warning(f"Intento de acceso fallido. Intentos restantes: {intentos}")
+                    self.auditar('acceso', resultado='fallido', intentos_restantes=intentos)
                 else:
                     self.ui.print_error("Acceso denegado. Demasiados intentos fallidos.")
                     logging.warning("Acceso de administrador denegado - Demasiados intentos")
-                    time.sleep(2)
+                    self.auditar('acceso', resultado='denegado')
+                    self.ui.pausa(2)
         
         return False
     
@@ -628,7 +1606,7 @@ class SistemaCalificaciones:
                 self.mostrar_estadisticas()
             elif opcion == '3':
                 self.ui.print_info("\n🔙 Volviendo al menú principal...")
-                time.sleep(1)
+                self.ui.pausa()
                 break
             else:
                 self.ui.print_error("Opción inválida. Por favor selecciona 1-3.")
@@ -645,7 +1623,7 @@ class SistemaCalificaciones:
         
         while True:
             self.mostrar_menu_admin()
-            opcion = input("\nSelecciona una opción (1-9): ").strip()
+            opcion = self.persistencia.esperar_entrada("\nSelecciona una opción (1-10): ").strip()
             
             if opcion == '1':
                 self.consultar_estudiante(modo='admin')
@@ -664,13 +1642,17 @@ class SistemaCalificaciones:
             elif opcion == '8':
                 self.ver_logs()
             elif opcion == '9':
+                self.historial_estudiante()
+            elif opcion == '10':
+                self.persistencia.guardar_pendientes()
                 self.ui.print_info("\n🔙 Volviendo al menú principal...")
-                time.sleep(1)
+                self.ui.pausa()
                 break
             else:
-                self.ui.print_error("Opción inválida. Por favor selecciona 1-9.")
+                self.ui.print_error("Opción inválida. Por favor selecciona 1-10.")
             
-            input("\n⏎ Presiona ENTER para continuar...")
+            self.persistencia.verificar_tiempo()
+            self.persistencia.esperar_entrada("\n⏎ Presiona ENTER para continuar...")
             self.ui.limpiar_pantalla()
     
     def menu_exportar_reportes(self):
@@ -678,16 +1660,25 @@ class SistemaCalificaciones:
         self.ui.print_header("📊 EXPORTAR REPORTES", Fore.BLUE + Style.BRIGHT)
         print("\n1. 📄 Exportar a CSV")
         print("2. 📈 Exportar estadísticas completas")
-        print("3. 🔙 Volver")
+        print("3. 📦 Exportar CSV en segundo plano" + (" (todos los grupos)" if self.catalogo is not None else ""))
+        print("4. ⏳ Ver exportaciones en segundo plano")
+        print("5. 🗂️  Generar todos los reportes de todos los grupos")
+        print("6. 🔙 Volver")
         print("\n" + "="*60)
         
-        opcion = input("\nSelecciona una opción (1-3): ").strip()
+        opcion = input("\nSelecciona una opción (1-6): ").strip()
         
         if opcion == '1':
             self.exportar_reporte_csv()
         elif opcion == '2':
             self.exportar_estadisticas_completas()
         elif opcion == '3':
+            self.exportar_csv_segundo_plano()
+        elif opcion == '4':
+            self.ver_exportaciones()
+        elif opcion == '5':
+            self.generar_todos_reportes()
+        elif opcion == '6':
             return
         else:
             self.ui.print_error("Opción inválida.")
@@ -709,40 +1700,8 @@ class SistemaCalificaciones:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             archivo_txt = reportes_dir / f"estadisticas_{timestamp}.txt"
             
-            with open(archivo_txt, 'w', encoding='utf-8') as f:
-                f.write("="*70 + "\n")
-                f.write("  REPORTE DE ESTADÍSTICAS - SISTEMA DE CALIFICACIONES PRO 2.0\n")
-                f.write("="*70 + "\n\n")
-                f.write(f"Fecha del reporte: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n\n")
-                
-                # Estadísticas generales
-                calificaciones = [info['calificacion'] for info in self.estudiantes.values()]
-                aprobados = sum(1 for info in self.estudiantes.values() if info['estado'] == 'APROBADO')
-                reprobados = len(self.estudiantes) - aprobados
-                promedio = sum(calificaciones) / len(calificaciones)
-                maxima = max(calificaciones)
-                minima = min(calificaciones)
-                
-                f.write("ESTADÍSTICAS GENERALES\n")
-                f.write("-" * 70 + "\n")
-                f.write(f"Total de estudiantes: {len(self.estudiantes)}\n")
-                f.write(f"Aprobados: {aprobados} ({aprobados/len(self.estudiantes)*100:.1f}%)\n")
-                f.write(f"Reprobados: {reprobados} ({reprobados/len(self.estudiantes)*100:.1f}%)\n")
-                f.write(f"Calificación promedio: {promedio:.2f}\n")
-                f.write(f"Calificación más alta: {maxima}\n")
-                f.write(f"Calificación más baja: {minima}\n\n")
-                
-                # Lista de estudiantes
-                f.write("LISTA COMPLETA DE ESTUDIANTES\n")
-                f.write("-" * 70 + "\n")
-                f.write(f"{'NOMBRE':<35} {'CALIFICACIÓN':<15} {'ESTADO':<15}\n")
-                f.write("-" * 70 + "\n")
-                
-                for nombre, info in sorted(self.estudiantes.items()):
-                    f.write(f"{nombre:<35} {info['calificacion']:<15} {info['estado']:<15}\n")
-                
-                f.write("\n" + "="*70 + "\n")
-                f.write("Fin del reporte\n")
+            with escritura_atomica(archivo_txt) as f:
+                escribir_estadisticas(f, self.crear_analitica(), parametros_reporte(self.config))
             
             self.ui.print_exito(f"Estadísticas exportadas: {archivo_txt.name}")
             print(f"   📁 Ubicación: {archivo_txt}")
@@ -752,30 +1711,105 @@ class SistemaCalificaciones:
             self.ui.print_error(f"Error al exportar estadísticas: {e}")
             logging.error(f"Error al exportar estadísticas: {e}")
     
-    def ejecutar(self):
-        """Ejecuta el sistema principal"""
+    def generar_todos_reportes(self):
+        """Genera CSV, estadísticas y un resumen comparativo de todos los grupos en paralelo"""
+        self.ui.print_subheader("🗂️  GENERAR TODOS LOS REPORTES", Fore.YELLOW)
+        
+        # Los archivos deben reflejar los cambios hechos en esta sesión
+        self.persistencia.guardar_pendientes()
+        
+        archivos = archivos_de_grupos(self.config)
+        if not archivos:
+            self.ui.print_error("No se encontraron archivos de grupo.")
+            return
+        
+        procesos = self.config.get('grupos', 'procesos', default=None) or os.cpu_count()
+        reportes_dir = self.config.get('archivos', 'directorio_reportes', default='reportes')
+        print(f"\n⏳ Generando reportes de {len(archivos)} grupo(s) con {min(procesos, len(archivos))} proceso(s)...")
+        
+        resultados, errores, archivo_resumen, total = generar_todos_los_reportes(
+            archivos, reportes_dir, parametros_reporte(self.config), procesos
+        )
+        
+        print(f"\n{'GRUPO':<15} {'ESTUDIANTES':>11} {'LECTURA':>9} {'CSV':>9} {'ESTADÍST.':>10} {'TOTAL':>9}")
+        print("-" * 68)
+        suma = 0.0
+        for resultado in resultados:
+            tiempos = resultado['tiempos']
+            tiempo_grupo = sum(tiempos.values())
+            suma += tiempo_grupo
+            print(f"{resultado['grupo']:<15} {resultado['resumen']['total']:>11,} {tiempos['lectura']:>8.3f}s "
+                  f"{tiempos['csv']:>8.3f}s {tiempos['estadisticas']:>9.3f}s {tiempo_grupo:>8.3f}s")
+        print("-" * 68)
+        
+        for archivo, error in errores:
+            self.ui.print_error(f"{Path(archivo).name}: {error}")
+        
+        self.ui.print_exito(f"{len(resultados)} grupo(s) procesados en {total:.2f}s "
+                            f"(suma de tiempos por grupo: {suma:.2f}s)")
+        print(f"   📁 Ubicación: {reportes_dir}")
+        print(f"   📊 Resumen comparativo: {archivo_resumen.name}")
+        logging.info(f"Reportes de {len(resultados)} grupos generados en {total:.2f}s "
+                     f"({len(errores)} errores)")
+    
+    def cerrar(self):
+        """Guarda lo pendiente y cierra archivos y bases de datos antes de salir (una sola vez)"""
+        if self.cerrado:
+            return
+        self.cerrado = True
+        self.persistencia.guardar_pendientes()
+        self.esperar_exportaciones()
+        self.almacenamiento.cerrar()
+        self.backup_manager.cerrar()
+        if self.auditoria is not None:
+            self.auditoria.cerrar()
+    
+    def ejecutar(self, medir_inicio: bool = False):
+        """
+        Ejecuta el sistema principal
+        
+        Args:
+            medir_inicio: Muestra el tiempo hasta el menú principal y termina
+                          (sin esperar opciones)
+        """
         self.ui.limpiar_pantalla()
         self.ui.print_header("🎓 SISTEMA DE CALIFICACIONES PRO 2.0 🎓", Fore.CYAN + Style.BRIGHT)
-        time.sleep(1)
+        self.ui.pausa()
         
         # Cargar datos
         print("\n⏳ Cargando datos...")
+        inicio_carga = time.perf_counter()
         if not self.cargar_datos_excel():
             self.ui.print_error("No se pudo iniciar el sistema.")
             return
+        tiempo_carga = time.perf_counter() - inicio_carga
         
         self.ui.print_exito(f"Datos cargados: {len(self.estudiantes)} estudiantes encontrados.")
-        time.sleep(1)
+        if self.catalogo is not None:
+            self.ui.print_info(f"   📚 Grupos cargados: {len(self.catalogo.grupos)} "
+                               f"({self.catalogo.total_estudiantes} estudiantes en total)")
+        self.ui.pausa()
         self.ui.limpiar_pantalla()
         
+        primer_menu = True
         while True:
             self.mostrar_menu_principal()
+            if primer_menu:
+                primer_menu = False
+                tiempo_inicio = time.perf_counter() - INICIO_PROCESO
+                logging.debug(f"Menú principal listo en {tiempo_inicio * 1000:.0f} ms "
+                              f"(carga de datos: {tiempo_carga * 1000:.0f} ms)")
+                if medir_inicio:
+                    print(f"\n⏱️  Tiempo hasta el menú principal: {tiempo_inicio * 1000:.1f} ms "
+                          f"(carga de datos: {tiempo_carga * 1000:.1f} ms)")
+                    self.cerrar()
+                    return
             opcion = input("\nSelecciona una opción (1-4): ").strip()
             
             if opcion == '1':
                 self.ui.limpiar_pantalla()
                 self.ui.print_info("\n👨‍🎓 Bienvenido, Estudiante")
-                time.sleep(1)
+                self.ui.pausa()
                 self.ui.limpiar_pantalla()
                 self.panel_estudiante()
                 self.ui.limpiar_pantalla()
@@ -788,27 +1822,106 @@ class SistemaCalificaciones:
                 self.menu_exportar_reportes()
                 self.ui.limpiar_pantalla()
             elif opcion == '4':
+                self.cerrar()
                 self.ui.print_info("\n👋 ¡Gracias por usar el sistema! Hasta pronto.")
                 logging.info("Sistema cerrado")
-                time.sleep(1)
+                self.ui.pausa()
                 break
             else:
                 self.ui.print_error("Opción inválida. Por favor selecciona 1-4.")
-                time.sleep(1)
+                self.ui.pausa()
                 self.ui.limpiar_pantalla()
 
 
-def main():
+def crear_parser() -> argparse.ArgumentParser:
+    """Argumentos de línea de comandos (sin argumentos se abre el menú interactivo)"""
+    parser = argparse.ArgumentParser(description="Sistema de Calificaciones PRO 2.0")
+    parser.add_argument('--rapido', action='store_true',
+                        help="Modo kiosco: sin pausas ni animaciones (igual que interfaz.inicio_rapido)")
+    parser.add_argument('--medir-inicio', action='store_true',
+                        help="Muestra el tiempo hasta el menú principal y termina")
+    subcomandos = parser.add_subparsers(dest='comando')
+    
+    importar = subcomandos.add_parser('importar', help="Aplica un CSV/JSON de altas, cambios y bajas")
+    importar.add_argument('archivo', help="Archivo .csv o .json con columnas nombre, calificacion, accion")
+    importar.add_argument('--simular', action='store_true', help="Sólo valida el archivo, sin aplicar cambios")
+    
+    historial = subcomandos.add_parser('historial', help="Muestra las consultas y cambios registrados de un estudiante")
+    historial.add_argument('nombre', help="Nombre completo del estudiante")
+    
+    restaurar = subcomandos.add_parser('restaurar', help="Reconstruye los datos de una fecha (backups incrementales)")
+    restaurar.add_argument('fecha', help="Fecha y hora a restaurar, p. ej. '2025-03-14 09:30'")
+    restaurar.add_argument('--destino', help="Excel a generar (por defecto backups/restaurado_<fecha>.xlsx)")
+    return parser
+
+
+def ejecutar_comando(args) -> int:
+    """Ejecuta un subcomando sin interacción y retorna el código de salida"""
+    sistema = SistemaCalificaciones()
+    sistema.catalogo = None  # Los comandos sólo trabajan sobre el grupo principal
+    try:
+        if args.comando == 'restaurar':
+            return restaurar_backup(sistema, args.fecha, args.destino)
+        if args.comando == 'historial':
+            if sistema.auditoria is None:
+                sistema.ui.print_error("El registro de auditoría está desactivado.")
+                return 1
+            return 0 if sistema.mostrar_historial(args.nombre.strip().upper()) else 1
+        
+        # Si se van a aplicar cambios, el Excel se abre una sola vez en modo edición
+        if not sistema.cargar_datos_excel(solo_lectura=args.simular):
+            return 1
+        
+        if args.comando == 'importar':
+            return 0 if sistema.importar_lote(args.archivo, simular=args.simular) else 1
+        return 1
+    finally:
+        sistema.almacenamiento.cerrar()
+        sistema.backup_manager.cerrar()
+        if sistema.auditoria is not None:
+            sistema.auditoria.cerrar()
+
+
+def restaurar_backup(sistema: SistemaCalificaciones, fecha: str, destino: Optional[str] = None) -> int:
+    """Subcomando 'restaurar': genera un Excel con los datos de una fecha sin tocar el archivo actual"""
+    try:
+        momento = datetime.fromisoformat(fecha)
+        ruta, cantidad, aplicados = sistema.backup_manager.restaurar(
+            momento, destino, sistema.config.get('calificaciones', 'minima_aprobatoria', default=6.0)
+        )
+    except (ValueError, OSError) as e:
+        sistema.ui.print_error(f"No se pudo restaurar: {e}")
+        return 1
+    
+    sistema.ui.print_exito(f"Datos al {momento.strftime('%d/%m/%Y %H:%M:%S')} restaurados en {ruta}")
+    print(f"   👥 {cantidad} estudiantes ({aplicados} cambios aplicados desde el snapshot)")
+    print(f"   💡 Para usarlo: cp {ruta} {sistema.archivo_excel}")
+    return 0
+
+
+def main(argv=None):
     """Función principal"""
+    args = crear_parser().parse_args(argv)
+    if args.comando:
+        sys.exit(ejecutar_comando(args))
+    
+    sistema = None
     try:
-        sistema = SistemaCalificaciones()
-        sistema.ejecutar()
+        sistema = SistemaCalificaciones(inicio_rapido=args.rapido)
+        sistema.ejecutar(medir_inicio=args.medir_inicio)
     except KeyboardInterrupt:
         print("\n\n⚠️  Sistema interrumpido por el usuario.")
         logging.info("Sistema interrumpido por el usuario")
     except Exception as e:
         print(f"\n❌ Error crítico: {e}")
         logging.critical(f"Error crítico: {e}")
+    finally:
+        # Los cambios pendientes del guardado diferido se guardan aunque el sistema falle
+        if sistema is not None:
+            try:
+                sistema.cerrar()
+            except Exception as e:
+                logging.critical(f"Error al cerrar el sistema: {e}")
 
 
 if __name__ == "__main__":
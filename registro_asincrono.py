@@ -0,0 +1,137 @@
+"""
+Logging Asíncrono - Sistema de Calificaciones
+Pasa los registros de log a una cola acotada y un hilo en segundo plano
+(QueueListener) los formatea y escribe al archivo. El código que llama a
+logging.info() sólo paga el costo de poner el registro en la cola.
+
+Si la cola se llena, quien registra espera a que haya lugar en lugar de
+descartar mensajes. Al terminar el programa se vacía la cola antes de salir.
+
+Uso:
+    python3 registro_asincrono.py --benchmark [cantidad]
+"""
+
+import sys
+import time
+import queue
+import atexit
+import logging
+import tempfile
+import logging.handlers
+from typing import List, Tuple
+
+from rotacion_logs import ManejadorLogRotativo
+
+TAMANO_COLA = 10000
+
+
+class ManejadorCola(logging.handlers.QueueHandler):
+    """
+    QueueHandler que deja el formateo al hilo del listener
+
+    La cola es una queue.Queue acotada: si está llena, put() bloquea a quien
+    registra hasta que el listener saque un mensaje (no se descarta nada).
+    """
+
+    def prepare(self, record):
+        # Sólo se resuelve el mensaje (los del sistema ya vienen como f-string);
+        # la fecha, el formato y la escritura se hacen en el hilo del listener
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        self.queue.put(record)
+
+
+class ListenerCola(logging.handlers.QueueListener):
+    """
+    QueueListener que escribe por lotes: los manejadores no vacían su búfer en
+    cada registro sino cuando la cola queda vacía (una escritura al disco por
+    lote en lugar de una por mensaje)
+    """
+
+    def __init__(self, cola, *manejadores):
+        super().__init__(cola, *manejadores, respect_handler_level=True)
+        for manejador in manejadores:
+            if hasattr(manejador, 'vaciar_cada_registro'):
+                manejador.vaciar_cada_registro = False
+
+    def enqueue_sentinel(self):
+        # Con la cola llena, put_nowait() fallaría: se espera a que haya lugar
+        self.queue.put(self._sentinel)
+
+    def handle(self, record):
+        super().handle(record)
+        if self.queue.empty():
+            self.vaciar()
+
+    def vaciar(self):
+        for manejador in self.handlers:
+            manejador.flush()
+
+    def stop(self):
+        """Procesa lo que quede en la cola y vacía los búferes (se puede llamar más de una vez)"""
+        if self._thread is not None:
+            super().stop()
+            self.vaciar()
+
+
+def iniciar_registro_asincrono(manejadores: List[logging.Handler],
+                               tamano_cola: int = TAMANO_COLA) -> Tuple[ManejadorCola, ListenerCola]:
+    """
+    Crea la cola y arranca el hilo que escribe en los manejadores dados
+
+    Returns:
+        tuple: (manejador para agregar al logger, listener en ejecución)
+    """
+    cola = queue.Queue(maxsize=tamano_cola)
+    listener = ListenerCola(cola, *manejadores)
+    listener.start()
+    atexit.register(listener.stop)  # Vacía la cola al salir
+    return ManejadorCola(cola), listener
+
+
+def benchmark_logging(cantidad: int = 100_000):
+    """Compara el tiempo en el ciclo que registra con escritura directa y con cola"""
+    formato = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s')
+
+    print(f"\n⏱️  BENCHMARK DE LOGGING ({cantidad:,} mensajes)")
+    print("━" * 60)
+
+    for etiqueta, asincrono in (('Directo', False), ('Con cola', True)):
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = ManejadorLogRotativo(directorio)
+            archivo.setFormatter(formato)
+            logger = logging.getLogger(f"benchmark.{etiqueta}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+
+            listener = None
+            if asincrono:
+                manejador, listener = iniciar_registro_asincrono([archivo])
+            else:
+                manejador = archivo
+            logger.addHandler(manejador)
+
+            inicio = time.perf_counter()
+            for i in range(cantidad):
+                logger.info(f"Consulta de estudiante: ESTUDIANTE {i:06d}")
+            en_ciclo = time.perf_counter() - inicio
+            if listener is not None:
+                listener.stop()
+            total = time.perf_counter() - inicio
+
+            logger.removeHandler(manejador)
+            archivo.close()
+
+        print(f"   {etiqueta:<9} ciclo: {en_ciclo:6.3f} s ({en_ciclo / cantidad * 1e6:5.1f} µs/mensaje)   "
+              f"hasta escribir todo: {total:6.3f} s")
+    print("━" * 60)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--benchmark':
+        benchmark_logging(int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
+    else:
+        print(__doc__)
@@ -0,0 +1,229 @@
+"""
+Registro Compacto de Estudiantes - Sistema de Calificaciones
+Guarda a los estudiantes en arreglos paralelos en lugar de un diccionario por
+estudiante: las calificaciones en un array('d'), el estado aprobado/reprobado
+en un conjunto de bits y los números de cuenta en una lista. El estado se
+calcula al vuelo a partir del bit, así que no se repite la cadena
+'APROBADO'/'REPROBADO' por estudiante.
+
+La clase conserva la interfaz de diccionario que usa main_pro.py:
+    estudiantes[nombre]['calificacion'], estudiantes[nombre]['estado'],
+    nombre in estudiantes, del estudiantes[nombre], .items(), .pop(), ...
+
+Uso:
+    python3 registros.py --memoria [cantidad]
+"""
+
+import sys
+import tracemalloc
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional
+
+CAMPOS = ('calificacion', 'estado', 'numero_cuenta')
+
+
+class RegistroEstudiante:
+    """Vista de un estudiante dentro de RegistrosEstudiantes (se comporta como un dict)"""
+
+    __slots__ = ('registros', 'nombre')
+
+    def __init__(self, registros: 'RegistrosEstudiantes', nombre: str):
+        self.registros = registros
+        self.nombre = nombre
+
+    def __getitem__(self, campo: str):
+        return self.registros.obtener_campo(self.nombre, campo)
+
+    def __setitem__(self, campo: str, valor):
+        self.registros.asignar_campo(self.nombre, campo, valor)
+
+    def get(self, campo: str, defecto=None):
+        return self[campo] if campo in CAMPOS else defecto
+
+    def como_dict(self) -> dict:
+        """Copia independiente de los datos del estudiante"""
+        return {campo: self[campo] for campo in CAMPOS}
+
+    def __repr__(self):
+        return repr(self.como_dict())
+
+
+class RegistrosEstudiantes(MutableMapping):
+    """
+    Estudiantes en arreglos paralelos con interfaz de diccionario
+
+    Cada estudiante ocupa una posición: nombres[i], calificaciones[i], el bit i
+    de `aprobados` y cuentas[i]. Al eliminar, el último estudiante ocupa el
+    lugar del eliminado, así que los arreglos nunca tienen huecos y
+    `calificaciones` se puede pasar directamente a NumPy.
+    """
+
+    def __init__(self, min_aprobatoria: float = 6.0):
+        self.min_aprobatoria = min_aprobatoria
+        self.posiciones: Dict[str, int] = {}         # nombre -> posición
+        self.nombres: List[str] = []
+        self.calificaciones = array('d')
+        self.aprobados = bytearray()                  # Un bit por estudiante
+        self.cuentas: List[Optional[str]] = []
+
+    # --- Bits de aprobado ---
+
+    def _bit(self, posicion: int) -> bool:
+        return bool(self.aprobados[posicion >> 3] & (1 << (posicion & 7)))
+
+    def _asignar_bit(self, posicion: int, valor: bool):
+        if valor:
+            self.aprobados[posicion >> 3] |= 1 << (posicion & 7)
+        else:
+            self.aprobados[posicion >> 3] &= ~(1 << (posicion & 7)) & 0xFF
+
+    # --- Operaciones principales ---
+
+    def agregar(self, nombre: str, calificacion: float, numero_cuenta: Optional[str] = None):
+        """Agrega un estudiante o reemplaza sus datos si ya existe"""
+        posicion = self.posiciones.get(nombre)
+        if posicion is None:
+            posicion = len(self.nombres)
+            self.posiciones[nombre] = posicion
+            self.nombres.append(nombre)
+            self.calificaciones.append(calificacion)
+            self.cuentas.append(numero_cuenta)
+            if posicion >> 3 >= len(self.aprobados):
+                self.aprobados.append(0)
+        else:
+            self.calificaciones[posicion] = calificacion
+            self.cuentas[posicion] = numero_cuenta
+        self._asignar_bit(posicion, calificacion >= self.min_aprobatoria)
+
+    def obtener_campo(self, nombre: str, campo: str):
+        posicion = self.posiciones[nombre]
+        if campo == 'calificacion':
+            valor = self.calificaciones[posicion]
+            return int(valor) if valor.is_integer() else valor  # Como se leyó del Excel
+        if campo == 'estado':
+            return 'APROBADO' if self._bit(posicion) else 'REPROBADO'
+        if campo == 'numero_cuenta':
+            return self.cuentas[posicion]
+        raise KeyError(campo)
+
+    def asignar_campo(self, nombre: str, campo: str, valor):
+        posicion = self.posiciones[nombre]
+        if campo == 'calificacion':
+            self.calificaciones[posicion] = valor
+            self._asignar_bit(posicion, valor >= self.min_aprobatoria)
+        elif campo == 'estado':
+            self._asignar_bit(posicion, valor == 'APROBADO')
+        elif campo == 'numero_cuenta':
+            self.cuentas[posicion] = valor
+        else:
+            raise KeyError(campo)
+
+    # --- Interfaz de diccionario ---
+
+    def __getitem__(self, nombre: str) -> RegistroEstudiante:
+        if nombre not in self.posiciones:
+            raise KeyError(nombre)
+        return RegistroEstudiante(self, nombre)
+
+    def __setitem__(self, nombre: str, datos):
+        self.agregar(nombre, datos['calificacion'], datos.get('numero_cuenta'))
+        if 'estado' in datos:
+            self.asignar_campo(nombre, 'estado', datos['estado'])
+
+    def __delitem__(self, nombre: str):
+        posicion = self.posiciones.pop(nombre)
+        ultima = len(self.nombres) - 1
+
+        # El último estudiante pasa a ocupar la posición liberada
+        if posicion != ultima:
+            movido = self.nombres[ultima]
+            self.nombres[posicion] = movido
+            self.calificaciones[posicion] = self.calificaciones[ultima]
+            self.cuentas[posicion] = self.cuentas[ultima]
+            self._asignar_bit(posicion, self._bit(ultima))
+            self.posiciones[movido] = posicion
+
+        self._asignar_bit(ultima, False)
+        self.nombres.pop()
+        self.calificaciones.pop()
+        self.cuentas.pop()
+        if len(self.aprobados) > (ultima + 7) >> 3:
+            self.aprobados.pop()
+
+    def __contains__(self, nombre) -> bool:
+        return nombre in self.posiciones
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.nombres))
+
+    def __len__(self) -> int:
+        return len(self.nombres)
+
+    def pop(self, nombre: str, *defecto):
+        """Elimina a un estudiante y retorna una copia de sus datos"""
+        if nombre not in self.posiciones:
+            if defecto:
+                return defecto[0]
+            raise KeyError(nombre)
+        datos = self[nombre].como_dict()
+        del self[nombre]
+        return datos
+
+    def clear(self):
+        self.__init__(self.min_aprobatoria)
+
+    @property
+    def total_aprobados(self) -> int:
+        """Cantidad de bits encendidos (aprobados)"""
+        return sum(bin(byte).count('1') for byte in self.aprobados)
+
+
+def reporte_memoria(cantidad: int = 100_000):
+    """Compara la memoria del diccionario por estudiante contra el registro compacto"""
+    datos = [(f"ESTUDIANTE {i:06d}", (i * 7) % 101 / 10, f"3240{i:05d}") for i in range(cantidad)]
+
+    def medir(construir):
+        tracemalloc.start()
+        antes = tracemalloc.get_traced_memory()[0]
+        estructura = construir()
+        despues = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del estructura
+        return despues - antes
+
+    def como_diccionarios():
+        return {
+            nombre: {
+                'calificacion': calificacion,
+                'estado': 'APROBADO' if calificacion >= 6 else 'REPROBADO',
+                'numero_cuenta': cuenta
+            }
+            for nombre, calificacion, cuenta in datos
+        }
+
+    def como_registros():
+        registros = RegistrosEstudiantes(6.0)
+        for nombre, calificacion, cuenta in datos:
+            registros.agregar(nombre, calificacion, cuenta)
+        return registros
+
+    # Los nombres y números de cuenta ya existen en ambos casos: sólo se mide la estructura
+    por_diccionarios = medir(como_diccionarios)
+    por_registros = medir(como_registros)
+
+    print(f"\n💾 MEMORIA POR {cantidad:,} ESTUDIANTES (sin contar nombres ni cuentas)")
+    print("━" * 60)
+    print(f"   Diccionario por estudiante: {por_diccionarios / 1024 / 1024:8.2f} MB "
+          f"({por_diccionarios / cantidad:6.1f} bytes/estudiante)")
+    print(f"   Registro compacto:          {por_registros / 1024 / 1024:8.2f} MB "
+          f"({por_registros / cantidad:6.1f} bytes/estudiante)")
+    print(f"   Ahorro: {(1 - por_registros / por_diccionarios) * 100:.1f}%")
+    print("━" * 60)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--memoria':
+        reporte_memoria(int(sys.argv[2]) if len(sys.argv) > 2 else 100_000)
+    else:
+        print(__doc__)
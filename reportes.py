@@ -0,0 +1,234 @@
+"""
+Generación de Reportes - Sistema de Calificaciones
+Formato del reporte de estadísticas completas y generación en paralelo de
+todos los reportes (CSV, estadísticas y resumen) para cada Excel de grupo.
+Cada archivo se escribe en un temporal y se renombra al terminar, así que en
+directorio_reportes nunca quedan reportes a medias.
+"""
+
+import os
+import csv
+import time
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from analitica import AnaliticaCalificaciones
+from cache_datos import DIRECTORIO_CACHE, cargar_tabla
+from exportacion import ExportadorCSV
+
+ENCABEZADOS_RESUMEN = ['GRUPO', 'ESTUDIANTES', 'APROBADOS', 'REPROBADOS', '% APROBADOS',
+                       'PROMEDIO', 'MEDIANA', 'DESVIACION', 'MINIMA', 'MAXIMA']
+
+
+def parametros_reporte(config) -> dict:
+    """Parámetros de los reportes tomados de config.json (se pueden enviar a otro proceso)"""
+    return {
+        'min_aprobatoria': config.get('calificaciones', 'minima_aprobatoria', default=6.0),
+        'minima': config.get('calificaciones', 'minima', default=0.0),
+        'maxima': config.get('calificaciones', 'maxima', default=10.0),
+        'percentiles': config.get('analitica', 'percentiles', default=[10, 25, 50, 75, 90]),
+        'intervalos': config.get('analitica', 'intervalos_histograma', default=10),
+        'umbral_atipicos': config.get('analitica', 'umbral_atipicos', default=2.0),
+        'comprimir': config.get('exportacion', 'comprimir', default=False),
+        'filas_por_bloque': config.get('exportacion', 'filas_por_bloque', default=5000),
+        'directorio_cache': config.get('archivos', 'directorio_cache', default=DIRECTORIO_CACHE)
+    }
+
+
+@contextmanager
+def escritura_atomica(destino: Path):
+    """Abre un temporal junto al destino y lo renombra al destino sólo si no hubo errores"""
+    temporal = destino.with_name(destino.name + '.tmp')
+    try:
+        with open(temporal, 'w', encoding='utf-8', newline='') as f:
+            yield f
+        os.replace(temporal, destino)
+    except BaseException:
+        temporal.unlink(missing_ok=True)
+        raise
+
+
+def lineas_histograma(analitica: AnaliticaCalificaciones, parametros: dict, ancho_barra: int = 40) -> List[str]:
+    """
+    Histograma por intervalos configurables, como líneas de texto con barras
+
+    Acepta cualquier objeto con histograma(intervalos, minimo, maximo): la
+    analítica completa o los acumulados incrementales del menú.
+    """
+    histograma = analitica.histograma(parametros['intervalos'], parametros['minima'], parametros['maxima'])
+    mayor = max(cantidad for _, _, cantidad in histograma) or 1
+    return [
+        f"{desde:>5.1f} - {hasta:<5.1f}: {cantidad:>6} {'█' * round(cantidad / mayor * ancho_barra)}"
+        for desde, hasta, cantidad in histograma
+    ]
+
+
+def escribir_estadisticas(f, analitica: AnaliticaCalificaciones, parametros: dict, grupo: Optional[str] = None):
+    """Escribe el reporte de estadísticas completas de un grupo"""
+    resumen = analitica.resumen()
+    total = resumen['total']
+
+    f.write("="*70 + "\n")
+    f.write("  REPORTE DE ESTADÍSTICAS - SISTEMA DE CALIFICACIONES PRO 2.0\n")
+    f.write("="*70 + "\n\n")
+    if grupo:
+        f.write(f"Grupo: {grupo}\n")
+    f.write(f"Fecha del reporte: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n\n")
+
+    # Estadísticas generales
+    f.write("ESTADÍSTICAS GENERALES\n")
+    f.write("-" * 70 + "\n")
+    f.write(f"Total de estudiantes: {total}\n")
+    f.write(f"Aprobados: {resumen['aprobados']} ({resumen['aprobados']/total*100:.1f}%)\n")
+    f.write(f"Reprobados: {resumen['reprobados']} ({resumen['reprobados']/total*100:.1f}%)\n")
+    f.write(f"Calificación promedio: {resumen['promedio']:.2f}\n")
+    f.write(f"Desviación estándar: {resumen['desviacion']:.2f}\n")
+    f.write(f"Calificación más alta: {resumen['maxima']:g}\n")
+    f.write(f"Calificación más baja: {resumen['minima']:g}\n")
+    f.write(f"Mediana: {resumen['mediana']:.2f}\n\n")
+
+    # Percentiles
+    f.write("PERCENTILES\n")
+    f.write("-" * 70 + "\n")
+    for p, valor in analitica.percentiles(parametros['percentiles']).items():
+        f.write(f"P{p:<5g}: {valor:.2f}\n")
+    f.write("\n")
+
+    # Distribución de calificaciones
+    f.write("DISTRIBUCIÓN DE CALIFICACIONES\n")
+    f.write("-" * 70 + "\n")
+    for linea in lineas_histograma(analitica, parametros):
+        f.write(linea + "\n")
+    f.write("\n")
+
+    # Estudiantes que se alejan del promedio
+    umbral = parametros['umbral_atipicos']
+    atipicos = analitica.atipicos(umbral)
+    f.write(f"ESTUDIANTES ATÍPICOS (|z| >= {umbral})\n")
+    f.write("-" * 70 + "\n")
+    for nombre, calificacion, z in atipicos:
+        f.write(f"{nombre:<35} {calificacion:<15g} z = {z:+.2f}\n")
+    if not atipicos:
+        f.write("Ninguno\n")
+    f.write("\n")
+
+    # Lista de estudiantes
+    f.write("LISTA COMPLETA DE ESTUDIANTES\n")
+    f.write("-" * 70 + "\n")
+    f.write(f"{'NOMBRE':<35} {'CALIFICACIÓN':<15} {'ESTADO':<12} {'Z':>6}\n")
+    f.write("-" * 70 + "\n")
+
+    min_aprobatoria = parametros['min_aprobatoria']
+    filas = sorted(zip(analitica.nombres, analitica.valores, analitica.puntuaciones_z()))
+    for nombre, calificacion, z in filas:
+        estado = 'APROBADO' if calificacion >= min_aprobatoria else 'REPROBADO'
+        f.write(f"{nombre:<35} {calificacion:<15g} {estado:<12} {z:>+6.2f}\n")
+
+    f.write("\n" + "="*70 + "\n")
+    f.write("Fin del reporte\n")
+
+
+def generar_reportes_grupo(archivo_excel: str, directorio: str, parametros: dict, timestamp: str) -> dict:
+    """
+    Genera el CSV y las estadísticas de un grupo (se ejecuta en un proceso del pool)
+
+    Returns:
+        dict: Resumen del grupo, archivos generados y tiempos de cada etapa
+    """
+    grupo = Path(archivo_excel).stem
+    directorio = Path(directorio)
+    tiempos = {}
+
+    inicio = time.perf_counter()
+    tabla = cargar_tabla(archivo_excel, parametros['directorio_cache'])
+    nombres = []
+    calificaciones = []
+    for _, nombre, calificacion in tabla.registros(0, 1):
+        if nombre:
+            nombres.append(str(nombre).strip().upper())
+            calificaciones.append(calificacion if calificacion is not None else 0)
+    analitica = AnaliticaCalificaciones(calificaciones, parametros['min_aprobatoria'], nombres=nombres)
+    tiempos['lectura'] = time.perf_counter() - inicio
+
+    # Reporte CSV
+    inicio = time.perf_counter()
+    min_aprobatoria = parametros['min_aprobatoria']
+    exportador = ExportadorCSV(directorio / f"reporte_{grupo}_{timestamp}.csv",
+                               parametros['comprimir'], parametros['filas_por_bloque'])
+    exportador.exportar(
+        [nombre, calificacion, 'APROBADO' if calificacion >= min_aprobatoria else 'REPROBADO']
+        for nombre, calificacion in sorted(zip(nombres, calificaciones))
+    )
+    tiempos['csv'] = time.perf_counter() - inicio
+
+    # Estadísticas completas
+    inicio = time.perf_counter()
+    archivo_txt = directorio / f"estadisticas_{grupo}_{timestamp}.txt"
+    if nombres:
+        with escritura_atomica(archivo_txt) as f:
+            escribir_estadisticas(f, analitica, parametros, grupo)
+    tiempos['estadisticas'] = time.perf_counter() - inicio
+
+    return {
+        'grupo': grupo,
+        'resumen': analitica.resumen(),
+        'archivos': [str(exportador.destino)] + ([str(archivo_txt)] if nombres else []),
+        'tiempos': tiempos
+    }
+
+
+def generar_todos_los_reportes(archivos: Sequence[str], directorio: str, parametros: dict,
+                               procesos: Optional[int] = None) -> Tuple[List[dict], List[Tuple[str, str]], Path, float]:
+    """
+    Genera los reportes de todos los grupos en paralelo y un resumen comparativo
+
+    Returns:
+        tuple: (resultados por grupo, errores (archivo, mensaje), archivo de resumen, tiempo total)
+    """
+    inicio = time.perf_counter()
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+    resultados = []
+    errores = []
+    if len(archivos) > 1 and procesos != 1:
+        from concurrent.futures import ProcessPoolExecutor  # multiprocessing no se carga al arrancar
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = [
+                (archivo, pool.submit(generar_reportes_grupo, archivo, str(directorio), parametros, timestamp))
+                for archivo in archivos
+            ]
+            for archivo, futuro in futuros:
+                try:
+                    resultados.append(futuro.result())
+                except Exception as e:
+                    errores.append((archivo, str(e)))
+    else:
+        for archivo in archivos:
+            try:
+                resultados.append(generar_reportes_grupo(archivo, str(directorio), parametros, timestamp))
+            except Exception as e:
+                errores.append((archivo, str(e)))
+
+    # Resumen comparativo de todos los grupos
+    archivo_resumen = directorio / f"resumen_grupos_{timestamp}.csv"
+    with escritura_atomica(archivo_resumen) as f:
+        writer = csv.writer(f)
+        writer.writerow(ENCABEZADOS_RESUMEN)
+        for resultado in resultados:
+            r = resultado['resumen']
+            total = r['total']
+            writer.writerow([
+                resultado['grupo'], total, r['aprobados'], r['reprobados'],
+                f"{r['aprobados'] / total * 100:.1f}" if total else "0.0",
+                f"{r['promedio']:.2f}", f"{r['mediana']:.2f}", f"{r['desviacion']:.2f}",
+                r['minima'], r['maxima']
+            ])
+
+    for archivo, error in errores:
+        logging.error(f"Error al generar reportes de {archivo}: {error}")
+    return resultados, errores, archivo_resumen, time.perf_counter() - inicio
@@ -0,0 +1,139 @@
+"""
+Rotación de Logs - Sistema de Calificaciones
+Manejador de logging que escribe en logs/sistema_AAAAMMDD.log y lo rota:
+- por tamaño: cuando el archivo del día llega a logs.max_size_mb
+- por tiempo: al cambiar el día, aunque el sistema siga abierto (kioscos)
+
+Cada segmento rotado se comprime con gzip como
+sistema_AAAAMMDD.NNN.log.gz (NNN crece con el tiempo dentro del día) y sólo
+se conservan los últimos logs.max_archivos segmentos, así que el espacio en
+disco queda acotado. El archivo activo siempre es texto plano.
+"""
+
+import os
+import re
+import gzip
+import shutil
+import logging
+import logging.handlers
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+PATRON_ARCHIVO = re.compile(r'^sistema_(\d{8})(?:\.(\d{3}))?\.log(\.gz)?$')
+
+
+def clave_archivo(ruta: Path) -> Optional[Tuple[str, float]]:
+    """(fecha, segmento) de un archivo de log; el archivo activo va después de sus segmentos"""
+    coincidencia = PATRON_ARCHIVO.match(ruta.name)
+    if coincidencia is None:
+        return None
+    fecha, segmento, _ = coincidencia.groups()
+    return fecha, int(segmento) if segmento else float('inf')
+
+
+def archivos_de_log(directorio) -> List[Path]:
+    """Logs (activos y segmentos comprimidos) del más reciente al más antiguo"""
+    archivos = []
+    for ruta in Path(directorio).glob('sistema_*.log*'):
+        clave = clave_archivo(ruta)
+        if clave is not None:
+            archivos.append((clave, ruta))
+    return [ruta for _, ruta in sorted(archivos, reverse=True)]
+
+
+class ManejadorLogRotativo(logging.handlers.BaseRotatingHandler):
+    """Archivo de log diario con rotación por tamaño y por cambio de día"""
+
+    def __init__(self, directorio, max_bytes: int = 10 * 1024 * 1024, max_archivos: int = 30,
+                 encoding: str = 'utf-8'):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_archivos = max_archivos
+        self.vaciar_cada_registro = True  # False cuando escribe el hilo de la cola (vacía por lotes)
+        self.fecha = datetime.now().strftime('%Y%m%d')
+        self.siguiente_dia = self.calcular_siguiente_dia()
+        super().__init__(self.ruta_activa(), 'a', encoding=encoding, delay=False)
+        self.comprimir_anteriores()
+
+    def ruta_activa(self) -> str:
+        return str(self.directorio / f"sistema_{self.fecha}.log")
+
+    def calcular_siguiente_dia(self) -> float:
+        manana = datetime.strptime(self.fecha, '%Y%m%d') + timedelta(days=1)
+        return manana.timestamp()
+
+    def _open(self):
+        stream = super()._open()
+        self.tamano = stream.seek(0, os.SEEK_END)  # Bytes escritos en el archivo activo
+        return stream
+
+    def shouldRollover(self, record) -> bool:
+        if record.created >= self.siguiente_dia:
+            return True
+        return bool(self.max_bytes) and self.tamano >= self.max_bytes
+
+    def emit(self, record):
+        # Se lleva la cuenta de bytes en lugar de usar stream.tell(), que vacía el búfer en cada llamada
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            linea = self.format(record) + self.terminator
+            self.stream.write(linea)
+            self.tamano += len(linea.encode(self.encoding or 'utf-8', errors='replace'))
+            if self.vaciar_cada_registro:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def siguiente_segmento(self, fecha: str) -> Path:
+        numeros = [clave_archivo(ruta)[1] for ruta in self.directorio.glob(f'sistema_{fecha}.*.log.gz')]
+        numero = max((n for n in numeros if n != float('inf')), default=0) + 1
+        return self.directorio / f"sistema_{fecha}.{numero:03d}.log.gz"
+
+    def doRollover(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+        # El archivo que se cerró pasa a ser un segmento comprimido
+        activo = Path(self.baseFilename)
+        if activo.exists() and activo.stat().st_size > 0:
+            self.comprimir(activo, self.siguiente_segmento(self.fecha))
+        else:
+            activo.unlink(missing_ok=True)
+
+        hoy = datetime.now().strftime('%Y%m%d')
+        if hoy != self.fecha:
+            self.fecha = hoy
+            self.siguiente_dia = self.calcular_siguiente_dia()
+            self.baseFilename = os.path.abspath(self.ruta_activa())
+
+        self.limpiar()
+        self.stream = self._open()
+
+    @staticmethod
+    def comprimir(origen: Path, destino: Path):
+        temporal = destino.with_name(destino.name + '.tmp')
+        with open(origen, 'rb') as entrada, gzip.open(temporal, 'wb', compresslevel=6) as salida:
+            shutil.copyfileobj(entrada, salida)
+        os.replace(temporal, destino)
+        origen.unlink()
+
+    def comprimir_anteriores(self):
+        """Comprime los logs de días anteriores que quedaron como texto plano"""
+        anteriores = [ruta for ruta in archivos_de_log(self.directorio)
+                      if ruta.suffix == '.log' and clave_archivo(ruta)[0] < self.fecha]
+        for ruta in anteriores:
+            self.comprimir(ruta, self.siguiente_segmento(clave_archivo(ruta)[0]))
+        if anteriores:
+            self.limpiar()
+
+    def limpiar(self):
+        """Conserva sólo los últimos max_archivos segmentos comprimidos"""
+        segmentos = [ruta for ruta in archivos_de_log(self.directorio) if ruta.suffix == '.gz']
+        for ruta in segmentos[self.max_archivos:]:
+            ruta.unlink(missing_ok=True)
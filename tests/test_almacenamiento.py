@@ -0,0 +1,69 @@
+"""
+Pruebas del backend de Excel: bajas con compactación de la hoja
+
+Al eliminar filas, las que quedan suben y la fórmula de la columna C debe
+apuntar a su nueva fila.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import openpyxl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from almacenamiento import AlmacenamientoExcel, escribir_excel, formula_estado
+
+REGISTROS = [(f'ALUMNO {i}', float(i), f'10000000{i}') for i in range(1, 9)]
+
+
+class PruebaCompactar(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        self.archivo_excel = os.path.join(directorio, 'grupo.xlsx')
+        escribir_excel(self.archivo_excel, REGISTROS)
+        self.backend = AlmacenamientoExcel(self.archivo_excel, directorio_cache=os.path.join(directorio, '.cache'))
+        list(self.backend.cargar())
+
+    def hoja_guardada(self):
+        self.assertTrue(self.backend.guardar())
+        ws = openpyxl.load_workbook(self.archivo_excel).active
+        return [fila for fila in ws.iter_rows(min_row=2, values_only=True)]
+
+    def verificar_hoja(self, esperados):
+        filas = self.hoja_guardada()
+        self.assertEqual([(nombre, calificacion, cuenta) for nombre, calificacion, _, cuenta in filas], esperados)
+        for numero, (_, _, formula, _) in enumerate(filas, start=2):
+            self.assertEqual(formula, formula_estado(numero, 6.0))
+        self.assertEqual(self.backend.filas, {nombre: numero for numero, (nombre, _, _) in enumerate(esperados, start=2)})
+
+    def test_eliminar_una_fila(self):
+        self.assertTrue(self.backend.eliminar('ALUMNO 3'))
+        self.assertFalse(self.backend.eliminar('ALUMNO 3'))
+        self.verificar_hoja([r for r in REGISTROS if r[0] != 'ALUMNO 3'])
+
+    def test_lote_con_altas_cambios_y_bajas(self):
+        bajas = ['ALUMNO 1', 'ALUMNO 4', 'ALUMNO 5', 'ALUMNO 8', 'NO EXISTE']
+        self.assertTrue(self.backend.aplicar_lote({'ALUMNO 2': 9.5, 'NUEVO': 7.0}, bajas))
+
+        esperados = [(n, 9.5 if n == 'ALUMNO 2' else c, cuenta) for n, c, cuenta in REGISTROS if n not in bajas]
+        self.verificar_hoja(esperados + [('NUEVO', 7, None)])
+
+    def test_celda_escrita_a_mano_no_se_reescribe(self):
+        self.backend.asegurar_escritura()
+        self.backend.ws.cell(7, 3).value = 'Revisar'
+        self.assertTrue(self.backend.eliminar('ALUMNO 2'))
+
+        filas = self.hoja_guardada()
+        self.assertEqual(filas[4][0], 'ALUMNO 6')
+        self.assertEqual(filas[4][2], 'Revisar')
+        self.assertEqual(filas[3][2], formula_estado(5, 6.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Pruebas del registro de auditoría y su índice por estudiante (RegistroAuditoria)
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from auditoria import RegistroAuditoria
+
+
+class PruebaRegistroAuditoria(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+        self.auditoria = self.crear()
+
+    def crear(self):
+        auditoria = RegistroAuditoria(self.directorio)
+        self.addCleanup(auditoria.cerrar)
+        return auditoria
+
+    def resumen(self, historial):
+        return [(entrada['evento'], entrada.get('nueva')) for entrada in historial]
+
+    def test_historial_por_estudiante(self):
+        self.auditoria.registrar('agregar', 'ANA LOPEZ', calificacion=8)
+        self.auditoria.registrar('acceso', usuario='admin')  # Sin estudiante: no se indexa
+        self.auditoria.registrar_varios([
+            ('modificar', 'ANA LOPEZ', {'anterior': 8, 'nueva': 9.5}),
+            ('consulta', 'LUIS PEREZ', {}),
+            ('modificar', 'ANA LOPEZ', {'anterior': 9.5, 'nueva': 10}),
+        ])
+
+        self.assertEqual(self.resumen(self.auditoria.historial('ANA LOPEZ')),
+                         [('agregar', None), ('modificar', 9.5), ('modificar', 10)])
+        self.assertEqual(self.resumen(self.auditoria.historial('ANA LOPEZ', eventos=['modificar'])),
+                         [('modificar', 9.5), ('modificar', 10)])
+        self.assertEqual(self.resumen(self.auditoria.historial('LUIS PEREZ')), [('consulta', None)])
+        self.assertEqual(self.auditoria.historial('NADIE'), [])
+
+    def test_indice_incremental(self):
+        self.auditoria.registrar('agregar', 'ANA LOPEZ', calificacion=8)
+        self.auditoria.registrar('consulta', 'LUIS PEREZ')
+        self.assertEqual(self.auditoria.actualizar_indice(), 2)
+        self.assertEqual(self.auditoria.actualizar_indice(), 0)
+
+        self.auditoria.registrar('eliminar', 'ANA LOPEZ', calificacion=8)
+        self.assertEqual(self.auditoria.actualizar_indice(), 1)
+        self.auditoria.cerrar()
+
+        # Otra instancia (otra sesión del sistema) reutiliza el índice guardado
+        otra = self.crear()
+        self.assertEqual(otra.actualizar_indice(), 0)
+        self.assertEqual(self.resumen(otra.historial('ANA LOPEZ')), [('agregar', None), ('eliminar', None)])
+
+    def test_linea_incompleta_se_indexa_al_completarse(self):
+        self.auditoria.registrar('agregar', 'ANA LOPEZ', calificacion=8)
+        archivo = self.auditoria._f.name
+        linea = json.dumps({'ts': '2025-03-01T08:00:00', 'evento': 'consulta', 'estudiante': 'ANA LOPEZ'}) + '\n'
+        with open(archivo, 'a', encoding='utf-8') as f:
+            f.write(linea[:20])  # Otra instancia escribiendo la línea
+        self.assertEqual(len(self.auditoria.historial('ANA LOPEZ')), 1)
+
+        with open(archivo, 'a', encoding='utf-8') as f:
+            f.write(linea[20:])
+        self.assertEqual(self.resumen(self.auditoria.historial('ANA LOPEZ')), [('agregar', None), ('consulta', None)])
+
+    def test_nombres_con_acentos_y_comillas(self):
+        nombres = ['JOSÉ NÚÑEZ', 'ANA "LA PROFE" DÍAZ', 'LUIS \\ PEREZ']
+        for nombre in nombres:
+            self.auditoria.registrar('consulta', nombre)
+        for nombre in nombres:
+            historial = self.auditoria.historial(nombre)
+            self.assertEqual([entrada['estudiante'] for entrada in historial], [nombre])
+
+
+if __name__ == '__main__':
+    unittest.main()
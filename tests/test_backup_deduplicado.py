@@ -0,0 +1,102 @@
+"""
+Pruebas del almacén de backups deduplicado (AlmacenBackups)
+
+Los backups de un .xlsx comparten las partes del ZIP que no cambiaron, se
+restauran con el mismo contenido y limpiar() borra sólo los objetos que ya
+no usa ningún backup.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from almacenamiento import escribir_excel
+from backup_deduplicado import AlmacenBackups
+
+
+def contenido_zip(archivo):
+    with zipfile.ZipFile(archivo) as z:
+        return {info.filename: z.read(info) for info in z.infolist()}
+
+
+class PruebaAlmacenBackups(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+        self.almacen = AlmacenBackups(os.path.join(self.directorio, 'backups'))
+
+    def excel(self, nombre, calificacion):
+        archivo = os.path.join(self.directorio, nombre)
+        escribir_excel(archivo, [('ANA LOPEZ', calificacion, '100000001'), ('LUIS PEREZ', 5.0, '100000002')])
+        return archivo
+
+    def objetos(self):
+        return sorted(ruta.name for ruta in self.almacen.objetos.glob('*/*'))
+
+    def test_restaurar_y_deduplicar(self):
+        primero = self.excel('v1.xlsx', 8.0)
+        segundo = self.excel('v2.xlsx', 9.0)
+        entrada1 = self.almacen.agregar(primero, 'backup_1')
+        entrada2 = self.almacen.agregar(segundo, 'backup_2')
+
+        # Sólo cambiaron la hoja y, si pasó un segundo, la fecha en docProps/core.xml
+        self.assertGreater(entrada1['escritos'], 0)
+        self.assertLess(entrada2['escritos'], entrada1['escritos'])
+        distintas = {parte for parte, clave in entrada2['partes'] if [parte, clave] not in entrada1['partes']}
+        self.assertLessEqual(distintas, {'xl/worksheets/sheet1.xml', 'docProps/core.xml'})
+        self.assertIn('xl/worksheets/sheet1.xml', distintas)
+
+        restaurado = self.almacen.extraer(self.almacen.buscar('backup_1'), os.path.join(self.directorio, 'r.xlsx'))
+        self.assertEqual(contenido_zip(restaurado), contenido_zip(primero))
+
+        # El manifiesto se vuelve a leer al abrir el almacén
+        otro = AlmacenBackups(self.almacen.directorio)
+        self.assertEqual([entrada['nombre'] for entrada in otro.entradas], ['backup_1', 'backup_2'])
+
+    def test_archivo_que_no_es_zip(self):
+        archivo = os.path.join(self.directorio, 'datos.bin')
+        with open(archivo, 'wb') as f:
+            f.write(b'calificaciones' * 100)
+        entrada = self.almacen.agregar(archivo, 'binario')
+        self.assertEqual(self.almacen.agregar(archivo, 'binario')['escritos'], 0)
+
+        restaurado = self.almacen.extraer(entrada, os.path.join(self.directorio, 'restaurado.bin'))
+        with open(restaurado, 'rb') as f:
+            self.assertEqual(f.read(), b'calificaciones' * 100)
+        self.assertEqual(len(self.almacen.entradas), 1)
+
+    def test_limpiar_borra_solo_objetos_sin_uso(self):
+        for i, calificacion in enumerate((6.0, 7.0, 8.0), start=1):
+            self.almacen.agregar(self.excel(f'v{i}.xlsx', calificacion), f'backup_{i}')
+        antes = self.objetos()
+        usados = {clave for _, clave in self.almacen.entradas[-1]['partes']}
+
+        self.assertEqual(self.almacen.limpiar(1), len(antes) - len(usados))
+        self.assertEqual([nombre.split('.')[0] for nombre in self.objetos()], sorted(usados))
+        self.assertEqual([entrada['nombre'] for entrada in self.almacen.entradas], ['backup_3'])
+
+        destino = os.path.join(self.directorio, 'r.xlsx')
+        self.almacen.extraer(self.almacen.entradas[0], destino)
+        self.assertEqual(contenido_zip(destino), contenido_zip(os.path.join(self.directorio, 'v3.xlsx')))
+        self.assertEqual(self.almacen.limpiar(1), 0)
+
+    def test_objeto_faltante(self):
+        entrada = self.almacen.agregar(self.excel('v1.xlsx', 8.0), 'backup_1')
+        for ruta in self.almacen.objetos.glob('*/*'):
+            ruta.unlink()
+
+        destino = os.path.join(self.directorio, 'r.xlsx')
+        with self.assertRaises(FileNotFoundError):
+            self.almacen.extraer(entrada, destino)
+        self.assertFalse(os.path.exists(destino))
+        self.assertFalse(os.path.exists(destino + '.tmp'))
+
+
+if __name__ == '__main__':
+    unittest.main()
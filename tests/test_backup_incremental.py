@@ -0,0 +1,119 @@
+"""
+Pruebas del diario de cambios con snapshots (DiarioCambios)
+
+El reloj del módulo se reemplaza para fechar cada cambio en un momento
+conocido y reconstruir los datos en distintos puntos.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import backup_incremental
+from backup_incremental import DiarioCambios
+
+INICIO = datetime(2025, 3, 1, 8, 0, 0)
+
+
+class Reloj(datetime):
+    """datetime cuyo now() devuelve la hora fijada por la prueba"""
+    actual = INICIO
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.actual
+
+
+class PruebaDiarioCambios(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+        parche = mock.patch.object(backup_incremental, 'datetime', Reloj)
+        parche.start()
+        self.addCleanup(parche.stop)
+        Reloj.actual = INICIO
+
+    def crear(self, **opciones):
+        diario = DiarioCambios(self.directorio, **opciones)
+        self.addCleanup(diario.cerrar)
+        return diario
+
+    def en(self, minutos):
+        Reloj.actual = INICIO + timedelta(minutes=minutos)
+        return Reloj.actual
+
+    def test_reconstruir_en_distintos_momentos(self):
+        diario = self.crear()
+        diario.tomar_snapshot([('ANA', 8.0, '1'), ('LUIS', 5.0, '2')])
+
+        self.en(10)
+        diario.registrar_lote([('actualizar', 'ANA', 9.0), ('agregar', 'EVA', 7.5)])
+        self.en(20)
+        diario.registrar('eliminar', 'LUIS')
+
+        registros, aplicados = diario.reconstruir(INICIO + timedelta(minutes=5))
+        self.assertEqual((sorted(registros), aplicados), ([('ANA', 8.0, '1'), ('LUIS', 5.0, '2')], 0))
+
+        registros, aplicados = diario.reconstruir(INICIO + timedelta(minutes=15))
+        self.assertEqual(sorted(registros), [('ANA', 9.0, '1'), ('EVA', 7.5, None), ('LUIS', 5.0, '2')])
+        self.assertEqual(aplicados, 2)
+
+        registros, aplicados = diario.reconstruir(INICIO + timedelta(minutes=30))
+        self.assertEqual((sorted(registros), aplicados), ([('ANA', 9.0, '1'), ('EVA', 7.5, None)], 3))
+
+        with self.assertRaises(ValueError):
+            diario.reconstruir(INICIO - timedelta(minutes=1))
+
+    def test_parte_del_ultimo_snapshot_anterior(self):
+        diario = self.crear()
+        diario.tomar_snapshot([('ANA', 8.0, '1')])
+        self.en(10)
+        diario.registrar('actualizar', 'ANA', 6.0)
+        diario.tomar_snapshot([('ANA', 6.0, '1')])
+        self.en(20)
+        diario.registrar('agregar', 'EVA', 10)
+
+        registros, aplicados = diario.reconstruir(INICIO + timedelta(minutes=25))
+        self.assertEqual((sorted(registros), aplicados), ([('ANA', 6.0, '1'), ('EVA', 10, None)], 1))
+
+    def test_linea_cortada_se_ignora_y_la_secuencia_continua(self):
+        diario = self.crear()
+        diario.tomar_snapshot([('ANA', 8.0, '1')])
+        diario.registrar('actualizar', 'ANA', 9.0)
+        diario.cerrar()
+        with open(diario.archivo, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 2, "ts": "2025-03-01T08:0')  # Corte de energía a mitad de línea
+
+        diario = self.crear()
+        self.assertEqual(diario.secuencia, 1)
+        registros, aplicados = diario.reconstruir(INICIO + timedelta(minutes=1))
+        self.assertEqual((registros, aplicados), ([('ANA', 9.0, '1')], 1))
+
+    def test_limpiar_recorta_snapshots_y_diario(self):
+        diario = self.crear(max_snapshots=2)
+        for minuto in range(4):
+            self.en(minuto * 10)
+            diario.registrar('actualizar', 'ANA', float(minuto))
+            diario.tomar_snapshot([('ANA', float(minuto), '1')])
+
+        self.assertEqual([snapshot.secuencia for snapshot in diario.snapshots], [3, 4])
+        self.assertEqual(len(list(diario.directorio.glob('snapshot_*.json.gz'))), 2)
+        with open(diario.archivo, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 1)  # Sólo el cambio posterior al snapshot más antiguo
+
+        self.en(35)
+        diario.registrar('actualizar', 'ANA', 9.5)
+        self.assertEqual(diario.reconstruir(Reloj.actual), ([('ANA', 9.5, '1')], 1))
+        with self.assertRaises(ValueError):
+            diario.reconstruir(INICIO + timedelta(minutes=15))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Pruebas del índice de búsqueda de estudiantes (IndiceBusqueda)
+
+Los resultados de buscar() se comparan contra una búsqueda por fuerza bruta
+que califica a todos los nombres.
+"""
+
+import os
+import random
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import busqueda
+from busqueda import IndiceBusqueda, normalizar
+
+NOMBRES = ['JUAN', 'JOSÉ', 'MARÍA', 'ANA', 'LUIS', 'SOFÍA', 'FERNANDO', 'ADRIANA', 'MARCO', 'GABRIELA']
+APELLIDOS = ['PÉREZ', 'LÓPEZ', 'GÓMEZ', 'GONZÁLEZ', 'RODRÍGUEZ', 'HERNÁNDEZ', 'NÚÑEZ', 'DÍAZ',
+             'CASTILLO', 'MEDINA', 'CRUZ', 'RUIZ', 'LUNA', 'PERALTA']
+
+
+def buscar_fuerza_bruta(indice, consulta, limite=5):
+    """Califica a todos los nombres; si alguno coincide con todas las palabras, sólo a esos"""
+    normalizado = normalizar(consulta)
+    exactos = indice.por_normalizado.get(normalizado)
+    if exactos:
+        return [(nombre, 1.0) for nombre in sorted(exactos)][:limite]
+
+    parecidas = [indice.palabras_parecidas(palabra) for palabra in set(normalizado.split())]
+    parecidas = [p for p in parecidas if p]
+    largo = len(normalizado)
+    total = len(normalizado.split())
+    todos, completos = [], []
+    for nombre, normalizado_nombre in indice.normalizados.items():
+        palabras = normalizado_nombre.split()
+        similitudes = [max(p.get(palabra, 0.0) for palabra in palabras) for p in parecidas]
+        if not any(similitudes):
+            continue
+        cobertura = largo / max(len(normalizado_nombre), largo)
+        entrada = (-round(sum(similitudes) / total * (0.5 + 0.5 * cobertura), 4), len(normalizado_nombre), nombre)
+        todos.append(entrada)
+        if all(similitudes):
+            completos.append(entrada)
+    return [(nombre, -puntaje) for puntaje, _, nombre in sorted(completos or todos)[:limite]]
+
+
+class PruebaIndiceBusqueda(unittest.TestCase):
+
+    def setUp(self):
+        azar = random.Random(7)
+        self.nombres = sorted({
+            ' '.join([azar.choice(NOMBRES)] + azar.sample(APELLIDOS, azar.randint(1, 2)))
+            for _ in range(600)
+        })
+        self.llamadas = 0
+
+    def fuente(self):
+        self.llamadas += 1
+        return self.nombres
+
+    def test_se_construye_al_buscar(self):
+        indice = IndiceBusqueda(self.fuente)
+        self.assertEqual(self.llamadas, 0)
+
+        self.assertEqual(indice.buscar_exacto(self.nombres[0].lower()), [self.nombres[0]])
+        self.assertEqual(self.llamadas, 1)
+        self.assertFalse(indice.palabras_listas)
+
+        indice.buscar('perez')
+        indice.buscar('lopez')
+        self.assertEqual(self.llamadas, 1)
+        self.assertTrue(indice.palabras_listas)
+
+    def test_invalidar_vuelve_a_leer_la_fuente(self):
+        indice = IndiceBusqueda(self.fuente)
+        indice.buscar('ana')
+        self.nombres = ['BEATRIZ ORTEGA']
+        indice.invalidar()
+        self.assertEqual([nombre for nombre, _ in indice.buscar('ortga')], ['BEATRIZ ORTEGA'])
+        self.assertEqual(indice.buscar('ana'), [])
+
+    def test_agregar_y_eliminar(self):
+        indice = IndiceBusqueda(self.fuente)
+        self.nombres.append('BEATRIZ ORTEGA')
+        indice.agregar('BEATRIZ ORTEGA')  # Antes de construir: se toma de la fuente
+        self.assertEqual(indice.buscar_exacto('Beatriz  Ortega'), ['BEATRIZ ORTEGA'])
+
+        indice.agregar('CARMEN ÁLVAREZ')
+        self.assertEqual(indice.buscar('carmen alvarez')[0], ('CARMEN ÁLVAREZ', 1.0))
+        self.assertEqual(indice.buscar('alvar')[0][0], 'CARMEN ÁLVAREZ')
+
+        indice.eliminar('CARMEN ÁLVAREZ')
+        self.assertEqual(indice.buscar('alvar'), [])
+        self.assertNotIn('ALVAREZ', indice.palabras)
+
+    def test_resultados_iguales_a_fuerza_bruta(self):
+        indice = IndiceBusqueda(self.fuente)
+        indice.preparar_palabras()
+        azar = random.Random(11)
+        consultas = ['juan perez', 'jaun perez', 'fernando rodriges gomez', 'ana', 'ma', 'gonzales',
+                     'sofia castillo medina', 'adriana nunez', 'marco luna peralta', 'xyz', 'lo pe']
+        for _ in range(60):
+            palabras = azar.sample(NOMBRES + APELLIDOS, azar.randint(1, 3))
+            # Prefijos y errores de escritura
+            palabras = [p[:azar.randint(2, len(p))] if azar.random() < 0.3 else p for p in palabras]
+            palabras = [p.replace(azar.choice(p), 'X', 1) if azar.random() < 0.3 else p for p in palabras]
+            consultas.append(' '.join(palabras))
+
+        # Sin candidatos directos se recorren siempre las listas ordenadas por largo
+        for directos in (busqueda.CANDIDATOS_DIRECTOS, 0):
+            with mock.patch.object(busqueda, 'CANDIDATOS_DIRECTOS', directos):
+                for consulta in consultas:
+                    for limite in (1, 5, 20):
+                        with self.subTest(consulta=consulta, limite=limite, directos=directos):
+                            self.assertEqual(indice.buscar(consulta, limite),
+                                             buscar_fuerza_bruta(indice, consulta, limite))
+
+    def test_consulta_vacia_o_limite_cero(self):
+        indice = IndiceBusqueda(self.fuente)
+        self.assertEqual(indice.buscar('  ¿? '), [])
+        self.assertEqual(indice.buscar('juan', 0), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Pruebas de la caché de datos del Excel (cache_datos)
+
+El Excel sólo se vuelve a parsear cuando cambia su fecha de modificación o
+su tamaño.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cache_datos
+from almacenamiento import escribir_excel
+from cache_datos import cargar_tabla, ruta_cache
+
+REGISTROS = [('ANA LOPEZ', 8.0, '100000001'), ('LUIS PEREZ', 5.0, '100000002')]
+
+
+class PruebaCacheDatos(unittest.TestCase):
+
+    def setUp(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        self.archivo_excel = os.path.join(directorio, 'grupo.xlsx')
+        self.directorio_cache = os.path.join(directorio, '.cache')
+        escribir_excel(self.archivo_excel, REGISTROS)
+
+        self.parseos = 0
+        parsear = cache_datos.parsear_excel
+
+        def contar(archivo_excel):
+            self.parseos += 1
+            return parsear(archivo_excel)
+
+        parche = mock.patch.object(cache_datos, 'parsear_excel', contar)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def nombres(self):
+        tabla = cargar_tabla(self.archivo_excel, self.directorio_cache)
+        return [nombre for _, nombre in tabla.registros(0)]
+
+    def test_sin_cambios_se_usa_la_cache(self):
+        self.assertEqual(self.nombres(), ['ANA LOPEZ', 'LUIS PEREZ'])
+        self.assertTrue(ruta_cache(self.archivo_excel, self.directorio_cache).exists())
+        self.assertEqual(self.nombres(), ['ANA LOPEZ', 'LUIS PEREZ'])
+        self.assertEqual(self.parseos, 1)
+
+    def test_cambio_de_contenido_invalida(self):
+        self.nombres()
+        escribir_excel(self.archivo_excel, REGISTROS + [('EVA RUIZ', 9.0, '100000003')])
+        self.assertEqual(self.nombres(), ['ANA LOPEZ', 'LUIS PEREZ', 'EVA RUIZ'])
+        self.assertEqual(self.parseos, 2)
+
+    def test_cambio_de_fecha_invalida(self):
+        self.nombres()
+        info = os.stat(self.archivo_excel)
+        os.utime(self.archivo_excel, ns=(info.st_atime_ns, info.st_mtime_ns + 1_000_000_000))
+        self.nombres()
+        self.assertEqual(self.parseos, 2)
+        self.nombres()
+        self.assertEqual(self.parseos, 2)
+
+    def test_cache_danada_se_ignora(self):
+        self.nombres()
+        ruta_cache(self.archivo_excel, self.directorio_cache).write_bytes(b'no es un pickle')
+        self.assertEqual(self.nombres(), ['ANA LOPEZ', 'LUIS PEREZ'])
+        self.assertEqual(self.parseos, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Pruebas del envío de emails contra un servidor SMTP local de prueba
+
+Se ejecutan con: python -m pytest -q tests  (o python -m unittest discover tests)
+"""
+
+import os
+import smtplib
+import socketserver
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from email_system import EMAIL_CONFIG, BandejaSalida, GestorEmails, es_error_temporal
+
+
+class ManejadorSMTP(socketserver.StreamRequestHandler):
+    """
+    Servidor SMTP mínimo: acepta todo salvo los destinatarios cuyo email
+    contiene 'rechazado' (550, definitivo) u 'ocupado' (450, temporal)
+    """
+    
+    def responder(self, linea):
+        self.wfile.write((linea + '\r\n').encode('ascii'))
+    
+    def handle(self):
+        servidor = self.server
+        self.responder('220 localhost ESMTP')
+        destinatarios = []
+        for crudo in self.rfile:
+            comando = crudo.decode('utf-8', 'replace').strip()
+            verbo = comando.split(' ', 1)[0].upper()
+            if verbo in ('EHLO', 'HELO'):
+                self.responder('250 localhost')
+            elif verbo == 'MAIL':
+                destinatarios = []
+                self.responder('250 OK')
+            elif verbo == 'RCPT':
+                email = comando.split(':', 1)[1].strip().strip('<>')
+                with servidor.lock:
+                    servidor.intentos[email] += 1
+                if 'rechazado' in email:
+                    self.responder('550 Mailbox unavailable')
+                elif 'ocupado' in email:
+                    self.responder('450 Mailbox busy, try again later')
+                else:
+                    destinatarios.append(email)
+                    self.responder('250 OK')
+            elif verbo == 'DATA':
+                self.responder('354 End data with <CR><LF>.<CR><LF>')
+                for linea in self.rfile:
+                    if linea in (b'.\r\n', b'.\n'):
+                        break
+                with servidor.lock:
+                    servidor.recibidos.extend(destinatarios)
+                self.responder('250 OK')
+            elif verbo in ('RSET', 'NOOP'):
+                self.responder('250 OK')
+            elif verbo == 'QUIT':
+                self.responder('221 Bye')
+                return
+            else:
+                self.responder('502 Command not implemented')
+
+
+class ServidorSMTPPrueba(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ManejadorSMTP)
+        self.lock = threading.Lock()
+        self.intentos = Counter()
+        self.recibidos = []
+
+
+def destinatario(email, nombre='Estudiante'):
+    return {'nombre': nombre, 'email': email, 'calificacion': 8.5, 'numero_cuenta': '2024001'}
+
+
+class ConServidorSMTP(unittest.TestCase):
+    """Levanta un servidor SMTP de prueba y un gestor configurado para usarlo"""
+    
+    def setUp(self):
+        self.servidor = ServidorSMTPPrueba()
+        hilo = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        hilo.start()
+        self.addCleanup(self.servidor.server_close)
+        self.addCleanup(self.servidor.shutdown)
+        
+        config = dict(EMAIL_CONFIG)
+        config.update({
+            'smtp_server': '127.0.0.1',
+            'puerto': self.servidor.server_address[1],
+            'remitente_email': 'sistema@localhost',
+            'remitente_password': '',
+            'usar_tls': False,
+            'timeout': 5,
+            'mensajes_por_segundo': 0,
+            'reintentos': 2,
+            'espera_reintento': 0,
+        })
+        self.gestor = GestorEmails(config)
+
+
+class PruebaEnvioSMTP(ConServidorSMTP):
+    
+    def test_envio_masivo_en_paralelo(self):
+        destinatarios = [destinatario(f'alumno{i}@localhost') for i in range(12)]
+        enviados, fallidos = self.gestor.despachar(destinatarios, conexiones=3)
+        
+        self.assertEqual((enviados, fallidos), (12, 0))
+        self.assertCountEqual(self.servidor.recibidos, [d['email'] for d in destinatarios])
+    
+    def test_mime_precodificado(self):
+        self.gestor.mime_precodificado = True
+        enviados, fallidos = self.gestor.despachar([destinatario('alumno@localhost')], conexiones=1)
+        
+        self.assertEqual((enviados, fallidos), (1, 0))
+        self.assertEqual(self.servidor.recibidos, ['alumno@localhost'])
+    
+    def test_rechazo_definitivo_no_se_reintenta(self):
+        destinatarios = [destinatario('rechazado@localhost'), destinatario('alumno@localhost')]
+        enviados, fallidos = self.gestor.despachar(destinatarios, conexiones=1)
+        
+        self.assertEqual((enviados, fallidos), (1, 1))
+        self.assertEqual(self.servidor.intentos['rechazado@localhost'], 1)
+        self.assertEqual(self.servidor.recibidos, ['alumno@localhost'])
+    
+    def test_error_temporal_agota_los_reintentos(self):
+        enviados, fallidos = self.gestor.despachar([destinatario('ocupado@localhost')], conexiones=1)
+        
+        self.assertEqual((enviados, fallidos), (0, 1))
+        self.assertEqual(self.servidor.intentos['ocupado@localhost'], self.gestor.reintentos + 1)
+
+
+class PruebaEnvioIncompleto(ConServidorSMTP):
+    """Un envío masivo nuevo no repite correos mientras el anterior esté incompleto"""
+    
+    def setUp(self):
+        super().setUp()
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        self.archivo_excel = os.path.join(directorio, 'grupo.xlsx')
+        self.gestor.bandeja_salida = os.path.join(directorio, 'bandeja.db')
+        
+        bandeja = BandejaSalida(self.gestor.bandeja_salida)
+        self.envio_id = bandeja.crear_envio(
+            self.archivo_excel, [destinatario(f'alumno{i}@localhost') for i in range(3)]
+        )
+        primero = bandeja.destinatarios(self.envio_id)[0]
+        bandeja.marcar(primero['id'], True)
+        bandeja.cerrar()
+    
+    def test_envio_nuevo_se_rechaza(self):
+        self.assertIsNone(self.gestor.enviar_calificaciones_masivas(self.archivo_excel))
+        self.assertEqual(self.servidor.recibidos, [])
+        self.assertEqual(self.gestor.envio_incompleto(self.archivo_excel),
+                         (self.envio_id, {'enviado': 1, 'pendiente': 2}))
+    
+    def test_reanudar_no_repite_enviados(self):
+        resumen = self.gestor.enviar_calificaciones_masivas(self.archivo_excel, conexiones=1, reanudar=True)
+        
+        self.assertEqual((resumen['enviados'], resumen['fallidos']), (2, 0))
+        self.assertCountEqual(self.servidor.recibidos, ['alumno1@localhost', 'alumno2@localhost'])
+        self.assertIsNone(self.gestor.envio_incompleto(self.archivo_excel))
+
+
+class PruebaErrorTemporal(unittest.TestCase):
+    
+    def test_clasificacion(self):
+        self.assertTrue(es_error_temporal(smtplib.SMTPServerDisconnected('cerrado')))
+        self.assertTrue(es_error_temporal(ConnectionResetError()))
+        self.assertTrue(es_error_temporal(smtplib.SMTPDataError(451, b'intente luego')))
+        self.assertTrue(es_error_temporal(smtplib.SMTPRecipientsRefused({'a@x': (452, b'lleno')})))
+        self.assertFalse(es_error_temporal(smtplib.SMTPRecipientsRefused({'a@x': (550, b'no existe')})))
+        self.assertFalse(es_error_temporal(smtplib.SMTPAuthenticationError(535, b'credenciales')))
+        self.assertFalse(es_error_temporal(ValueError('mensaje inválido')))
+
+
+if __name__ == '__main__':
+    unittest.main()
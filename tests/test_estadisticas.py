@@ -0,0 +1,82 @@
+"""
+Pruebas de las estadísticas incrementales del grupo (EstadisticasGrupo)
+
+Tras cada serie de altas, bajas y cambios, los acumulados deben coincidir
+con la analítica calculada desde cero sobre las calificaciones actuales.
+"""
+
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analitica import AnaliticaCalificaciones
+from main_pro import EstadisticasGrupo
+from registros import RegistrosEstudiantes
+
+
+class PruebaEstadisticasGrupo(unittest.TestCase):
+
+    def verificar(self, estadisticas, estudiantes):
+        calificaciones = [info['calificacion'] for info in estudiantes.values()]
+        analitica = AnaliticaCalificaciones(calificaciones, usar_numpy=False)
+        promedio, desviacion = analitica.momentos()
+
+        self.assertEqual(estadisticas.total, len(calificaciones))
+        self.assertEqual(estadisticas.aprobados, sum(c >= 6.0 for c in calificaciones))
+        self.assertTrue(math.isclose(estadisticas.promedio, promedio, abs_tol=1e-9))
+        self.assertTrue(math.isclose(estadisticas.desviacion, desviacion, abs_tol=1e-6))
+        self.assertEqual((estadisticas.minima, estadisticas.maxima), (min(calificaciones), max(calificaciones)))
+        self.assertEqual(sum(estadisticas.cantidades.values()), len(calificaciones))
+
+        percentiles = (0, 10, 25, 50, 75, 90, 100)
+        for p, valor in analitica.percentiles(percentiles).items():
+            self.assertAlmostEqual(estadisticas.percentiles(percentiles)[p], valor)
+        self.assertEqual(estadisticas.histograma(), analitica.histograma())
+
+        maxima = max(calificaciones)
+        self.assertEqual(estadisticas.mejores(estudiantes),
+                         sorted(nombre for nombre, info in estudiantes.items() if info['calificacion'] == maxima))
+
+    def test_actualizacion_incremental(self):
+        azar = random.Random(5)
+        estudiantes = RegistrosEstudiantes()
+        estadisticas = EstadisticasGrupo()
+        for i in range(300):
+            calificacion = azar.randrange(0, 101, 5) / 10
+            estudiantes.agregar(f'ALUMNO {i}', calificacion)
+            estadisticas.agregar(estudiantes[f'ALUMNO {i}']['calificacion'])
+        self.verificar(estadisticas, estudiantes)
+
+        for _ in range(500):
+            nombre = azar.choice(estudiantes.nombres)
+            anterior = estudiantes[nombre]['calificacion']
+            if azar.random() < 0.2:
+                del estudiantes[nombre]
+                estadisticas.eliminar(anterior)
+            else:
+                estudiantes[nombre]['calificacion'] = azar.randrange(0, 101, 5) / 10
+                estadisticas.modificar(anterior, estudiantes[nombre]['calificacion'])
+        self.verificar(estadisticas, estudiantes)
+
+        recalculadas = EstadisticasGrupo()
+        recalculadas.recalcular(estudiantes)
+        self.assertEqual((recalculadas.cantidades, recalculadas.valores), (estadisticas.cantidades, estadisticas.valores))
+
+    def test_baja_del_ultimo_estudiante_reinicia(self):
+        estadisticas = EstadisticasGrupo()
+        estadisticas.agregar(7.3)
+        estadisticas.modificar(7.3, 9.1)
+        estadisticas.eliminar(9.1)
+
+        self.assertEqual((estadisticas.total, estadisticas.suma, estadisticas.valores), (0, 0.0, []))
+        self.assertIsNone(estadisticas.maxima)
+        self.assertEqual(estadisticas.mejores(RegistrosEstudiantes()), [])
+        self.assertEqual(estadisticas.percentiles((50,)), {50: 0.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
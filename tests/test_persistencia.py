@@ -0,0 +1,159 @@
+"""
+Pruebas del guardado diferido por tiempo (PersistenciaManager) con cada backend
+
+El guardado por tiempo corre en el hilo del temporizador mientras el hilo
+principal espera una opción del menú.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from almacenamiento import AlmacenamientoExcel, AlmacenamientoSQLite, escribir_excel
+from cache_datos import cargar_tabla
+from main_pro import ConfigManager, PersistenciaManager
+
+REGISTROS = [('ANA LOPEZ', 8.0, '100000001'), ('LUIS PEREZ', 5.0, '100000002')]
+
+
+def esperar_guardado(persistencia, limite=5.0):
+    """Sustituto de input(): espera a que el temporizador guarde lo pendiente"""
+    def entrada(mensaje=''):
+        fin = time.monotonic() + limite
+        while persistencia.pendientes and time.monotonic() < fin:
+            time.sleep(0.01)
+        return ''
+    return entrada
+
+
+class PruebaGuardadoPorTiempo(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directorio, ignore_errors=True)
+        self.archivo_excel = os.path.join(self.directorio, 'grupo.xlsx')
+        escribir_excel(self.archivo_excel, REGISTROS)
+        self.backups = []
+
+        self.config = ConfigManager(os.path.join(self.directorio, 'no_existe.json'))
+        self.config.config['persistencia'] = {
+            'modo': 'diferido', 'max_cambios_pendientes': 100, 'intervalo_guardado': 0.1
+        }
+
+    def crear_backup(self, archivo):
+        self.backups.append(archivo)
+        return True
+
+    def backend_excel(self):
+        return AlmacenamientoExcel(
+            self.archivo_excel,
+            directorio_cache=os.path.join(self.directorio, '.cache'),
+            crear_backup=self.crear_backup
+        )
+
+    def backend_sqlite(self):
+        return AlmacenamientoSQLite(
+            os.path.join(self.directorio, 'calificaciones.db'),
+            archivo_excel=self.archivo_excel,
+            directorio_cache=os.path.join(self.directorio, '.cache'),
+            crear_backup=self.crear_backup
+        )
+
+    def calificacion_en_disco(self, backend, nombre):
+        if isinstance(backend, AlmacenamientoSQLite):
+            conexion = sqlite3.connect(backend.archivo_db)
+            try:
+                return conexion.execute(
+                    "SELECT calificacion FROM estudiantes WHERE nombre = ?", (nombre,)
+                ).fetchone()[0]
+            finally:
+                conexion.close()
+        tabla = cargar_tabla(self.archivo_excel, os.path.join(self.directorio, '.cache'))
+        return {fila[1]: fila[2] for fila in tabla.registros(0, 1)}[nombre]
+
+    def guardado_por_tiempo(self, backend, fallas=0):
+        """Modifica un estudiante y deja que el temporizador lo guarde"""
+        self.addCleanup(backend.cerrar)
+        list(backend.cargar())
+        intentos = []
+
+        def guardar(cambios, eventos):
+            intentos.append(time.monotonic())
+            if len(intentos) <= fallas:
+                return False
+            try:
+                return backend.guardar()
+            except Exception:
+                return False
+
+        persistencia = PersistenciaManager(self.config, guardar)
+        self.assertTrue(backend.actualizar('ANA LOPEZ', 9.5))
+        self.assertTrue(persistencia.registrar_cambio('ANA LOPEZ'))
+
+        with mock.patch('builtins.input', esperar_guardado(persistencia)):
+            persistencia.esperar_entrada('> ')
+
+        self.assertEqual(persistencia.pendientes, set())
+        self.assertEqual(self.calificacion_en_disco(backend, 'ANA LOPEZ'), 9.5)
+        self.assertEqual(len(intentos), fallas + 1)
+        self.assertEqual(len(self.backups), 1)
+
+    def test_excel(self):
+        self.guardado_por_tiempo(self.backend_excel())
+
+    def test_sqlite(self):
+        self.guardado_por_tiempo(self.backend_sqlite())
+
+    def test_reintento_tras_guardado_fallido(self):
+        self.guardado_por_tiempo(self.backend_sqlite(), fallas=1)
+
+
+class PruebaCambiosPendientes(unittest.TestCase):
+    """Los cambios para el diario y la auditoría sólo se entregan con un guardado exitoso"""
+
+    def crear(self, modo, resultados):
+        config = ConfigManager(os.path.join(tempfile.gettempdir(), 'no_existe.json'))
+        config.config['persistencia'] = {'modo': modo, 'max_cambios_pendientes': 2, 'intervalo_guardado': 3600}
+        self.guardados = []
+        self.eventos = []
+
+        def guardar(cambios, eventos):
+            self.guardados.append(cambios)
+            self.eventos.append(eventos)
+            return resultados.pop(0)
+
+        return PersistenciaManager(config, guardar)
+
+    def test_diferido_entrega_los_cambios_al_guardar(self):
+        persistencia = self.crear('diferido', [True])
+        evento_ana = ('modificar', 'ANA', {'anterior': 8.0, 'nueva': 9.0})
+        evento_luis = ('eliminar', 'LUIS', {'calificacion': 5.0})
+        self.assertTrue(persistencia.registrar_cambio('ANA', ('actualizar', 'ANA', 9.0), evento_ana))
+        self.assertEqual(self.guardados, [])
+
+        self.assertTrue(persistencia.registrar_cambio('LUIS', ('eliminar', 'LUIS', None), evento_luis))
+        self.assertEqual(self.guardados, [[('actualizar', 'ANA', 9.0), ('eliminar', 'LUIS', None)]])
+        self.assertEqual(self.eventos, [[evento_ana, evento_luis]])
+        self.assertEqual((persistencia.cambios, persistencia.eventos), ([], []))
+
+    def test_guardado_fallido_conserva_los_cambios(self):
+        persistencia = self.crear('inmediato', [False, True])
+        evento = ('modificar', 'ANA', {'anterior': 8.0, 'nueva': 9.0})
+        self.assertFalse(persistencia.registrar_cambio('ANA', ('actualizar', 'ANA', 9.0), evento))
+        self.assertEqual(persistencia.cambios, [('actualizar', 'ANA', 9.0)])
+        self.assertEqual(persistencia.eventos, [evento])
+
+        self.assertTrue(persistencia.registrar_cambio('LUIS', ('agregar', 'LUIS', 7.0)))
+        self.assertEqual(self.guardados[-1], [('actualizar', 'ANA', 9.0), ('agregar', 'LUIS', 7.0)])
+        self.assertEqual(persistencia.pendientes, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Pruebas del registro compacto de estudiantes (RegistrosEstudiantes)
+
+Se compara contra el diccionario por estudiante que reemplaza.
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registros import RegistrosEstudiantes
+
+
+def estado(calificacion):
+    return 'APROBADO' if calificacion >= 6.0 else 'REPROBADO'
+
+
+class PruebaRegistrosEstudiantes(unittest.TestCase):
+
+    def test_interfaz_de_diccionario(self):
+        registros = RegistrosEstudiantes()
+        registros['ANA'] = {'calificacion': 8, 'numero_cuenta': '100000001'}
+        registros.agregar('LUIS', 5.5)
+
+        self.assertEqual(len(registros), 2)
+        self.assertIn('ANA', registros)
+        self.assertNotIn('EVA', registros)
+        self.assertEqual(registros['ANA'].como_dict(),
+                         {'calificacion': 8, 'estado': 'APROBADO', 'numero_cuenta': '100000001'})
+        self.assertIsInstance(registros['ANA']['calificacion'], int)  # Como se leyó del Excel
+        self.assertEqual(registros['LUIS']['estado'], 'REPROBADO')
+        self.assertIsNone(registros['LUIS'].get('numero_cuenta'))
+        self.assertEqual(registros['LUIS'].get('otro', '-'), '-')
+        with self.assertRaises(KeyError):
+            registros['EVA']
+
+    def test_calificacion_y_estado_se_actualizan(self):
+        registros = RegistrosEstudiantes()
+        registros.agregar('ANA', 5.0)
+        registros['ANA']['calificacion'] = 9.5
+        self.assertEqual(registros['ANA']['estado'], 'APROBADO')
+
+        registros['ANA']['estado'] = 'REPROBADO'  # Estado escrito a mano en el Excel
+        self.assertEqual(registros['ANA']['estado'], 'REPROBADO')
+        self.assertEqual(registros.total_aprobados, 0)
+
+    def test_pop_y_clear(self):
+        registros = RegistrosEstudiantes()
+        registros.agregar('ANA', 7.0, '100000001')
+        self.assertEqual(registros.pop('ANA'), {'calificacion': 7, 'estado': 'APROBADO', 'numero_cuenta': '100000001'})
+        self.assertIsNone(registros.pop('ANA', None))
+        with self.assertRaises(KeyError):
+            registros.pop('ANA')
+
+        registros.agregar('LUIS', 4.0)
+        registros.clear()
+        self.assertEqual((len(registros), len(registros.aprobados)), (0, 0))
+
+    def test_igual_a_diccionario_tras_altas_y_bajas(self):
+        """Las bajas mueven al último estudiante al hueco: los bits deben moverse con él"""
+        azar = random.Random(3)
+        registros = RegistrosEstudiantes()
+        esperado = {}
+        for paso in range(2000):
+            nombre = f'ALUMNO {azar.randrange(150)}'
+            if nombre in esperado and azar.random() < 0.4:
+                del registros[nombre]
+                del esperado[nombre]
+            else:
+                calificacion = azar.randrange(101) / 10
+                registros.agregar(nombre, calificacion, str(paso))
+                esperado[nombre] = {'calificacion': calificacion, 'estado': estado(calificacion),
+                                    'numero_cuenta': str(paso)}
+
+        self.assertEqual({nombre: info.como_dict() for nombre, info in registros.items()}, esperado)
+        self.assertEqual(registros.total_aprobados, sum(info['estado'] == 'APROBADO' for info in esperado.values()))
+        self.assertEqual(len(registros.aprobados), (len(esperado) + 7) // 8)
+        self.assertEqual(list(registros.calificaciones), [esperado[nombre]['calificacion'] for nombre in registros.nombres])
+
+
+if __name__ == '__main__':
+    unittest.main()
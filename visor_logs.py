@@ -0,0 +1,132 @@
+"""
+Visor de Logs - Sistema de Calificaciones
+Lee los logs desde el final hacia atrás por bloques, sin cargar el archivo
+completo: para mostrar las últimas 20 entradas sólo se leen los últimos
+kilobytes del log del día. Permite filtrar por nivel, estudiante u operación
+y seguir paginando hacia entradas más antiguas, pasando del archivo activo a
+sus segmentos rotados (.log.gz) y a los días anteriores cuando se termina.
+"""
+
+import os
+import re
+import gzip
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from rotacion_logs import archivos_de_log
+
+TAMANO_BLOQUE = 8192
+
+NIVELES = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+PATRON_NIVEL = re.compile(r'\b(DEBUG|INFO|WARNING|ERROR|CRITICAL)\b')
+
+# Operación -> fragmentos del mensaje de log que la identifican
+OPERACIONES = {
+    'agregar': ('Estudiante agregado',),
+    'modificar': ('Calificación modificada',),
+    'eliminar': ('Estudiante eliminado',),
+    'consultar': ('Consulta de estudiante',),
+    'lote': ('Lote aplicado', 'Lote rechazado'),
+    'backup': ('Backup', 'Snapshot'),
+    'acceso': ('Acceso de administrador', 'Intento de acceso'),
+    'exportar': ('Exportación', 'Reporte', 'exportad'),
+}
+
+
+def lineas_al_reves(archivo, tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[str]:
+    """Líneas de un archivo de la última a la primera, leyendo bloques desde el final"""
+    if Path(archivo).suffix == '.gz':
+        # Un segmento comprimido no se puede recorrer hacia atrás: se descomprime
+        # completo (su tamaño está acotado por logs.max_size_mb)
+        with gzip.open(archivo, 'rb') as f:
+            lineas = f.read().split(b'\n')
+        for linea in reversed(lineas):
+            if linea:
+                yield linea.decode('utf-8', errors='replace').rstrip('\r')
+        return
+
+    with open(archivo, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        posicion = f.tell()
+        resto = b''
+        while posicion > 0:
+            leer = min(tamano_bloque, posicion)
+            posicion -= leer
+            f.seek(posicion)
+            bloque = f.read(leer) + resto
+            lineas = bloque.split(b'\n')
+            resto = lineas.pop(0)  # Puede estar incompleta: se completa con el siguiente bloque
+            for linea in reversed(lineas):
+                if linea:
+                    yield linea.decode('utf-8', errors='replace').rstrip('\r')
+        if resto:
+            yield resto.decode('utf-8', errors='replace').rstrip('\r')
+
+
+class FiltroLogs:
+    """Criterios para seleccionar entradas del log"""
+
+    def __init__(self, nivel: Optional[str] = None, estudiante: Optional[str] = None,
+                 operacion: Optional[str] = None):
+        self.nivel_minimo = NIVELES.index(nivel.upper()) if nivel else 0
+        self.estudiante = estudiante.strip().upper() if estudiante else None
+        self.fragmentos = OPERACIONES[operacion] if operacion else None
+
+    @property
+    def activo(self) -> bool:
+        return bool(self.nivel_minimo or self.estudiante or self.fragmentos)
+
+    def coincide(self, linea: str) -> bool:
+        if self.nivel_minimo:
+            nivel = PATRON_NIVEL.search(linea)
+            if nivel is None or NIVELES.index(nivel.group(1)) < self.nivel_minimo:
+                return False
+        if self.estudiante and self.estudiante not in linea.upper():
+            return False
+        if self.fragmentos and not any(fragmento in linea for fragmento in self.fragmentos):
+            return False
+        return True
+
+    def __str__(self):
+        partes = []
+        if self.nivel_minimo:
+            partes.append(f"nivel >= {NIVELES[self.nivel_minimo]}")
+        if self.estudiante:
+            partes.append(f"estudiante '{self.estudiante}'")
+        if self.fragmentos:
+            operacion = next(nombre for nombre, f in OPERACIONES.items() if f == self.fragmentos)
+            partes.append(f"operación '{operacion}'")
+        return ', '.join(partes) or 'sin filtro'
+
+
+class VisorLogs:
+    """Pagina las entradas de los logs de la más reciente a la más antigua"""
+
+    def __init__(self, directorio, filtro: Optional[FiltroLogs] = None):
+        self.directorio = Path(directorio)
+        self.filtro = filtro or FiltroLogs()
+        self._entradas = self._recorrer()
+        self.agotado = False
+
+    def _recorrer(self) -> Iterator[Tuple[Path, str]]:
+        for archivo in archivos_de_log(self.directorio):
+            for linea in lineas_al_reves(archivo):
+                if self.filtro.coincide(linea):
+                    yield archivo, linea
+
+    def pagina(self, tamano: int = 20) -> List[Tuple[Path, str]]:
+        """
+        Siguientes `tamano` entradas hacia atrás, en orden cronológico
+
+        Returns:
+            list: Tuplas (archivo, línea); vacía cuando ya no hay más entradas
+        """
+        entradas = []
+        for entrada in self._entradas:
+            entradas.append(entrada)
+            if len(entradas) >= tamano:
+                break
+        else:
+            self.agotado = True
+        entradas.reverse()
+        return entradas